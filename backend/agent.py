@@ -3,7 +3,6 @@ import json
 import re
 import network_fix
 from typing import TypedDict, List, Dict, Annotated, Literal, Callable
-from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
 from thefuzz import fuzz
@@ -18,7 +17,10 @@ import datetime
 
 
 # Import your custom modules
-from tools import search_npi_registry, validate_address, scrape_provider_website
+from tools import search_npi_registry, validate_address
+from website_fetcher import fetch_website
+from page_extractor import relevant_snippet
+from zip_index import zip_index
 from provider_requests import get_all_providers
 from logic_engine import SurgicalValidator
 
@@ -40,12 +42,14 @@ from database_setup import (
 # DATABASE INITIALIZATION
 # ============================================
 def init_databases():
-    """Initialize PostgreSQL database."""
+    """Initialize PostgreSQL database.
+    
+    Not run at import: the API initializes the database during startup
+    (see main.lifespan) and the CLI pipeline calls this before running.
+    """
     print("✅ Initializing PostgreSQL database...")
     init_database()
 
-init_databases()
-
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -104,7 +108,16 @@ class AgentState(TypedDict):
     data_provenance: dict
     quality_metrics: dict
 
-llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
+_llm = None
+
+
+def get_llm():
+    """Groq chat model, created on first use so importing the agent needs no API key."""
+    global _llm
+    if _llm is None:
+        from langchain_groq import ChatGroq
+        _llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
+    return _llm
 
 # ============================================
 # SOURCE AUTHORITY HIERARCHY
@@ -455,6 +468,7 @@ def validate_address_node(state: AgentState) -> dict:
     
     address_confidence = confidence_map.get(verdict, 0.5)
     
+    # Reuses the geocode validate_address just made (geocoding.py)
     geo_result = verify_medical_facility(
         address=initial_data.get("address"),
         city=initial_data.get("city"),
@@ -473,6 +487,23 @@ def validate_address_node(state: AgentState) -> dict:
     elif is_medical_facility:
         print(f"✓ Verified medical facility: {facility_type}")
     
+    coordinates = geo_result.get("coordinates")
+    coordinates_source = "geocode" if coordinates else None
+    
+    zip_check = zip_index.check(
+        city=initial_data.get("city", ""),
+        state=initial_data.get("state", ""),
+        zip_code=initial_data.get("zip_code", ""),
+        coordinates=coordinates
+    )
+    for issue in zip_check["issues"]:
+        print(f"  ⚠ {issue}")
+    
+    # Remote geocode unavailable (failed, rate-limited, not found): ZIP centroid
+    if not coordinates and zip_check.get("centroid"):
+        coordinates = zip_check["centroid"]
+        coordinates_source = "zip_centroid"
+    
     print(f"  USPS Verdict: {verdict} (confidence: {address_confidence:.2%})")
     print(f"  Execution time: {execution_time:.2f}s")
     
@@ -481,8 +512,13 @@ def validate_address_node(state: AgentState) -> dict:
         "execution_time_seconds": execution_time,
         "confidence": address_confidence,
         "verdict": verdict,
+        "geocode_source": result.get("geocode_source"),
         "is_medical_facility": is_medical_facility,
         "facility_type": facility_type,
+        "coordinates": coordinates,
+        "coordinates_source": coordinates_source,
+        "zip_check": zip_check,
+        "rate_limit_wait_seconds": geo_result.get("rate_limit_wait_seconds", 0.0),
         "source_authority": SOURCE_HIERARCHY["google_business"],
         "timestamp": datetime.datetime.now().isoformat()
     }
@@ -491,7 +527,10 @@ def validate_address_node(state: AgentState) -> dict:
         "address_result": {
             **result,
             "is_medical_facility": is_medical_facility,
-            "facility_type": facility_type
+            "facility_type": facility_type,
+            "coordinates": coordinates,
+            "coordinates_source": coordinates_source,
+            "zip_check": zip_check
         },
         "execution_metadata": {"address": metadata}
     }
@@ -499,56 +538,95 @@ def validate_address_node(state: AgentState) -> dict:
 # ============================================
 # STEP 3B: WEB ENRICHMENT WITH DIGITAL FOOTPRINT
 # ============================================
+# Website extraction, Google Scholar and web presence are independent, so
+# they run as parallel branches joined by web_enrichment_node; the step
+# costs the slowest part rather than the sum. Each part records its own
+# timing under execution_metadata["web_enrichment"]["parts"].
+
+def web_part_metadata(part: str, start_time: float, **fields) -> dict:
+    return {"web_enrichment": {
+        **fields,
+        "parts": {part: {
+            "execution_time_seconds": time.time() - start_time,
+            "started_at": start_time,
+        }}
+    }}
+
+
 @safe_node_execution
-def web_enrichment_node(state: AgentState) -> dict:
-    """STEP 3B: Web Enrichment + Digital Footprint Analysis"""
-    print("\n┌─────────────────────────────────────────┐")
-    print("│ STEP 3B: WEB ENRICHMENT & FOOTPRINT    │")
-    print("└─────────────────────────────────────────┘")
+def website_enrichment_node(state: AgentState) -> dict:
+    """STEP 3B.1: Credentials from the provider's website"""
+    print("\n  [3B.1] Website credential extraction")
     
     start_time = time.time()
-    initial_data = state["initial_data"]
-    url = initial_data.get("website")
-    provider_name = initial_data.get("full_name", "")
+    url = state["initial_data"].get("website")
     
     enrichment_data = {}
+    website_fetch = None
     if url:
-        scraped_text = scrape_provider_website(url=url)
+        fetch_result = fetch_website(url)
+        website_fetch = fetch_result.to_metadata()
+        scraped_text = fetch_result.text
         
-        if "error" not in scraped_text.lower():
-            print(f"  Scraped {len(scraped_text)} characters from website")
+        if fetch_result.ok:
+            print(f"  Scraped {len(scraped_text)} characters from website "
+                  f"({fetch_result.path}, {fetch_result.latency_seconds:.2f}s)")
+            
+            snippet = relevant_snippet(scraped_text)
+            website_fetch["snippet_chars"] = len(snippet)
             
             extraction_prompt = f"""Extract education and credentials from this text.
 Return ONLY a JSON object with keys: education, certifications, languages, insurance_accepted.
 
-TEXT: {scraped_text[:4000]}
+TEXT: {snippet}
 
 Example: {{"education": ["Harvard Medical School - 2010"], "certifications": ["Board Certified in Surgery"], "languages": ["English"], "insurance_accepted": ["Medicare"]}}
 """
             
             try:
-                response = llm.invoke(extraction_prompt)
+                response = get_llm().invoke(extraction_prompt)
                 enrichment_data = extract_json_from_response(response.content)
                 print(f"  ✓ Extracted credentials from website")
             except Exception as e:
                 print(f"  ✗ Website parsing failed: {e}")
+        else:
+            print(f"  ✗ Website fetch failed: {fetch_result.error}")
     
-    digital_footprint_score = 0.0
-    recent_publications = []
+    return {
+        "web_enrichment_data": enrichment_data,
+        "execution_metadata": web_part_metadata("website", start_time, website_fetch=website_fetch)
+    }
+
+
+@safe_node_execution
+def scholar_search_node(state: AgentState) -> dict:
+    """STEP 3B.2: Recent publications (Google Scholar)"""
+    start_time = time.time()
     
     scholar_result = search_google_scholar(
-        provider_name=provider_name,
+        provider_name=state["initial_data"].get("full_name", ""),
         year_min=2024
     )
-    
     recent_publications = scholar_result.get("publications", [])
     
+    return {
+        "execution_metadata": web_part_metadata(
+            "scholar", start_time, recent_publications_count=len(recent_publications)
+        )
+    }
+
+
+@safe_node_execution
+def web_presence_node(state: AgentState) -> dict:
+    """STEP 3B.3: Digital footprint (web search)"""
+    start_time = time.time()
+    initial_data = state["initial_data"]
+    
     web_result = search_provider_web_presence(
-        provider_name=provider_name,
+        provider_name=initial_data.get("full_name", ""),
         npi=initial_data.get("NPI"),
         phone=initial_data.get("phone")
     )
-    
     digital_footprint_score = web_result.get("web_presence_score", 0.0)
     
     if digital_footprint_score < 0.3:
@@ -556,22 +634,55 @@ Example: {{"education": ["Harvard Medical School - 2010"], "certifications": ["B
     else:
         print(f"  ✓ Active digital presence (score: {digital_footprint_score:.2%})")
     
-    execution_time = time.time() - start_time
+    return {
+        "digital_footprint_score": digital_footprint_score,
+        "execution_metadata": web_part_metadata(
+            "web_presence", start_time, digital_footprint_score=digital_footprint_score
+        )
+    }
+
+
+WEB_ENRICHMENT_PARTS = {
+    "website": website_enrichment_node,
+    "scholar": scholar_search_node,
+    "web_presence": web_presence_node,
+}
+
+
+def web_enrichment_node(state: AgentState) -> dict:
+    """STEP 3B: Join of the web enrichment parts"""
+    print("\n┌─────────────────────────────────────────┐")
+    print("│ STEP 3B: WEB ENRICHMENT & FOOTPRINT    │")
+    print("└─────────────────────────────────────────┘")
+    
+    web_meta = state.get("execution_metadata", {}).get("web_enrichment", {})
+    parts = web_meta.get("parts", {})
+    
+    # Parts overlap, so the step took from the first start to the last finish
+    finished = [p["started_at"] + p["execution_time_seconds"] for p in parts.values()]
+    started = [p["started_at"] for p in parts.values()]
+    execution_time = max(finished) - min(started) if parts else 0.0
+    sequential_time = sum(p["execution_time_seconds"] for p in parts.values())
+    
+    for name in WEB_ENRICHMENT_PARTS:
+        if name in parts:
+            print(f"  {name:<13} {parts[name]['execution_time_seconds']:.2f}s")
+        else:
+            print(f"  {name:<13} failed")
+    print(f"  Wall time: {execution_time:.2f}s (sequential would be {sequential_time:.2f}s)")
     
     metadata = {
         "stage": "web_enrichment",
         "execution_time_seconds": execution_time,
-        "digital_footprint_score": digital_footprint_score,
-        "recent_publications_count": len(recent_publications),
+        "sequential_time_seconds": sequential_time,
+        "digital_footprint_score": web_meta.get("digital_footprint_score", 0.0),
+        "recent_publications_count": web_meta.get("recent_publications_count", 0),
+        "website_fetch": web_meta.get("website_fetch"),
         "source_authority": SOURCE_HIERARCHY["provider_website"],
         "timestamp": datetime.datetime.now().isoformat()
     }
     
-    return {
-        "web_enrichment_data": enrichment_data,
-        "digital_footprint_score": digital_footprint_score,
-        "execution_metadata": {"web_enrichment": metadata}
-    }
+    return {"execution_metadata": {"web_enrichment": metadata}}
 
 # ============================================
 # MERGER NODE (FIX FOR PARALLEL FAN-IN)
@@ -650,6 +761,18 @@ def quality_assurance_node(state: AgentState) -> dict:
         print(f"    ℹ {flag}")
     else:
         print("    ✓ Address verified as medical facility")
+    
+    zip_check = state.get("address_result", {}).get("zip_check", {})
+    if zip_check.get("state_match") is False:
+        flag = f"⚠ ZIP {initial_data.get('zip_code')} belongs to {zip_check.get('expected_state')}, not {initial_data.get('state')}"
+        flags.append(flag)
+        flag_severity["WARNING"].append(flag)
+        print(f"    ⚠ {flag}")
+    elif zip_check.get("city_match") is False:
+        flag = f"ℹ City does not match ZIP {initial_data.get('zip_code')} ({', '.join(zip_check.get('expected_cities', []))})"
+        flags.append(flag)
+        flag_severity["INFO"].append(flag)
+        print(f"    ℹ {flag}")
 
     # CHECK 4: CROSS-FIELD CONSISTENCY
     print("\n  [4/7] Cross-Field Consistency...")
@@ -1141,60 +1264,77 @@ def auto_approve_node(state: AgentState) -> dict:
 # ============================================
 # GRAPH CONSTRUCTION
 # ============================================
-workflow = StateGraph(AgentState)
-
-# Add all nodes
-workflow.add_node("dispatcher", lambda state: state)
-workflow.add_node("verify_npi", verify_npi_node)
-workflow.add_node("check_oig", check_oig_exclusion_node)
-workflow.add_node("verify_license", verify_state_license_node)
-workflow.add_node("validate_address", validate_address_node)
-workflow.add_node("web_enrichment", web_enrichment_node)
-workflow.add_node("merge_results", merge_parallel_results_node)
-workflow.add_node("quality_assurance", quality_assurance_node)
-workflow.add_node("ai_arbitration", ai_arbitration_node)
-workflow.add_node("confidence_scorer", confidence_scorer_with_hitl_node)
-workflow.add_node("human_review", human_review_interrupt_node)
-workflow.add_node("auto_approve", auto_approve_node)
-
-# Entry point
-workflow.set_entry_point("dispatcher")
-
-# Parallel fan-out
-workflow.add_edge("dispatcher", "verify_npi")
-workflow.add_edge("dispatcher", "check_oig")
-workflow.add_edge("dispatcher", "verify_license")
-workflow.add_edge("dispatcher", "validate_address")
-workflow.add_edge("dispatcher", "web_enrichment")
-
-# Fan-in through merger
-workflow.add_edge("verify_npi", "merge_results")
-workflow.add_edge("check_oig", "merge_results")
-workflow.add_edge("verify_license", "merge_results")
-workflow.add_edge("validate_address", "merge_results")
-workflow.add_edge("web_enrichment", "merge_results")
-
-# Sequential flow
-workflow.add_edge("merge_results", "quality_assurance")
-workflow.add_edge("quality_assurance", "ai_arbitration")
-workflow.add_edge("ai_arbitration", "confidence_scorer")
-
-# Conditional routing
-workflow.add_conditional_edges(
-    "confidence_scorer",
-    hitl_decision_node,
-    {
-        "auto_approve": "auto_approve",
-        "human_review": "human_review"
+def build_workflow(nodes: Dict[str, Callable] = None) -> StateGraph:
+    """
+    The validation graph. `nodes` replaces node functions by name, so the
+    wiring can be exercised with stubs instead of live lookups.
+    """
+    nodes = {
+        "dispatcher": lambda state: state,
+        "verify_npi": verify_npi_node,
+        "check_oig": check_oig_exclusion_node,
+        "verify_license": verify_state_license_node,
+        "validate_address": validate_address_node,
+        **{f"web_{part_name}": part_node for part_name, part_node in WEB_ENRICHMENT_PARTS.items()},
+        "web_enrichment": web_enrichment_node,
+        "merge_results": merge_parallel_results_node,
+        "quality_assurance": quality_assurance_node,
+        "ai_arbitration": ai_arbitration_node,
+        "confidence_scorer": confidence_scorer_with_hitl_node,
+        "human_review": human_review_interrupt_node,
+        "auto_approve": auto_approve_node,
+        **(nodes or {}),
     }
-)
+    
+    workflow = StateGraph(AgentState)
+    
+    # Add all nodes
+    for name, node in nodes.items():
+        workflow.add_node(name, node)
+    
+    # Entry point
+    workflow.set_entry_point("dispatcher")
+    
+    # Parallel fan-out
+    workflow.add_edge("dispatcher", "verify_npi")
+    workflow.add_edge("dispatcher", "check_oig")
+    workflow.add_edge("dispatcher", "verify_license")
+    workflow.add_edge("dispatcher", "validate_address")
+    for part_name in WEB_ENRICHMENT_PARTS:
+        workflow.add_edge("dispatcher", f"web_{part_name}")
+    
+    # Fan-in through merger
+    # Waiting edges: each join runs once, after all of its branches
+    workflow.add_edge([f"web_{part_name}" for part_name in WEB_ENRICHMENT_PARTS], "web_enrichment")
+    workflow.add_edge(
+        ["verify_npi", "check_oig", "verify_license", "validate_address", "web_enrichment"],
+        "merge_results"
+    )
+    
+    # Sequential flow
+    workflow.add_edge("merge_results", "quality_assurance")
+    workflow.add_edge("quality_assurance", "ai_arbitration")
+    workflow.add_edge("ai_arbitration", "confidence_scorer")
+    
+    # Conditional routing
+    workflow.add_conditional_edges(
+        "confidence_scorer",
+        hitl_decision_node,
+        {
+            "auto_approve": "auto_approve",
+            "human_review": "human_review"
+        }
+    )
+    
+    # End nodes
+    workflow.add_edge("auto_approve", END)
+    workflow.add_edge("human_review", END)
+    
+    return workflow
 
-# End nodes
-workflow.add_edge("auto_approve", END)
-workflow.add_edge("human_review", END)
 
 # Compile
-app = workflow.compile()
+app = build_workflow().compile()
 
 # ============================================
 # BATCH PROCESSING
@@ -1268,4 +1408,5 @@ def run_enhanced_pipeline():
     return results
 
 if __name__ == "__main__":
+    init_databases()
     run_enhanced_pipeline()
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Analytics Response Cache
+File: backend/analytics_cache.py
+
+In-process cache for the /api/analytics/* payloads, keyed by endpoint and
+query parameters. Entries carry an ETag so unchanged frontend polls can be
+answered with 304 Not Modified without touching the database.
+
+Entries are dropped whenever providers or reviews are written (see
+database_setup.save_validated_provider) and also expire after a TTL, which
+covers writes made by other worker processes.
+"""
+
+import json
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import ANALYTICS_CACHE_TTL_SECONDS
+
+
+class CachedResponse:
+    """A cached analytics payload and its ETag."""
+
+    def __init__(self, payload: Dict[str, Any], etag: str):
+        self.payload = payload
+        self.etag = etag
+        self.created_at = time.monotonic()
+
+
+class AnalyticsCache:
+    def __init__(self, ttl_seconds: float = ANALYTICS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Stable cache key for an endpoint and its query parameters."""
+        return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    @staticmethod
+    def compute_etag(payload: Dict[str, Any]) -> str:
+        """
+        Hash the payload content, ignoring the generation timestamp, so a
+        rebuild that produces the same data keeps the same ETag.
+        """
+        content = {k: v for k, v in payload.items() if k != "timestamp"}
+        digest = hashlib.sha1(
+            json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: str, payload: Dict[str, Any], generation: int) -> CachedResponse:
+        """
+        Store a payload built while the cache was at `generation`.
+
+        If an invalidation happened while the payload was being built it may
+        already be stale, so it is returned to the caller but not stored.
+        """
+        entry = CachedResponse(payload, self.compute_etag(payload))
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self):
+        """Drop every entry. Called after provider / review writes."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak tags) against an ETag."""
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag for tag in candidates
+    )
+
+
+analytics_cache = AnalyticsCache()
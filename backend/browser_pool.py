@@ -0,0 +1,205 @@
+"""
+Headless Browser Pool
+File: backend/browser_pool.py
+
+A bounded pool of long-lived headless Edge sessions shared by concurrent
+validations. Starting a browser dominates the cost of a one-off scrape, so
+sessions are reused across pages:
+
+- at most BROWSER_POOL_SIZE browsers exist at once; callers wait for a slot
+- an idle browser is health-checked before it is handed out
+- a browser is retired after BROWSER_MAX_PAGES_PER_SESSION pages, or as
+  soon as it raises a WebDriver error
+- pages are considered loaded once document.readyState is "complete" and
+  the body has text (no fixed sleeps)
+- images, fonts and media are blocked, since only page text is used
+
+selenium is imported when the first browser is started.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from config import (
+    BROWSER_POOL_SIZE,
+    BROWSER_MAX_PAGES_PER_SESSION,
+    BROWSER_PAGE_LOAD_TIMEOUT,
+    BROWSER_ACQUIRE_TIMEOUT,
+)
+
+
+# Resource types that never contribute page text
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.avi", "*.mov",
+]
+
+_READY_SCRIPT = (
+    "return document.readyState === 'complete' && "
+    "!!document.body && document.body.innerText.trim().length > 0;"
+)
+
+
+class PooledBrowser:
+    """A browser session and how many pages it has served."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    def __init__(self, size: int = BROWSER_POOL_SIZE,
+                 max_pages_per_session: int = BROWSER_MAX_PAGES_PER_SESSION,
+                 page_load_timeout: float = BROWSER_PAGE_LOAD_TIMEOUT,
+                 acquire_timeout: float = BROWSER_ACQUIRE_TIMEOUT):
+        self.size = size
+        self.max_pages_per_session = max_pages_per_session
+        self.page_load_timeout = page_load_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._slots = threading.BoundedSemaphore(size)
+        # LIFO so the most recently used (warmest) browser is reused first
+        self._idle: "queue.LifoQueue[PooledBrowser]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._retired = 0
+        self._closed = False
+
+    def _start_browser(self) -> PooledBrowser:
+        from selenium import webdriver
+        from selenium.webdriver.edge.options import Options
+
+        options = Options()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+        })
+        # DOMContentLoaded is enough to start the readiness wait below
+        options.page_load_strategy = "eager"
+
+        driver = webdriver.Edge(options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"⚠️ Could not enable resource blocking: {e}")
+
+        with self._lock:
+            self._started += 1
+        print(f"🌐 Started pooled browser ({self._started} started, {self._retired} retired)")
+        return PooledBrowser(driver)
+
+    def _retire(self, browser: PooledBrowser):
+        browser.quit()
+        with self._lock:
+            self._retired += 1
+
+    def _checkout(self) -> PooledBrowser:
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                return self._start_browser()
+
+            if browser.is_healthy():
+                return browser
+            self._retire(browser)
+
+    def _checkin(self, browser: PooledBrowser, healthy: bool):
+        if self._closed or not healthy or browser.pages_served >= self.max_pages_per_session:
+            self._retire(browser)
+            return
+
+        try:
+            browser.driver.delete_all_cookies()
+            browser.driver.get("about:blank")
+        except Exception:
+            self._retire(browser)
+            return
+
+        self._idle.put(browser)
+
+    @contextmanager
+    def session(self):
+        """Borrow a browser driver for one page; it is returned (or retired) afterwards."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No browser available within {self.acquire_timeout:.0f}s")
+
+        browser = None
+        healthy = False
+        try:
+            browser = self._checkout()
+            yield browser.driver
+            browser.pages_served += 1
+            healthy = True
+        finally:
+            if browser is not None:
+                self._checkin(browser, healthy)
+            self._slots.release()
+
+    def fetch_html(self, url: str) -> str:
+        """Load a page and return its rendered HTML once it is ready."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.session() as driver:
+            try:
+                driver.get(url)
+            except TimeoutException:
+                # Slow subresources; whatever has rendered so far is still useful
+                print(f"  ⚠️ Page load timed out, using partial content: {url}")
+
+            try:
+                WebDriverWait(driver, self.page_load_timeout, poll_frequency=0.2).until(
+                    lambda d: d.execute_script(_READY_SCRIPT)
+                )
+            except TimeoutException:
+                print(f"  ⚠️ Page not ready after {self.page_load_timeout:.0f}s, using current DOM")
+
+            return driver.page_source
+
+    def close_all(self):
+        """Quit every idle browser (browsers in use are retired when returned)."""
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(browser)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "started": self._started,
+            "retired": self._retired,
+        }
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close_all)
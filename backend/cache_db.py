@@ -0,0 +1,115 @@
+"""
+Persistent Cache Database Access
+File: backend/cache_db.py
+
+The geocode and search caches (geocoding.py, serper_client.py) are optional
+extras on top of the database: a lookup that cannot reach it should cost
+nothing, not a connect timeout per call. Both go through cache_call(),
+which shares one failure circuit for the database:
+
+- database not configured in this process (import fails): caches are off
+- connection failure: the database is skipped for CACHE_DB_RETRY_SECONDS,
+  doubling per consecutive failure up to CACHE_DB_MAX_RETRY_SECONDS; after
+  that one caller probes it again and a success closes the circuit
+
+Other errors (a bad row, a constraint) are logged and treated as a miss
+without tripping the circuit.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from config import CACHE_DB_RETRY_SECONDS, CACHE_DB_MAX_RETRY_SECONDS
+
+
+_lock = threading.Lock()
+_module = None
+_disabled_reason: Optional[str] = None
+_failures = 0
+_retry_at = 0.0
+
+
+def _connection_errors() -> tuple:
+    from sqlalchemy import exc
+
+    return (exc.OperationalError, exc.InterfaceError, exc.TimeoutError, OSError)
+
+
+def _database_setup():
+    """database_setup if the circuit allows a call now, else None."""
+    global _module, _disabled_reason, _retry_at
+
+    with _lock:
+        if _disabled_reason is not None:
+            return None
+        if _failures and time.monotonic() < _retry_at:
+            return None
+        if _failures:
+            # Half-open: this caller probes, the rest keep skipping meanwhile
+            _retry_at = time.monotonic() + _backoff(_failures)
+
+        if _module is None:
+            try:
+                import database_setup
+                _module = database_setup
+            except Exception as e:
+                _disabled_reason = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Persistent caches disabled: {_disabled_reason}")
+                return None
+        return _module
+
+
+def _backoff(failures: int) -> float:
+    return min(CACHE_DB_RETRY_SECONDS * 2 ** (failures - 1), CACHE_DB_MAX_RETRY_SECONDS)
+
+
+def _record_failure(error: Exception):
+    global _failures, _retry_at
+
+    with _lock:
+        _failures += 1
+        delay = _backoff(_failures)
+        _retry_at = time.monotonic() + delay
+    print(f"⚠️ Cache database unreachable, skipping it for {delay:.0f}s: {type(error).__name__}: {error}")
+
+
+def _record_success():
+    global _failures
+
+    if _failures:
+        with _lock:
+            _failures = 0
+        print("✅ Cache database reachable again")
+
+
+def cache_call(function_name: str, *args, default=None):
+    """
+    Call database_setup.<function_name>(*args), or return `default` when the
+    database is unavailable or the call fails.
+    """
+    db = _database_setup()
+    if db is None:
+        return default
+
+    try:
+        result = getattr(db, function_name)(*args)
+    except _connection_errors() as e:
+        _record_failure(e)
+        return default
+    except Exception as e:
+        print(f"⚠️ Cache {function_name} failed: {type(e).__name__}: {e}")
+        return default
+
+    _record_success()
+    return result
+
+
+def cache_db_status() -> dict:
+    with _lock:
+        return {
+            "enabled": _disabled_reason is None,
+            "disabled_reason": _disabled_reason,
+            "consecutive_failures": _failures,
+            "retry_in_seconds": round(max(0.0, _retry_at - time.monotonic()), 1) if _failures else 0.0,
+        }
@@ -1,3 +1,89 @@
 # backend/config.py
 
+import os
+
 USE_MOCK_STATE_SCRAPERS = True
+
+# Seconds an /api/analytics/* response may be served from cache. Local writes
+# invalidate immediately; the TTL bounds staleness from other worker processes.
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30"))
+
+# Uploads to /validate-file are streamed to this directory in fixed-size chunks
+# instead of being read into memory. Requests over the cap get a 413.
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "upload_spool")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+# Spool files older than this are treated as orphans (e.g. left behind by a
+# crashed worker) and removed at startup.
+UPLOAD_SPOOL_MAX_AGE_SECONDS = float(os.getenv("UPLOAD_SPOOL_MAX_AGE_SECONDS", "3600"))
+
+# Headless browser pool used for website scraping (browser_pool.py)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+BROWSER_MAX_PAGES_PER_SESSION = int(os.getenv("BROWSER_MAX_PAGES_PER_SESSION", "50"))
+BROWSER_PAGE_LOAD_TIMEOUT = float(os.getenv("BROWSER_PAGE_LOAD_TIMEOUT", "20"))
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "60"))
+
+# Provider website fetching (website_fetcher.py). Pages are fetched over HTTP
+# first and only rendered in the browser pool if they yield less visible text
+# than WEBSITE_MIN_TEXT_CHARS.
+WEBSITE_HTTP_TIMEOUT = float(os.getenv("WEBSITE_HTTP_TIMEOUT", "10"))
+WEBSITE_MIN_TEXT_CHARS = int(os.getenv("WEBSITE_MIN_TEXT_CHARS", "200"))
+
+# On-disk cache of scraped website text (website_cache.py). Entries older than
+# the TTL are revalidated with a conditional GET before reuse.
+WEBSITE_CACHE_DIR = os.getenv("WEBSITE_CACHE_DIR", "website_cache")
+WEBSITE_CACHE_TTL_SECONDS = float(os.getenv("WEBSITE_CACHE_TTL_SECONDS", str(24 * 3600)))
+# Size caps; least recently used entries are evicted past either one.
+WEBSITE_CACHE_MAX_BYTES = int(os.getenv("WEBSITE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+WEBSITE_CACHE_MAX_ENTRIES = int(os.getenv("WEBSITE_CACHE_MAX_ENTRIES", "50000"))
+
+# Politeness limits for provider websites (host_scheduler.py): concurrent
+# requests per host and minimum spacing between request starts to one host.
+WEBSITE_PER_HOST_CONCURRENCY = int(os.getenv("WEBSITE_PER_HOST_CONCURRENCY", "2"))
+WEBSITE_PER_HOST_MIN_INTERVAL = float(os.getenv("WEBSITE_PER_HOST_MIN_INTERVAL", "1.0"))
+
+# Character budget for website text sent to the enrichment LLM
+# (page_extractor.relevant_snippet).
+WEBSITE_SNIPPET_CHARS = int(os.getenv("WEBSITE_SNIPPET_CHARS", "2500"))
+
+# Shared geocoding layer (geocoding.py): results are memoized in-process so
+# the address verdict and facility check share one upstream lookup.
+GEOCODE_MEMO_TTL_SECONDS = float(os.getenv("GEOCODE_MEMO_TTL_SECONDS", "900"))
+GEOCODE_MEMO_MAX_ENTRIES = int(os.getenv("GEOCODE_MEMO_MAX_ENTRIES", "5000"))
+
+# Offline ZIP index (zip_index.py): a geocode further than this from its
+# ZIP's centroid is reported as an address issue.
+ZIP_CENTROID_MAX_DISTANCE_KM = float(os.getenv("ZIP_CENTROID_MAX_DISTANCE_KM", "50"))
+# After a failed load (e.g. the one-time data download had no network) the
+# index is retried after this delay, doubling per failure up to an hour.
+ZIP_INDEX_RETRY_SECONDS = float(os.getenv("ZIP_INDEX_RETRY_SECONDS", "300"))
+
+# Process-wide request budgets for OpenStreetMap services (rate_limiter.py).
+# Nominatim's usage policy allows at most 1 request per second.
+NOMINATIM_RATE_PER_SECOND = float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1.0"))
+NOMINATIM_BURST = int(os.getenv("NOMINATIM_BURST", "1"))
+OVERPASS_RATE_PER_SECOND = float(os.getenv("OVERPASS_RATE_PER_SECOND", "1.0"))
+OVERPASS_BURST = int(os.getenv("OVERPASS_BURST", "2"))
+
+# Local healthcare POI index (poi_index.py, built from an OSM extract).
+# Without an index, nearby-facility checks use Overpass if the fallback is on.
+POI_INDEX_DIR = os.getenv("POI_INDEX_DIR", "poi_index")
+POI_OVERPASS_FALLBACK = os.getenv("POI_OVERPASS_FALLBACK", "true").lower() == "true"
+
+# Persistent geocode cache (geocode_cache table). Found addresses are reused
+# for GEOCODE_CACHE_TTL_SECONDS; "not found" results for the shorter
+# negative TTL, in case the address is added upstream.
+GEOCODE_CACHE_TTL_SECONDS = float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(180 * 24 * 3600)))
+GEOCODE_NEGATIVE_TTL_SECONDS = float(os.getenv("GEOCODE_NEGATIVE_TTL_SECONDS", str(14 * 24 * 3600)))
+
+# Persistent caches (cache_db.py) skip the database for this long after a
+# connection failure, doubling per consecutive failure up to the max, instead
+# of waiting on the connect timeout for every lookup.
+CACHE_DB_RETRY_SECONDS = float(os.getenv("CACHE_DB_RETRY_SECONDS", "30"))
+CACHE_DB_MAX_RETRY_SECONDS = float(os.getenv("CACHE_DB_MAX_RETRY_SECONDS", "600"))
+
+# Serper searches (serper_client.py) are cached by exact payload: in-process
+# for the memo TTL, and in the search_cache table for the persistent TTL.
+SERPER_TIMEOUT = float(os.getenv("SERPER_TIMEOUT", "10"))
+SERPER_MEMO_TTL_SECONDS = float(os.getenv("SERPER_MEMO_TTL_SECONDS", "3600"))
+SERPER_CACHE_TTL_SECONDS = float(os.getenv("SERPER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
@@ -0,0 +1,103 @@
+"""
+Roster parsing benchmark: rows/sec of tools.parse_csv_file against the
+previous row-by-row (iterrows) implementation, on a synthetic roster.
+
+    cd backend/data_scripts
+    python benchmark_roster_parsing.py --rows 100000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# backend/
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from tools import PROVIDER_COLUMN_MAP, map_provider_columns, parse_csv_file  # noqa: E402
+
+
+def legacy_parse_csv_file(file_path: str) -> list:
+    """parse_csv_file as it was before vectorization (iterrows + pd.isna per cell)."""
+    df = pd.read_csv(file_path, encoding="utf-8")
+    df.columns = df.columns.str.strip().str.lower()
+    field_columns = map_provider_columns(df.columns)
+
+    providers = []
+    for idx, row in df.iterrows():
+        provider = {}
+
+        for field, column in field_columns.items():
+            value = row[column]
+
+            if pd.isna(value):
+                provider[field] = ""
+            else:
+                provider[field] = str(value).strip()
+
+        if provider.get('full_name'):
+            for field in PROVIDER_COLUMN_MAP.keys():
+                if field not in provider:
+                    provider[field] = ""
+
+            providers.append(provider)
+
+    return providers
+
+
+def write_synthetic_roster(path: Path, rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    specialties = ["Cardiology", "Family Medicine", "Pediatrics", "Dermatology", "Oncology"]
+    states = ["CA", "TX", "NY", "FL", "MA"]
+
+    def maybe(value, blank_rate=0.05):
+        return None if rng.random() < blank_rate else value
+
+    pd.DataFrame({
+        "Provider Name": [maybe(f"  Dr. Test {i} ", 0.02) for i in range(rows)],
+        "NPI": [1000000000 + i for i in range(rows)],
+        "Specialty": [maybe(rng.choice(specialties)) for _ in range(rows)],
+        "Address": [maybe(f"{rng.randint(1, 9999)} Main St") for _ in range(rows)],
+        "City": [maybe("Springfield") for _ in range(rows)],
+        "State": [maybe(rng.choice(states)) for _ in range(rows)],
+        "ZIP": [maybe(rng.randint(1000, 99999)) for _ in range(rows)],
+        "Phone": [maybe(f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}") for _ in range(rows)],
+        "License Number": [maybe(f"L{rng.randint(10000, 99999)}") for _ in range(rows)],
+    }).to_csv(path, index=False)
+
+
+def timed(func, path: Path):
+    start = time.perf_counter()
+    result = func(str(path))
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "roster.csv"
+        write_synthetic_roster(path, args.rows)
+
+        legacy, legacy_seconds = timed(legacy_parse_csv_file, path)
+        current, current_seconds = timed(parse_csv_file, path)
+
+    if legacy != current:
+        print("❌ Vectorized output differs from the row-by-row implementation")
+        sys.exit(1)
+
+    print(f"\n📈 Roster parsing, {args.rows:,} rows ({len(current):,} providers kept)")
+    print(f"   before (iterrows):   {legacy_seconds:8.2f}s  {args.rows / legacy_seconds:>12,.0f} rows/s")
+    print(f"   after (vectorized):  {current_seconds:8.2f}s  {args.rows / current_seconds:>12,.0f} rows/s")
+    print(f"   speedup: {legacy_seconds / current_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,24 @@
 import os
+import re
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from sqlalchemy import (
     create_engine, Column, Integer, String, Float, Text, 
-    DateTime, Boolean, JSON, Index, ForeignKey, CheckConstraint
+    DateTime, Boolean, JSON, Index, ForeignKey, CheckConstraint,
+    func, text
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker, Session, relationship
 from sqlalchemy.exc import IntegrityError, OperationalError
 from dotenv import load_dotenv
 
+from analytics_cache import analytics_cache
+from geo_clustering import geohash_for_coordinates
+
 load_dotenv()
 
 # ============================================
@@ -56,6 +62,82 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# ============================================
+# PROMOTED METADATA FIELDS
+# ============================================
+
+# score_breakdown dimension -> column
+SCORE_COLUMNS = {
+    'identity': 'score_identity',
+    'address': 'score_address',
+    'completeness': 'score_completeness',
+    'freshness': 'score_freshness',
+    'enrichment': 'score_enrichment',
+    'risk': 'score_risk',
+}
+
+# execution_metadata stage key -> column
+STAGE_COLUMNS = {
+    'vlm': 'stage_vlm',
+    'nppes': 'stage_npi',
+    'oig_leie': 'stage_oig',
+    'state_board': 'stage_license',
+    'address': 'stage_address',
+    'web_enrichment': 'stage_web',
+}
+
+RECENT_VALIDATION_INCLUDE_COLUMNS = [
+    'id', 'provider_name', 'npi', 'confidence_score', 'confidence_tier',
+    'validation_path', 'digital_footprint_score', 'npi_match_confidence',
+    'address_confidence', *SCORE_COLUMNS.values(), *STAGE_COLUMNS.values(),
+]
+
+
+GEOHASH_INCLUDE_COLUMNS = [
+    'latitude', 'longitude', 'confidence_score', 'confidence_tier', 'validation_path',
+]
+
+
+def promoted_metadata_columns(state: dict) -> dict:
+    """
+    Typed column values for the hot fields buried in validation_metadata.
+    
+    Written alongside the JSON blob on every save so analytics queries can
+    filter, group and read these without JSON parsing.
+    """
+    quality_metrics = state.get('quality_metrics', {})
+    execution_metadata = state.get('execution_metadata', {})
+    score_breakdown = quality_metrics.get('score_breakdown', {})
+    
+    columns = {
+        'validation_path': quality_metrics.get('path'),
+        'fraud_indicator_count': quality_metrics.get('fraud_indicator_count', 0),
+        'npi_match_confidence': execution_metadata.get('nppes', {}).get('match_confidence'),
+        'address_confidence': execution_metadata.get('address', {}).get('confidence'),
+    }
+    
+    for dimension, column in SCORE_COLUMNS.items():
+        columns[column] = score_breakdown.get(dimension)
+    
+    for stage, column in STAGE_COLUMNS.items():
+        columns[column] = execution_metadata.get(stage, {}).get('status', 'pending')
+    
+    # Coordinates found by geo-verification during address validation. A ZIP
+    # centroid stand-in (coordinates_source "zip_centroid") is not a location;
+    # those providers are left to the approximate state placement. States from
+    # before coordinates_source existed only carried geocoded coordinates.
+    address_result = state.get('address_result', {})
+    coordinates = address_result.get('coordinates')
+    if address_result.get('coordinates_source', 'geocode') != 'geocode':
+        coordinates = None
+    geohash = geohash_for_coordinates(coordinates)
+    columns['latitude'] = float(coordinates['lat']) if geohash else None
+    columns['longitude'] = float(coordinates.get('lng', coordinates.get('lon'))) if geohash else None
+    columns['geohash'] = geohash
+    
+    return columns
+
+
 # ============================================
 # TABLE 1: VALIDATED PROVIDERS (Main Storage)
 # ============================================
@@ -118,6 +200,32 @@ class ValidatedProvider(Base):
     validation_metadata = Column(JSON)
     data_sources = Column(JSON)
     
+    # === PROMOTED METADATA (typed copies of hot validation_metadata fields) ===
+    validation_path = Column(String(10))  # GREEN, YELLOW, RED
+    fraud_indicator_count = Column(Integer, default=0)
+    
+    score_identity = Column(Float)
+    score_address = Column(Float)
+    score_completeness = Column(Float)
+    score_freshness = Column(Float)
+    score_enrichment = Column(Float)
+    score_risk = Column(Float)
+    
+    stage_vlm = Column(String(20))
+    stage_npi = Column(String(20))
+    stage_oig = Column(String(20))
+    stage_license = Column(String(20))
+    stage_address = Column(String(20))
+    stage_web = Column(String(20))
+    
+    npi_match_confidence = Column(Float)
+    address_confidence = Column(Float)
+    
+    # === LOCATION (from geo-verification) ===
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12))  # full precision; clustered by prefix
+    
     # === RELATIONSHIPS ===
     verification_history = relationship("VerificationHistory", back_populates="provider", 
                                        cascade="all, delete-orphan")
@@ -127,6 +235,14 @@ class ValidatedProvider(Base):
         Index('idx_provider_search', 'provider_name', 'state', 'specialty'),
         Index('idx_confidence', 'confidence_score', 'confidence_tier'),
         Index('idx_verification_date', 'last_verified'),
+        Index('idx_validation_path', 'validation_path'),
+        Index('idx_fraud_indicator_count', 'fraud_indicator_count'),
+        # Covering index so globe clustering (GROUP BY geohash prefix) is index-only
+        Index('idx_provider_geohash', 'geohash',
+              postgresql_include=GEOHASH_INCLUDE_COLUMNS),
+        # Covering index so the analytics "recent validations" reads are index-only
+        Index('idx_recent_validations', 'created_at',
+              postgresql_include=RECENT_VALIDATION_INCLUDE_COLUMNS),
         CheckConstraint('confidence_score >= 0 AND confidence_score <= 1'),
     )
     
@@ -187,6 +303,10 @@ class VerificationHistory(Base):
 # TABLE 3: REVIEW QUEUE (Human Review)
 # ============================================
 
+# Sort order for review priorities (the strings do not sort meaningfully)
+REVIEW_PRIORITY_RANK = {'HIGH': 0, 'NORMAL': 1, 'LOW': 2}
+
+
 class ReviewQueue(Base):
     """
     🔴 REVIEW QUEUE: Providers that need human review
@@ -211,6 +331,7 @@ class ReviewQueue(Base):
     # Status tracking
     status = Column(String(20), default='PENDING', index=True)  # PENDING, APPROVED, REJECTED
     priority = Column(String(20), default='NORMAL')  # HIGH, NORMAL, LOW
+    priority_rank = Column(Integer, default=1)  # REVIEW_PRIORITY_RANK[priority]; HIGH sorts first
     
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -228,6 +349,8 @@ class ReviewQueue(Base):
     __table_args__ = (
         Index('idx_review_status', 'status', 'created_at'),
         Index('idx_review_priority', 'priority', 'status'),
+        # Keyset pagination order for the review queue API
+        Index('idx_review_keyset', 'status', 'priority_rank', 'created_at', 'id'),
     )
     
     def to_dict(self) -> dict:
@@ -281,6 +404,767 @@ class DataSourceLog(Base):
     )
 
 
+# ============================================
+# TABLE 5: DASHBOARD AGGREGATES (Running Totals)
+# ============================================
+
+class DashboardAggregate(Base):
+    """
+    📈 DASHBOARD AGGREGATES: Running counters for the analytics dashboard
+    
+    One row per (metric, bucket), e.g. ('tier', 'PLATINUM') or ('path', 'GREEN').
+    Updated in the same transaction as every provider / review write, so the
+    dashboard reads a handful of rows instead of scanning validated_providers.
+    """
+    __tablename__ = 'dashboard_aggregates'
+    
+    metric = Column(String(30), primary_key=True)   # providers, tier, path, confidence, fraud, review
+    bucket = Column(String(50), primary_key=True)   # total, PLATINUM, GREEN, scored, flagged, PENDING...
+    
+    count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0.0)
+    
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
+                       onupdate=lambda: datetime.now(timezone.utc))
+
+
+# ============================================
+# TABLE 6: PROVIDER APPLICATIONS (Self-Service Submissions)
+# ============================================
+
+class ProviderApplication(Base):
+    """
+    📝 PROVIDER APPLICATIONS: Submissions from the public Apply form
+    
+    One row per application. Inserts are independent single-row writes, so
+    concurrent submissions never contend on a shared file.
+    """
+    __tablename__ = 'provider_applications'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    application_id = Column(String(20), unique=True, nullable=False, index=True)
+    
+    status = Column(String(30), nullable=False)  # approved, pending_review, flagged_for_review
+    submission_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    
+    # Provider info
+    full_name = Column(String(200))
+    email = Column(String(200))
+    phone = Column(String(30))
+    specialty = Column(String(100))
+    license_number = Column(String(50))
+    npi = Column(String(10), index=True)
+    practice_address = Column(String(300))
+    
+    # AI validation summary
+    confidence_score = Column(Float)
+    validation_path = Column(String(10))
+    requires_review = Column(Boolean, default=False)
+    ai_validation = Column(JSON)
+    
+    uploaded_file = Column(JSON)
+    
+    __table_args__ = (
+        Index('idx_application_status', 'status', 'submission_date'),
+    )
+    
+    def to_dict(self) -> dict:
+        """Convert to the application record shape used by the Apply API."""
+        return {
+            'application_id': self.application_id,
+            'submission_date': self.submission_date.isoformat() if self.submission_date else None,
+            'status': self.status,
+            'provider_info': {
+                'full_name': self.full_name,
+                'email': self.email,
+                'phone': self.phone,
+                'specialty': self.specialty,
+                'license_number': self.license_number,
+                'npi': self.npi,
+                'practice_address': self.practice_address
+            },
+            'ai_validation': self.ai_validation or {},
+            'uploaded_file': self.uploaded_file or {}
+        }
+
+
+# Free-text application fields checked against their column length
+# (the NPI has its own format check)
+APPLICATION_TEXT_FIELDS = [
+    'full_name', 'email', 'phone', 'specialty', 'license_number', 'practice_address'
+]
+
+
+def application_field_errors(provider_info: dict) -> List[str]:
+    """
+    Problems with submitted provider info that would make the
+    provider_applications insert fail (empty list if it can be stored).
+    """
+    errors = []
+    
+    if not re.fullmatch(r"\d{10}", str(provider_info.get('npi') or '')):
+        errors.append("npi: must be exactly 10 digits")
+    
+    for field in APPLICATION_TEXT_FIELDS:
+        limit = ProviderApplication.__table__.c[field].type.length
+        value = str(provider_info.get(field) or '')
+        if len(value) > limit:
+            errors.append(f"{field}: must be at most {limit} characters")
+    
+    return errors
+
+
+def _application_row_values(application_data: dict) -> dict:
+    """Flatten an application record into provider_applications columns."""
+    provider_info = application_data.get('provider_info', {})
+    ai_validation = application_data.get('ai_validation', {})
+    submission_date = application_data.get('submission_date')
+    
+    if isinstance(submission_date, str):
+        submission_date = datetime.fromisoformat(submission_date)
+    if submission_date is not None and submission_date.tzinfo is None:
+        # Legacy records were stamped with naive server-local time
+        submission_date = submission_date.astimezone(timezone.utc)
+    
+    return {
+        'application_id': application_data['application_id'],
+        'status': application_data.get('status', 'pending_review'),
+        'submission_date': submission_date or datetime.now(timezone.utc),
+        'full_name': provider_info.get('full_name'),
+        'email': provider_info.get('email'),
+        'phone': provider_info.get('phone'),
+        'specialty': provider_info.get('specialty'),
+        'license_number': provider_info.get('license_number'),
+        'npi': provider_info.get('npi'),
+        'practice_address': provider_info.get('practice_address'),
+        'confidence_score': ai_validation.get('confidence_score'),
+        'validation_path': ai_validation.get('path'),
+        'requires_review': bool(ai_validation.get('requires_review', False)),
+        'ai_validation': ai_validation,
+        'uploaded_file': application_data.get('uploaded_file', {})
+    }
+
+
+def _legacy_application_errors(application_data: dict) -> List[str]:
+    """
+    Reasons a legacy JSON application cannot be inserted as-is. The old JSON
+    path stored whatever the form sent, so overlong or malformed values exist.
+    """
+    errors = application_field_errors(application_data.get('provider_info') or {})
+    for field in ('application_id', 'status'):
+        limit = ProviderApplication.__table__.c[field].type.length
+        if len(str(application_data.get(field) or '')) > limit:
+            errors.append(f"{field}: must be at most {limit} characters")
+    
+    path = (application_data.get('ai_validation') or {}).get('path')
+    if len(str(path or '')) > ProviderApplication.__table__.c['validation_path'].type.length:
+        errors.append("ai_validation.path: too long")
+    
+    try:
+        _application_row_values(application_data)
+    except (TypeError, ValueError) as e:
+        errors.append(f"submission_date: {e}")
+    return errors
+
+
+def save_provider_application(application_data: dict) -> Optional[int]:
+    """
+    💾 SAVE PROVIDER APPLICATION
+    
+    Single-row insert keyed by application_id; cost does not grow with the
+    number of stored applications.
+    
+    Returns:
+        Database ID of the saved application, or None if failed
+    """
+    db = SessionLocal()
+    try:
+        application = ProviderApplication(**_application_row_values(application_data))
+        db.add(application)
+        db.commit()
+        return application.id
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error saving application: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def migrate_provider_applications_json(json_path: str = "provider_applications.json") -> int:
+    """
+    📦 ONE-TIME MIGRATION: provider_applications.json -> provider_applications table
+    
+    Inserts every record from the legacy JSON file (existing application_ids
+    are skipped, so re-running is safe) and renames the file to
+    '<name>.migrated' once it has been imported. Records that do not fit the
+    table (e.g. an 11-digit NPI) are skipped and written to '<name>.rejected'
+    with their errors, so one bad record cannot abort the migration.
+    
+    Returns:
+        Number of applications inserted
+    """
+    path = Path(json_path)
+    if not path.exists():
+        print(f"ℹ️ No legacy applications file at {path}")
+        return 0
+    
+    with path.open("r") as f:
+        applications = json.load(f)
+    
+    rows = []
+    rejected = []
+    for application in applications:
+        if not application.get('application_id'):
+            continue
+        errors = _legacy_application_errors(application)
+        if errors:
+            print(f"⚠️ Skipping application {application['application_id']}: {'; '.join(errors)}")
+            rejected.append({**application, 'migration_errors': errors})
+            continue
+        rows.append(_application_row_values(application))
+    
+    inserted = 0
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 500):
+            stmt = pg_insert(ProviderApplication).values(rows[start:start + 500])
+            stmt = stmt.on_conflict_do_nothing(index_elements=['application_id'])
+            inserted += conn.execute(stmt).rowcount
+    
+    if rejected:
+        rejected_path = path.with_name(path.name + ".rejected")
+        with rejected_path.open("w") as f:
+            json.dump(rejected, f, indent=2, default=str)
+        print(f"⚠️ {len(rejected)} application(s) could not be migrated; see {rejected_path}")
+    
+    path.rename(path.with_name(path.name + ".migrated"))
+    print(f"✅ Migrated {inserted} application(s) from {path} ({len(rows) - inserted} already present)")
+    return inserted
+
+
+# ============================================
+# TABLE 7: EXTRACTION CACHE (Parsed Uploads)
+# ============================================
+
+class ExtractionCache(Base):
+    """
+    ♻️ EXTRACTION CACHE: Provider lists extracted from uploaded files
+    
+    Keyed by the SHA-256 of the uploaded bytes plus the extractor version, so
+    re-uploading an identical roster skips CSV parsing / Gemini OCR, while a
+    new model or prompt produces fresh rows instead of stale hits.
+    """
+    __tablename__ = 'extraction_cache'
+    
+    content_sha256 = Column(String(64), primary_key=True)
+    extractor = Column(String(120), primary_key=True)  # e.g. "gemini-ocr:models/gemini-2.5-flash:1a2b3c4d"
+    
+    original_filename = Column(String(300))
+    size_bytes = Column(Integer)
+    provider_count = Column(Integer)
+    providers = Column(JSON, nullable=False)
+    
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+def get_cached_extraction(content_sha256: str, extractor: str) -> Optional[List[dict]]:
+    """
+    Look up a previous extraction of the same file bytes with the same extractor.
+    
+    Returns:
+        The cached provider list, or None on a miss (or if the lookup failed)
+    """
+    db = SessionLocal()
+    try:
+        entry = db.get(ExtractionCache, (content_sha256, extractor))
+        if entry is None:
+            return None
+        
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.now(timezone.utc)
+        db.commit()
+        return entry.providers
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Extraction cache lookup failed: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def save_cached_extraction(content_sha256: str, extractor: str, providers: List[dict],
+                           original_filename: Optional[str] = None,
+                           size_bytes: Optional[int] = None) -> bool:
+    """Store an extracted provider list. Concurrent saves of the same key are no-ops."""
+    try:
+        with engine.begin() as conn:
+            stmt = pg_insert(ExtractionCache).values(
+                content_sha256=content_sha256,
+                extractor=extractor,
+                original_filename=original_filename,
+                size_bytes=size_bytes,
+                provider_count=len(providers),
+                providers=providers,
+                hit_count=0
+            ).on_conflict_do_nothing(index_elements=['content_sha256', 'extractor'])
+            conn.execute(stmt)
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not cache extraction: {e}")
+        return False
+
+
+class GeocodeCache(Base):
+    """
+    📍 GEOCODE CACHE: Geocoding results keyed by canonical address
+    
+    Clinics appear once per clinician on a roster and providers are
+    re-validated, so most addresses have been geocoded before. "Not found"
+    results are cached too (found=False) with a shorter TTL.
+    """
+    __tablename__ = 'geocode_cache'
+    
+    address_key = Column(String(300), primary_key=True)  # geocoding.canonical_address()
+    found = Column(Boolean, nullable=False)
+    source = Column(String(20))  # geoapify / nominatim
+    result = Column(JSON, nullable=False)
+    
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False)  # naive UTC
+    last_used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+def get_cached_geocode(address_key: str) -> Optional[dict]:
+    """
+    Unexpired geocode result for a canonical address.
+    
+    Database errors are raised; geocoding.py calls this through
+    cache_db.cache_call(), which handles them.
+    
+    Returns:
+        The cached result (found or not found), or None on a miss
+    """
+    db = SessionLocal()
+    try:
+        entry = db.get(GeocodeCache, address_key)
+        now = datetime.now(timezone.utc)
+        if entry is None or entry.expires_at <= now.replace(tzinfo=None):
+            return None
+        
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = now
+        db.commit()
+        return entry.result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def save_cached_geocode(address_key: str, result: dict, ttl_seconds: float) -> bool:
+    """Store (or refresh an expired) geocode result. Database errors are raised."""
+    now = datetime.now(timezone.utc)
+    values = dict(
+        found=bool(result.get("success")),
+        source=result.get("source"),
+        result=result,
+        created_at=now,
+        expires_at=(now + timedelta(seconds=ttl_seconds)).replace(tzinfo=None),
+        last_used_at=now
+    )
+    with engine.begin() as conn:
+        stmt = pg_insert(GeocodeCache).values(address_key=address_key, hit_count=0, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=['address_key'], set_=values)
+        conn.execute(stmt)
+    return True
+
+
+class SearchCache(Base):
+    """
+    🔎 SEARCH CACHE: Serper API responses keyed by endpoint + exact payload
+    
+    Same-name providers and re-validations repeat the same scholar / web
+    presence queries; cached responses save Serper quota and latency.
+    """
+    __tablename__ = 'search_cache'
+    
+    query_key = Column(String(64), primary_key=True)  # serper_client.query_key()
+    endpoint = Column(String(40), nullable=False)
+    payload = Column(JSON, nullable=False)
+    response = Column(JSON, nullable=False)
+    
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False)  # naive UTC
+    last_used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+def get_cached_search(query_key: str) -> Optional[dict]:
+    """
+    Unexpired cached search response, or None on a miss.
+    
+    Database errors are raised; serper_client.py calls this through
+    cache_db.cache_call(), which handles them.
+    """
+    db = SessionLocal()
+    try:
+        entry = db.get(SearchCache, query_key)
+        now = datetime.now(timezone.utc)
+        if entry is None or entry.expires_at <= now.replace(tzinfo=None):
+            return None
+        
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = now
+        db.commit()
+        return entry.response
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def save_cached_search(query_key: str, endpoint: str, payload: dict, response: dict,
+                       ttl_seconds: float) -> bool:
+    """Store (or refresh an expired) search response. Database errors are raised."""
+    now = datetime.now(timezone.utc)
+    values = dict(
+        endpoint=endpoint,
+        payload=payload,
+        response=response,
+        created_at=now,
+        expires_at=(now + timedelta(seconds=ttl_seconds)).replace(tzinfo=None),
+        last_used_at=now
+    )
+    with engine.begin() as conn:
+        stmt = pg_insert(SearchCache).values(query_key=query_key, hit_count=0, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=['query_key'], set_=values)
+        conn.execute(stmt)
+    return True
+
+
+# ============================================
+# DASHBOARD AGGREGATE HELPERS
+# ============================================
+
+def provider_aggregate_deltas(tier: Optional[str], path: Optional[str],
+                              confidence_score: Optional[float],
+                              fraud_indicator_count: Optional[int],
+                              sign: int = 1) -> List[tuple]:
+    """
+    Aggregate contribution of one validated provider.
+    
+    Returns (metric, bucket, count_delta, value_delta) tuples; pass sign=-1
+    to remove a provider's previous contribution before re-adding it.
+    """
+    deltas = [('providers', 'total', sign, 0.0)]
+    
+    if tier:
+        deltas.append(('tier', tier, sign, 0.0))
+    if path:
+        deltas.append(('path', path, sign, 0.0))
+    if confidence_score is not None:
+        deltas.append(('confidence', 'scored', sign, sign * float(confidence_score)))
+    if fraud_indicator_count:
+        deltas.append(('fraud', 'flagged', sign, 0.0))
+    
+    return deltas
+
+
+def review_status_deltas(old_status: Optional[str], new_status: Optional[str]) -> List[tuple]:
+    """Aggregate deltas for a review queue entry moving between statuses."""
+    deltas = []
+    if old_status:
+        deltas.append(('review', old_status, -1, 0.0))
+    if new_status:
+        deltas.append(('review', new_status, 1, 0.0))
+    return deltas
+
+
+def apply_aggregate_deltas(db: Session, deltas: List[tuple]) -> None:
+    """
+    Apply counter deltas inside the caller's transaction.
+    
+    Uses INSERT ... ON CONFLICT DO UPDATE so concurrent writers increment
+    atomically. Rows are touched in sorted order to avoid deadlocks.
+    """
+    merged: Dict[tuple, list] = {}
+    for metric, bucket, count_delta, value_delta in deltas:
+        totals = merged.setdefault((metric, bucket), [0, 0.0])
+        totals[0] += count_delta
+        totals[1] += value_delta
+    
+    for (metric, bucket), (count_delta, value_delta) in sorted(merged.items()):
+        if count_delta == 0 and value_delta == 0:
+            continue
+        
+        stmt = pg_insert(DashboardAggregate).values(
+            metric=metric,
+            bucket=bucket,
+            count=count_delta,
+            value_sum=value_delta,
+            updated_at=datetime.now(timezone.utc)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['metric', 'bucket'],
+            set_={
+                'count': DashboardAggregate.count + stmt.excluded.count,
+                'value_sum': DashboardAggregate.value_sum + stmt.excluded.value_sum,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt)
+
+
+def _stored_provider_deltas(provider: 'ValidatedProvider', sign: int) -> List[tuple]:
+    """Aggregate contribution of a provider row as currently stored."""
+    path = provider.validation_path
+    fraud_indicator_count = provider.fraud_indicator_count
+    
+    # Rows saved before the promoted columns existed may not be backfilled yet
+    if provider.stage_npi is None:
+        quality_metrics = (provider.validation_metadata or {}).get('quality_metrics', {})
+        path = quality_metrics.get('path')
+        fraud_indicator_count = quality_metrics.get('fraud_indicator_count')
+    
+    return provider_aggregate_deltas(
+        tier=provider.confidence_tier,
+        path=path,
+        confidence_score=provider.confidence_score,
+        fraud_indicator_count=fraud_indicator_count,
+        sign=sign
+    )
+
+
+def remove_provider_from_aggregates(db: Session, provider: 'ValidatedProvider') -> None:
+    """Subtract a provider's contribution (call before deleting the row)."""
+    apply_aggregate_deltas(db, _stored_provider_deltas(provider, sign=-1))
+
+
+def rebuild_dashboard_aggregates() -> bool:
+    """
+    🔁 REBUILD DASHBOARD AGGREGATES
+    
+    Recomputes every counter from validated_providers and review_queue.
+    Use after backfills, manual SQL edits, or when first enabling the table.
+    Reads the promoted metadata columns, so run the column backfill first.
+    The aggregate table is locked for the duration so concurrent saves
+    queue behind the rebuild instead of being double-counted.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text("LOCK TABLE dashboard_aggregates IN EXCLUSIVE MODE"))
+        db.query(DashboardAggregate).delete()
+        
+        totals = db.query(
+            func.count(ValidatedProvider.id),
+            func.count(ValidatedProvider.confidence_score),
+            func.coalesce(func.sum(ValidatedProvider.confidence_score), 0.0)
+        ).one()
+        deltas = [
+            ('providers', 'total', totals[0], 0.0),
+            ('confidence', 'scored', totals[1], float(totals[2])),
+        ]
+        
+        for metric, column in (('tier', ValidatedProvider.confidence_tier),
+                               ('path', ValidatedProvider.validation_path)):
+            for bucket, count in db.query(column, func.count(ValidatedProvider.id)).group_by(column):
+                if bucket:
+                    deltas.append((metric, bucket, count, 0.0))
+        
+        fraud_count = db.query(func.count(ValidatedProvider.id)).filter(
+            ValidatedProvider.fraud_indicator_count > 0
+        ).scalar()
+        deltas.append(('fraud', 'flagged', fraud_count, 0.0))
+        
+        review_counts = db.query(
+            ReviewQueue.status, func.count(ReviewQueue.id)
+        ).group_by(ReviewQueue.status).all()
+        for status, count in review_counts:
+            if status:
+                deltas.append(('review', status, count, 0.0))
+        
+        apply_aggregate_deltas(db, deltas)
+        db.commit()
+        analytics_cache.invalidate()
+        
+        print(f"✅ Dashboard aggregates rebuilt ({len(deltas)} contributions)")
+        return True
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding dashboard aggregates: {e}")
+        return False
+    finally:
+        db.close()
+
+
+def seed_dashboard_aggregates() -> bool:
+    """
+    Compute the counters when dashboard_aggregates is empty, i.e. the table
+    was just created on a database that already holds providers. Without
+    this every counter reads 0 (and deltas drive them negative) until
+    rebuild_dashboard_aggregates() is run by hand.
+    
+    Returns:
+        True if a rebuild ran
+    """
+    db = SessionLocal()
+    try:
+        if db.query(DashboardAggregate).first() is not None:
+            return False
+    finally:
+        db.close()
+    
+    print("📈 dashboard_aggregates is empty - computing counters from existing rows")
+    backfill_promoted_columns()
+    return rebuild_dashboard_aggregates()
+
+
+# ============================================
+# MIGRATION: PROMOTED METADATA COLUMNS
+# ============================================
+
+PROMOTED_COLUMN_DDL = {
+    'validation_path': 'VARCHAR(10)',
+    'fraud_indicator_count': 'INTEGER DEFAULT 0',
+    **{column: 'DOUBLE PRECISION' for column in SCORE_COLUMNS.values()},
+    **{column: 'VARCHAR(20)' for column in STAGE_COLUMNS.values()},
+    'npi_match_confidence': 'DOUBLE PRECISION',
+    'address_confidence': 'DOUBLE PRECISION',
+    'latitude': 'DOUBLE PRECISION',
+    'longitude': 'DOUBLE PRECISION',
+    'geohash': 'VARCHAR(12)',
+}
+
+
+def ensure_promoted_columns():
+    """
+    Add the promoted metadata columns and indexes to an existing table.
+    
+    create_all() only creates missing tables, so databases created before
+    these columns existed need them added in place. Safe to run repeatedly.
+    """
+    include_columns = ', '.join(RECENT_VALIDATION_INCLUDE_COLUMNS)
+    
+    with engine.begin() as conn:
+        for column, ddl in PROMOTED_COLUMN_DDL.items():
+            conn.execute(text(
+                f"ALTER TABLE validated_providers ADD COLUMN IF NOT EXISTS {column} {ddl}"
+            ))
+        
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_validation_path ON validated_providers (validation_path)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_fraud_indicator_count ON validated_providers (fraud_indicator_count)"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS idx_recent_validations ON validated_providers "
+            f"(created_at) INCLUDE ({include_columns})"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS idx_provider_geohash ON validated_providers "
+            f"(geohash) INCLUDE ({', '.join(GEOHASH_INCLUDE_COLUMNS)})"
+        ))
+        
+        # Review queue priority ordering (derived from the priority string).
+        # Added without a default so existing rows stay NULL until ranked below.
+        conn.execute(text(
+            "ALTER TABLE review_queue ADD COLUMN IF NOT EXISTS priority_rank INTEGER"
+        ))
+        rank_case = ' '.join(
+            f"WHEN '{priority}' THEN {rank}" for priority, rank in REVIEW_PRIORITY_RANK.items()
+        )
+        conn.execute(text(
+            f"UPDATE review_queue SET priority_rank = CASE priority {rank_case} ELSE 1 END "
+            f"WHERE priority_rank IS NULL"
+        ))
+        conn.execute(text(
+            "ALTER TABLE review_queue ALTER COLUMN priority_rank SET DEFAULT 1"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_review_keyset ON review_queue "
+            "(status, priority_rank, created_at, id)"
+        ))
+
+
+def backfill_promoted_columns(batch_size: int = 1000) -> int:
+    """
+    🔁 BACKFILL PROMOTED METADATA COLUMNS
+    
+    Copies path, fraud count, score breakdown and stage statuses out of
+    validation_metadata for rows saved before the columns existed, and
+    clears ZIP-centroid coordinates saved as real locations.
+    Runs in batches so large tables are not locked in one transaction.
+    
+    Returns:
+        Number of rows backfilled
+    """
+    quality = "validation_metadata->'quality_metrics'"
+    execution = "validation_metadata->'execution_metadata'"
+    
+    assignments = [
+        f"validation_path = {quality}->>'path'",
+        f"fraud_indicator_count = COALESCE(({quality}->>'fraud_indicator_count')::int, 0)",
+        f"npi_match_confidence = ({execution}->'nppes'->>'match_confidence')::float",
+        f"address_confidence = ({execution}->'address'->>'confidence')::float",
+    ]
+    assignments += [
+        f"{column} = ({quality}->'score_breakdown'->>'{dimension}')::float"
+        for dimension, column in SCORE_COLUMNS.items()
+    ]
+    assignments += [
+        f"{column} = COALESCE({execution}->'{stage}'->>'status', 'pending')"
+        for stage, column in STAGE_COLUMNS.items()
+    ]
+    
+    # stage_npi is always written by save_validated_provider, so a NULL
+    # marks a row that has not been backfilled yet
+    update_sql = text(f"""
+        UPDATE validated_providers SET {', '.join(assignments)}
+        WHERE id IN (
+            SELECT id FROM validated_providers
+            WHERE stage_npi IS NULL
+            LIMIT :batch_size
+        )
+    """)
+    
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(update_sql, {'batch_size': batch_size}).rowcount
+        total += updated
+        if updated < batch_size:
+            break
+        print(f"  ...backfilled {total} rows")
+    
+    print(f"✅ Backfilled promoted metadata columns for {total} provider(s)")
+    clear_zip_centroid_coordinates()
+    return total
+
+
+def clear_zip_centroid_coordinates() -> int:
+    """
+    Clear coordinates on rows saved while ZIP centroids were persisted as
+    real locations. One-time data fix: a JSON-filtered scan of the table,
+    so it runs with the backfill rather than at every startup.
+    """
+    with engine.begin() as conn:
+        cleared = conn.execute(text(
+            "UPDATE validated_providers SET latitude = NULL, longitude = NULL, geohash = NULL "
+            "WHERE geohash IS NOT NULL AND "
+            "validation_metadata -> 'execution_metadata' -> 'address' ->> 'coordinates_source' = 'zip_centroid'"
+        )).rowcount
+    if cleared:
+        print(f"✅ Cleared ZIP-centroid coordinates on {cleared} provider(s)")
+    return cleared
+
+
 # ============================================
 # DATABASE HELPER FUNCTIONS
 # ============================================
@@ -319,11 +1203,16 @@ def init_database():
         # Create all tables
         print("\n📋 Creating tables...")
         Base.metadata.create_all(bind=engine)
+        ensure_promoted_columns()
+        seed_dashboard_aggregates()
         
         print("✅ validated_providers table")
         print("✅ verification_history table")
         print("✅ review_queue table")
         print("✅ data_source_logs table")
+        print("✅ dashboard_aggregates table")
+        print("✅ provider_applications table")
+        print("✅ extraction_cache table")
         
         print("\n" + "="*60)
         print("✅ DATABASE INITIALIZED SUCCESSFULLY!")
@@ -346,6 +1235,136 @@ def init_database():
         return False
 
 
+def upsert_validated_provider(db: Session, golden_record: dict, state: dict,
+                              existing: Optional['ValidatedProvider'] = None) -> 'ValidatedProvider':
+    """
+    Insert or update a validated provider inside the caller's session.
+    
+    Also applies the dashboard aggregate deltas and writes a history row.
+    Does not commit, so several providers can be saved in one transaction.
+    
+    Args:
+        existing: The stored row for this NPI, or None to create one
+    """
+    if existing:
+        # UPDATE existing record
+        print(f"📝 Updating existing provider NPI: {golden_record.get('npi')}")
+        
+        # Remove the old contribution before the fields are overwritten
+        aggregate_deltas = _stored_provider_deltas(existing, sign=-1)
+        
+        # Update fields
+        existing.provider_name = golden_record.get('provider_name')
+        existing.specialty = golden_record.get('specialty')
+        existing.address = golden_record.get('address')
+        existing.city = golden_record.get('city', '')
+        existing.state = golden_record.get('state', '')
+        existing.zip_code = golden_record.get('zip_code', '')
+        existing.phone = golden_record.get('phone')
+        existing.website = golden_record.get('website')
+        
+        existing.license_status = golden_record.get('license_status')
+        existing.license_number = golden_record.get('license_number', '')
+        existing.license_state = golden_record.get('license_state', '')
+        existing.oig_excluded = golden_record.get('oig_excluded', False)
+        
+        existing.confidence_score = state.get('confidence_score')
+        existing.confidence_tier = state.get('quality_metrics', {}).get('confidence_tier')
+        existing.digital_footprint_score = golden_record.get('digital_footprint_score', 0)
+        existing.risk_score = state.get('quality_metrics', {}).get('risk_score', 0)
+        
+        existing.education = golden_record.get('education', [])
+        existing.certifications = golden_record.get('certifications', [])
+        existing.languages = golden_record.get('languages', [])
+        existing.insurance_accepted = golden_record.get('insurance_accepted', [])
+        
+        existing.qa_flags = state.get('qa_flags', [])
+        existing.fraud_indicators = state.get('fraud_indicators', [])
+        
+        existing.updated_at = datetime.now(timezone.utc)
+        existing.last_verified = datetime.now(timezone.utc)
+        
+        existing.validation_metadata = {
+            'execution_metadata': state.get('execution_metadata', {}),
+            'quality_metrics': state.get('quality_metrics', {})
+        }
+        existing.data_sources = golden_record.get('data_sources', {})
+        
+        for column, value in promoted_metadata_columns(state).items():
+            setattr(existing, column, value)
+        
+        provider = existing
+    
+    else:
+        # CREATE new record
+        print(f"✨ Creating new provider NPI: {golden_record.get('npi')}")
+        
+        aggregate_deltas = []
+        
+        new_provider = ValidatedProvider(
+            npi=golden_record.get('npi'),
+            provider_name=golden_record.get('provider_name'),
+            specialty=golden_record.get('specialty'),
+            address=golden_record.get('address'),
+            city=golden_record.get('city', ''),
+            state=golden_record.get('state', ''),
+            zip_code=golden_record.get('zip_code', ''),
+            phone=golden_record.get('phone'),
+            website=golden_record.get('website'),
+            
+            license_status=golden_record.get('license_status'),
+            license_number=golden_record.get('license_number', ''),
+            license_state=golden_record.get('license_state', ''),
+            oig_excluded=golden_record.get('oig_excluded', False),
+            
+            confidence_score=state.get('confidence_score'),
+            confidence_tier=state.get('quality_metrics', {}).get('confidence_tier'),
+            digital_footprint_score=golden_record.get('digital_footprint_score', 0),
+            risk_score=state.get('quality_metrics', {}).get('risk_score', 0),
+            
+            education=golden_record.get('education', []),
+            certifications=golden_record.get('certifications', []),
+            languages=golden_record.get('languages', []),
+            insurance_accepted=golden_record.get('insurance_accepted', []),
+            
+            qa_flags=state.get('qa_flags', []),
+            fraud_indicators=state.get('fraud_indicators', []),
+            
+            validation_metadata={
+                'execution_metadata': state.get('execution_metadata', {}),
+                'quality_metrics': state.get('quality_metrics', {})
+            },
+            data_sources=golden_record.get('data_sources', {}),
+            
+            **promoted_metadata_columns(state)
+        )
+        
+        db.add(new_provider)
+        db.flush()  # Get the ID
+        provider = new_provider
+    
+    # Keep dashboard counters in step with this write
+    quality_metrics = state.get('quality_metrics', {})
+    aggregate_deltas.extend(provider_aggregate_deltas(
+        tier=quality_metrics.get('confidence_tier'),
+        path=quality_metrics.get('path'),
+        confidence_score=state.get('confidence_score'),
+        fraud_indicator_count=quality_metrics.get('fraud_indicator_count')
+    ))
+    apply_aggregate_deltas(db, aggregate_deltas)
+    
+    # Save to history
+    history = VerificationHistory(
+        provider_id=provider.id,
+        confidence_score=state.get('confidence_score'),
+        changes_detected={},  # You can track changes here
+        verification_result=state.get('quality_metrics', {})
+    )
+    db.add(history)
+    
+    return provider
+
+
 def save_validated_provider(golden_record: dict, state: dict) -> Optional[int]:
     """
     💾 SAVE VALIDATED PROVIDER TO DATABASE
@@ -364,103 +1383,11 @@ def save_validated_provider(golden_record: dict, state: dict) -> Optional[int]:
         # Check if provider already exists
         existing = db.query(ValidatedProvider).filter_by(npi=golden_record.get('npi')).first()
         
-        if existing:
-            # UPDATE existing record
-            print(f"📝 Updating existing provider NPI: {golden_record.get('npi')}")
-            
-            # Update fields
-            existing.provider_name = golden_record.get('provider_name')
-            existing.specialty = golden_record.get('specialty')
-            existing.address = golden_record.get('address')
-            existing.city = golden_record.get('city', '')
-            existing.state = golden_record.get('state', '')
-            existing.zip_code = golden_record.get('zip_code', '')
-            existing.phone = golden_record.get('phone')
-            existing.website = golden_record.get('website')
-            
-            existing.license_status = golden_record.get('license_status')
-            existing.license_number = golden_record.get('license_number', '')
-            existing.license_state = golden_record.get('license_state', '')
-            existing.oig_excluded = golden_record.get('oig_excluded', False)
-            
-            existing.confidence_score = state.get('confidence_score')
-            existing.confidence_tier = state.get('quality_metrics', {}).get('confidence_tier')
-            existing.digital_footprint_score = golden_record.get('digital_footprint_score', 0)
-            existing.risk_score = state.get('quality_metrics', {}).get('risk_score', 0)
-            
-            existing.education = golden_record.get('education', [])
-            existing.certifications = golden_record.get('certifications', [])
-            existing.languages = golden_record.get('languages', [])
-            existing.insurance_accepted = golden_record.get('insurance_accepted', [])
-            
-            existing.qa_flags = state.get('qa_flags', [])
-            existing.fraud_indicators = state.get('fraud_indicators', [])
-            
-            existing.updated_at = datetime.now(timezone.utc)
-            existing.last_verified = datetime.now(timezone.utc)
-            
-            existing.validation_metadata = {
-                'execution_metadata': state.get('execution_metadata', {}),
-                'quality_metrics': state.get('quality_metrics', {})
-            }
-            existing.data_sources = golden_record.get('data_sources', {})
-            
-            provider_id = existing.id
-            
-        else:
-            # CREATE new record
-            print(f"✨ Creating new provider NPI: {golden_record.get('npi')}")
-            
-            new_provider = ValidatedProvider(
-                npi=golden_record.get('npi'),
-                provider_name=golden_record.get('provider_name'),
-                specialty=golden_record.get('specialty'),
-                address=golden_record.get('address'),
-                city=golden_record.get('city', ''),
-                state=golden_record.get('state', ''),
-                zip_code=golden_record.get('zip_code', ''),
-                phone=golden_record.get('phone'),
-                website=golden_record.get('website'),
-                
-                license_status=golden_record.get('license_status'),
-                license_number=golden_record.get('license_number', ''),
-                license_state=golden_record.get('license_state', ''),
-                oig_excluded=golden_record.get('oig_excluded', False),
-                
-                confidence_score=state.get('confidence_score'),
-                confidence_tier=state.get('quality_metrics', {}).get('confidence_tier'),
-                digital_footprint_score=golden_record.get('digital_footprint_score', 0),
-                risk_score=state.get('quality_metrics', {}).get('risk_score', 0),
-                
-                education=golden_record.get('education', []),
-                certifications=golden_record.get('certifications', []),
-                languages=golden_record.get('languages', []),
-                insurance_accepted=golden_record.get('insurance_accepted', []),
-                
-                qa_flags=state.get('qa_flags', []),
-                fraud_indicators=state.get('fraud_indicators', []),
-                
-                validation_metadata={
-                    'execution_metadata': state.get('execution_metadata', {}),
-                    'quality_metrics': state.get('quality_metrics', {})
-                },
-                data_sources=golden_record.get('data_sources', {})
-            )
-            
-            db.add(new_provider)
-            db.flush()  # Get the ID
-            provider_id = new_provider.id
-        
-        # Save to history
-        history = VerificationHistory(
-            provider_id=provider_id,
-            confidence_score=state.get('confidence_score'),
-            changes_detected={},  # You can track changes here
-            verification_result=state.get('quality_metrics', {})
-        )
-        db.add(history)
+        provider = upsert_validated_provider(db, golden_record, state, existing)
+        provider_id = provider.id
         
         db.commit()
+        analytics_cache.invalidate()
         print(f"✅ Provider saved successfully! ID: {provider_id}")
         return provider_id
         
@@ -514,12 +1441,15 @@ def save_to_review_queue(provider_data: dict, state: dict) -> Optional[int]:
             fraud_indicators=fraud,
             status="PENDING",
             priority=priority,
+            priority_rank=REVIEW_PRIORITY_RANK[priority],
             original_data=provider_data,
             validation_result=state.get("quality_metrics", {})
         )
 
         db.add(review_entry)
+        apply_aggregate_deltas(db, review_status_deltas(None, "PENDING"))
         db.commit()
+        analytics_cache.invalidate()
 
         review_id = review_entry.id
         print(f"📋 Added to review queue! ID: {review_id} | Priority: {priority}")
@@ -545,8 +1475,9 @@ def get_pending_reviews(limit: int = 50) -> List[dict]:
     db = SessionLocal()
     try:
         reviews = db.query(ReviewQueue).filter_by(status='PENDING').order_by(
-            ReviewQueue.priority.desc(),
-            ReviewQueue.created_at.asc()
+            ReviewQueue.priority_rank.asc(),
+            ReviewQueue.created_at.asc(),
+            ReviewQueue.id.asc()
         ).limit(limit).all()
         
         return [r.to_dict() for r in reviews]
@@ -592,6 +1523,23 @@ def search_providers(
 # ============================================
 
 if __name__ == "__main__":
+    import sys
+    
+    if "--backfill-metadata-columns" in sys.argv:
+        ensure_promoted_columns()
+        backfill_promoted_columns()
+        sys.exit(0)
+    
+    if "--migrate-applications" in sys.argv:
+        init_database()
+        migrate_provider_applications_json()
+        sys.exit(0)
+    
+    if "--rebuild-aggregates" in sys.argv:
+        ensure_promoted_columns()
+        backfill_promoted_columns()
+        sys.exit(0 if rebuild_dashboard_aggregates() else 1)
+    
     print("\n" + "🏥"*30)
     print("HEALTHCARE PROVIDER DATABASE SETUP")
     print("🏥"*30)
@@ -2,7 +2,8 @@ import sys
 from datetime import datetime
 from database_setup import (
     SessionLocal, ValidatedProvider, ReviewQueue, 
-    VerificationHistory, DataSourceLog, search_providers, get_pending_reviews
+    VerificationHistory, DataSourceLog, search_providers, get_pending_reviews,
+    apply_aggregate_deltas, review_status_deltas, remove_provider_from_aggregates
 )
 
 
@@ -100,7 +101,7 @@ def view_review_queue():
     db = SessionLocal()
     try:
         reviews = db.query(ReviewQueue).filter_by(status='PENDING').order_by(
-            ReviewQueue.priority.desc(),
+            ReviewQueue.priority_rank.asc(),
             ReviewQueue.created_at.asc()
         ).all()
         
@@ -248,7 +249,10 @@ def approve_reject_review():
         reviewer_name = input("Your name: ").strip()
         notes = input("Notes (optional): ").strip()
         
-        review.status = 'APPROVED' if decision == 'A' else 'REJECTED'
+        new_status = 'APPROVED' if decision == 'A' else 'REJECTED'
+        apply_aggregate_deltas(db, review_status_deltas(review.status, new_status))
+        
+        review.status = new_status
         review.reviewed_at = datetime.now()
         review.reviewer_name = reviewer_name
         review.reviewer_notes = notes
@@ -293,6 +297,7 @@ def delete_provider():
         confirm = input("\nType 'DELETE' to confirm: ").strip()
         
         if confirm == 'DELETE':
+            remove_provider_from_aggregates(db, provider)
             db.delete(provider)
             db.commit()
             print(f"\n✅ Provider {provider_id} deleted")
@@ -0,0 +1,100 @@
+"""
+Geo Clustering Helpers
+File: backend/geo_clustering.py
+
+Geohash encoding for provider coordinates and the zoom -> geohash precision
+mapping used by /api/analytics/providers-geolocation. Providers are stored
+with a full-precision geohash; clustering at a zoom level is a GROUP BY on
+a geohash prefix, so the globe receives one aggregate per visible cell
+instead of every provider.
+"""
+
+from typing import Optional
+
+
+GEOHASH_PRECISION = 9  # ~5m cells, stored on validated_providers.geohash
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Approximate state centroids, used for providers saved before coordinates
+# were recorded (or whose address could not be geocoded)
+STATE_CENTROIDS = {
+    "CA": {"lat": 36.7783, "lon": -119.4179},
+    "TX": {"lat": 31.9686, "lon": -99.9018},
+    "FL": {"lat": 27.6648, "lon": -81.5158},
+    "NY": {"lat": 42.1657, "lon": -74.9481},
+    "IL": {"lat": 40.6331, "lon": -89.3985},
+    "PA": {"lat": 41.2033, "lon": -77.1945},
+    "OH": {"lat": 40.4173, "lon": -82.9071},
+    "MA": {"lat": 42.4072, "lon": -71.3824},
+    "WA": {"lat": 47.7511, "lon": -120.7401},
+    "CO": {"lat": 39.5501, "lon": -105.7821},
+    "AZ": {"lat": 34.0489, "lon": -111.0937},
+    "MI": {"lat": 44.3148, "lon": -85.6024},
+    "GA": {"lat": 32.1656, "lon": -82.9001},
+    "NC": {"lat": 35.7596, "lon": -79.0193},
+    "NJ": {"lat": 40.0583, "lon": -74.4057},
+}
+US_CENTROID = {"lat": 39.8283, "lon": -98.5795}
+
+# Map zoom level -> geohash prefix length used for clustering.
+# Zoom levels beyond the last entry return individual providers.
+ZOOM_PRECISION = [
+    (2, 2),    # continent / country
+    (4, 3),    # multi-state region
+    (7, 4),    # state / metro
+    (10, 5),   # city
+    (13, 6),   # neighbourhood
+]
+MAX_CLUSTER_ZOOM = ZOOM_PRECISION[-1][0]
+
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash of a coordinate."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        value, bounds = (lon, lon_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_for_coordinates(coordinates: Optional[dict]) -> Optional[str]:
+    """Geohash for a {"lat", "lng"} dict, or None if it is missing/invalid."""
+    if not coordinates:
+        return None
+    try:
+        lat = float(coordinates["lat"])
+        lon = float(coordinates.get("lng", coordinates.get("lon")))
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return encode_geohash(lat, lon)
+
+
+def zoom_to_precision(zoom: int) -> Optional[int]:
+    """Geohash prefix length for a zoom level, or None for individual points."""
+    for max_zoom, precision in ZOOM_PRECISION:
+        if zoom <= max_zoom:
+            return precision
+    return None
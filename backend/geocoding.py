@@ -0,0 +1,286 @@
+"""
+Shared Geocoding Layer
+File: backend/geocoding.py
+
+One forward geocode per normalized address, shared by the address verdict
+(tools.validate_address) and the facility check
+(production_tools.verify_medical_facility), which previously geocoded the
+same address through Geoapify and Nominatim respectively.
+
+Geoapify is used when GEOAPIFY_API_KEY is set (it returns a match
+confidence); otherwise, or if Geoapify errors, Nominatim. Lookups go
+through two cache tiers keyed by canonical_address():
+
+1. a short-lived in-process memo, so both consumers in
+   validate_address_node cost one lookup
+2. the geocode_cache table, so addresses repeated across rosters and
+   re-validations are never sent upstream again within
+   GEOCODE_CACHE_TTL_SECONDS ("not found" within GEOCODE_NEGATIVE_TTL_SECONDS);
+   skipped while the database is unreachable (see cache_db.py)
+
+Concurrent lookups of one address are collapsed.
+
+Every result has the same keys whichever provider answered:
+
+    success, not_found, latitude, longitude, formatted_address,
+    confidence, result_type, address_details, osm_type, osm_id,
+    source, error, rate_limit_wait_seconds, cached
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+
+from config import (
+    GEOCODE_MEMO_TTL_SECONDS,
+    GEOCODE_MEMO_MAX_ENTRIES,
+    GEOCODE_CACHE_TTL_SECONDS,
+    GEOCODE_NEGATIVE_TTL_SECONDS,
+)
+from cache_db import cache_call
+from rate_limiter import rate_limiter
+from singleflight import SingleFlight
+from zip_index import normalize_zip
+
+
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+GEOAPIFY_SEARCH_URL = "https://api.geoapify.com/v1/geocode/search"
+NOMINATIM_USER_AGENT = "HealthcareProviderVerification/1.0"  # Required by Nominatim
+
+# Nominatim has no match confidence; approximate one from how specific the
+# matched feature is (place_rank 30 = building / house number, 26 = street)
+_NOMINATIM_RANK_CONFIDENCE = [(30, 0.95), (26, 0.7), (0, 0.4)]
+
+_memo: "OrderedDict[str, tuple]" = OrderedDict()
+_memo_lock = threading.Lock()
+_in_flight = SingleFlight()
+
+
+# USPS Publication 28 standard abbreviations (common subset)
+STREET_SUFFIXES = {
+    "AVENUE": "AVE", "AV": "AVE", "BOULEVARD": "BLVD", "CIRCLE": "CIR", "COURT": "CT",
+    "CENTER": "CTR", "DRIVE": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY",
+    "LANE": "LN", "PARKWAY": "PKWY", "PLACE": "PL", "PLAZA": "PLZ", "ROAD": "RD",
+    "SQUARE": "SQ", "STREET": "ST", "STR": "ST", "TERRACE": "TER", "TRAIL": "TRL",
+    "TURNPIKE": "TPKE", "WAY": "WAY", "ALLEY": "ALY", "CROSSING": "XING", "POINT": "PT",
+}
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+# usaddress labels that make up the key, in order. Suite / unit numbers are
+# left out: every unit in a building geocodes to the same point.
+_KEY_LABELS = [
+    "AddressNumber", "StreetNamePreDirectional", "StreetNamePreType", "StreetName",
+    "StreetNamePostType", "StreetNamePostDirectional",
+]
+
+
+def _clean(value) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", str(value or "")).upper().split())
+
+
+def _standardize(label: str, value: str) -> str:
+    words = value.split()
+    if label in ("StreetNamePostType", "StreetNamePreType"):
+        words = [STREET_SUFFIXES.get(w, w) for w in words]
+    elif label.endswith("Directional"):
+        words = [DIRECTIONALS.get(w, w) for w in words]
+    return " ".join(words)
+
+
+def canonical_address(address: str, city: str, state: str, zip_code: str) -> str:
+    """
+    Cache key for an address: usaddress-tagged street components with USPS
+    suffixes / directionals, city, state and 5-digit ZIP, e.g.
+    "123 N MAIN ST|BOSTON|MA|02110" for "123 North Main Street, Suite 4".
+    """
+    zip5 = normalize_zip(zip_code)
+    street = _clean(address)
+
+    try:
+        import usaddress
+
+        tagged, _ = usaddress.tag(street)
+        components = [_standardize(label, tagged[label]) for label in _KEY_LABELS if tagged.get(label)]
+        if components:
+            street = " ".join(components)
+    except Exception:
+        # Ambiguous parse (RepeatedLabelError) or usaddress missing: plain cleanup
+        pass
+
+    return "|".join([street, _clean(city), _clean(state), zip5])
+
+
+def _result(source: str, **fields) -> dict:
+    result = {
+        "success": False,
+        "not_found": False,
+        "latitude": None,
+        "longitude": None,
+        "formatted_address": "",
+        "confidence": 0.0,
+        "result_type": None,
+        "address_details": {},
+        "osm_type": "",
+        "osm_id": "",
+        "source": source,
+        "error": None,
+        "rate_limit_wait_seconds": 0.0,
+        "cached": False,
+    }
+    result.update(fields)
+    return result
+
+
+def geocode_geoapify(full_address: str, api_key: str) -> dict:
+    response = requests.get(
+        GEOAPIFY_SEARCH_URL,
+        params={"text": full_address, "apiKey": api_key},
+        timeout=10
+    )
+    response.raise_for_status()
+    features = response.json().get("features") or []
+
+    if not features:
+        return _result("geoapify", not_found=True, error="Address not found")
+
+    props = features[0]["properties"]
+    datasource = props.get("datasource", {})
+    return _result(
+        "geoapify",
+        success=True,
+        latitude=float(props["lat"]),
+        longitude=float(props["lon"]),
+        formatted_address=props.get("formatted", ""),
+        confidence=props.get("rank", {}).get("confidence", 0),
+        result_type=props.get("result_type"),
+        # Raw OSM tags when Geoapify matched an OSM feature (building, amenity, ...)
+        address_details=datasource.get("raw", {}),
+        osm_type=datasource.get("raw", {}).get("osm_type", ""),
+        osm_id=datasource.get("raw", {}).get("osm_id", ""),
+    )
+
+
+def geocode_nominatim(full_address: str) -> dict:
+    waited = rate_limiter("nominatim").acquire()
+
+    response = requests.get(
+        NOMINATIM_SEARCH_URL,
+        params={"q": full_address, "format": "json", "limit": 1, "addressdetails": 1},
+        headers={"User-Agent": NOMINATIM_USER_AGENT},
+        timeout=10
+    )
+    response.raise_for_status()
+    results = response.json()
+
+    if not results:
+        return _result("nominatim", not_found=True, error="Address not found",
+                       rate_limit_wait_seconds=waited)
+
+    match = results[0]
+    place_rank = int(match.get("place_rank", 0))
+    confidence = next(c for rank, c in _NOMINATIM_RANK_CONFIDENCE if place_rank >= rank)
+    return _result(
+        "nominatim",
+        success=True,
+        latitude=float(match["lat"]),
+        longitude=float(match["lon"]),
+        formatted_address=match.get("display_name", ""),
+        confidence=confidence,
+        result_type=match.get("addresstype", match.get("type")),
+        address_details=match.get("address", {}),
+        osm_type=match.get("osm_type", ""),
+        osm_id=match.get("osm_id", ""),
+        rate_limit_wait_seconds=waited,
+    )
+
+
+def _geocode_uncached(address: str, city: str, state: str, zip_code: str) -> dict:
+    full_address = f"{address}, {city}, {state} {zip_code}, USA"
+
+    api_key = os.environ.get("GEOAPIFY_API_KEY")
+    if api_key:
+        try:
+            return geocode_geoapify(full_address, api_key)
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"  ⚠️ Geoapify geocoding failed, trying Nominatim: {e}")
+
+    try:
+        return geocode_nominatim(full_address)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        return _result("nominatim", error=str(e))
+
+
+def _memo_get(key: str) -> Optional[dict]:
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > GEOCODE_MEMO_TTL_SECONDS:
+            del _memo[key]
+            return None
+        _memo.move_to_end(key)
+        return result
+
+
+def _memo_put(key: str, result: dict):
+    with _memo_lock:
+        _memo[key] = (time.monotonic(), result)
+        _memo.move_to_end(key)
+        while len(_memo) > GEOCODE_MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+
+def _persistent_get(key: str) -> Optional[dict]:
+    result = cache_call("get_cached_geocode", key)
+    if result is not None:
+        result = {**result, "cached": True, "rate_limit_wait_seconds": 0.0}
+    return result
+
+
+def _persistent_put(key: str, result: dict):
+    ttl = GEOCODE_CACHE_TTL_SECONDS if result["success"] else GEOCODE_NEGATIVE_TTL_SECONDS
+    cache_call("save_cached_geocode", key, result, ttl)
+
+
+def geocode_address(address: str, city: str, state: str, zip_code: str) -> dict:
+    """
+    Canonical geocode for an address (see module docstring for the keys).
+
+    Transport errors are returned in "error" rather than raised, and are not
+    memoized so the next caller retries.
+    """
+    key = canonical_address(address, city, state, zip_code)
+
+    result = _memo_get(key)
+    reused = result is not None
+    if result is None:
+        def lookup():
+            cached = _persistent_get(key)
+            if cached is not None:
+                _memo_put(key, cached)
+                return cached
+
+            fresh = _geocode_uncached(address, city, state, zip_code)
+            if fresh["success"] or fresh["not_found"]:
+                _memo_put(key, fresh)
+                _persistent_put(key, fresh)
+            return fresh
+
+        result, reused = _in_flight.run(key, lookup)
+
+    # Callers are free to modify what they get back
+    result = copy.deepcopy(result)
+    if reused or result["cached"]:
+        # This caller did not wait on the upstream rate limit
+        result["rate_limit_wait_seconds"] = 0.0
+    return result
@@ -0,0 +1,157 @@
+"""
+Per-Host Politeness Scheduler
+File: backend/host_scheduler.py
+
+Concurrent validations often point at the same health-system domain. To
+avoid being throttled or blocked, website requests go through a per-host
+slot:
+
+- at most WEBSITE_PER_HOST_CONCURRENCY requests to a host run at once
+- request starts to one host are spaced WEBSITE_PER_HOST_MIN_INTERVAL apart
+
+Different hosts never wait on each other. Time spent queueing is returned
+to the caller and accumulated per host for stats().
+
+State for hosts with nothing queued or running is dropped once they have
+been idle for HOST_IDLE_SECONDS (their counts move into the "pruned"
+totals of stats()), so a long batch over many domains stays bounded.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlsplit
+
+from config import WEBSITE_PER_HOST_CONCURRENCY, WEBSITE_PER_HOST_MIN_INTERVAL
+
+
+HOST_IDLE_SECONDS = 300
+# Idle hosts are swept at most this often
+_PRUNE_INTERVAL_SECONDS = 60
+
+
+def host_key(url: str) -> str:
+    """Host a URL's requests are scheduled under (www. is the same site)."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _HostState:
+    def __init__(self, concurrency: int):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.waiting = 0
+        self.active = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_used = time.monotonic()
+
+    def idle_since(self, cutoff: float) -> bool:
+        return (not self.waiting and not self.active
+                and self.last_used < cutoff and self.next_start < cutoff)
+
+
+class HostScheduler:
+    def __init__(self, concurrency: int = WEBSITE_PER_HOST_CONCURRENCY,
+                 min_interval: float = WEBSITE_PER_HOST_MIN_INTERVAL):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+        self._pruned_at = time.monotonic()
+        self._pruned = {"hosts": 0, "requests": 0, "total_wait_seconds": 0.0}
+
+    def _join_queue(self, host: str) -> _HostState:
+        """The host's state, already counting this caller as waiting."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._pruned_at > _PRUNE_INTERVAL_SECONDS:
+                self._prune(now - HOST_IDLE_SECONDS)
+                self._pruned_at = now
+
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.concurrency)
+            # Registered under the scheduler lock, so a state a caller holds
+            # is never pruned (which would give its host a second semaphore)
+            with state.lock:
+                state.waiting += 1
+            return state
+
+    def _prune(self, cutoff: float):
+        """Drop idle hosts' state. Caller holds self._lock."""
+        for host, state in list(self._hosts.items()):
+            with state.lock:
+                if not state.idle_since(cutoff):
+                    continue
+                self._pruned["hosts"] += 1
+                self._pruned["requests"] += state.requests
+                self._pruned["total_wait_seconds"] += state.total_wait
+            del self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Hold a request slot for the URL's host.
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        start = time.monotonic()
+        state = self._join_queue(host_key(url))
+        state.slots.acquire()
+
+        # Reserve the next start time under the lock, then sleep outside it
+        with state.lock:
+            now = time.monotonic()
+            start_at = max(now, state.next_start)
+            state.next_start = start_at + self.min_interval
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        waited = time.monotonic() - start
+        with state.lock:
+            state.waiting -= 1
+            state.active += 1
+            state.requests += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+
+        try:
+            yield waited
+        finally:
+            with state.lock:
+                state.active -= 1
+                state.last_used = time.monotonic()
+            state.slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = dict(self._hosts)
+            pruned = dict(self._pruned)
+
+        per_host = {}
+        for host, state in hosts.items():
+            with state.lock:
+                per_host[host] = {
+                    "requests": state.requests,
+                    "active": state.active,
+                    "waiting": state.waiting,
+                    "total_wait_seconds": round(state.total_wait, 3),
+                    "avg_wait_seconds": round(state.total_wait / state.requests, 3) if state.requests else 0.0,
+                    "max_wait_seconds": round(state.max_wait, 3),
+                }
+
+        return {
+            "per_host_concurrency": self.concurrency,
+            "min_interval_seconds": self.min_interval,
+            "hosts": per_host,
+            "pruned": {**pruned, "total_wait_seconds": round(pruned["total_wait_seconds"], 3)},
+        }
+
+
+host_scheduler = HostScheduler()
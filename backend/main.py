@@ -1,14 +1,18 @@
 import os
+import sys
 import json
+import base64
+import time
 import uuid
 import asyncio
-import pandas as pd
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 from asyncio import Queue
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import shutil
 from pathlib import Path
 import psycopg2
@@ -22,13 +26,106 @@ from psycopg2.extras import RealDictCursor
 
 from fastapi import WebSocket, WebSocketDisconnect
 
-from agent import app as validation_agent_app
-from pipeline.ocr_pipeline import run_ocr
+from analytics_cache import analytics_cache, etag_matches, CachedResponse
+from geo_clustering import STATE_CENTROIDS, US_CENTROID, zoom_to_precision
+from upload_spool import spool_upload, sweep_spool_dir, UploadTooLargeError, UploadSizeLimitMiddleware
 
-from tools import parse_provider_pdf
 
-app = FastAPI(title="Health Atlas Provider Validator v2.1")
+# ============================================
+# STARTUP / READINESS
+# ============================================
 
+# Phases that must succeed before /api/ready reports ready
+REQUIRED_STARTUP_PHASES = ("database", "validation_agent")
+
+# phase -> {"status": "pending" | "ok" | "error", "seconds": float, "error": str}
+startup_report: Dict[str, Dict[str, Any]] = {}
+
+
+def get_validation_agent():
+    """
+    The compiled LangGraph validation agent.
+    
+    Imported on first use rather than at module import, since it pulls in the
+    scraping / OCR / LLM stack. Startup warms it in the background.
+    """
+    from agent import app as validation_agent_app
+    return validation_agent_app
+
+
+def init_database_phase():
+    from database_setup import init_database
+    if not init_database():
+        raise RuntimeError("Database initialization failed (see log above)")
+
+
+def init_zip_index_phase():
+    from zip_index import zip_index
+    if not zip_index.load():
+        raise RuntimeError(zip_index.load_error)
+
+
+def init_poi_index_phase():
+    # Optional: without a built index, facility checks fall back to Overpass
+    from poi_index import poi_index
+    poi_index.load()
+
+
+async def run_startup_phase(name: str, func):
+    """Run a blocking startup step in a thread and record how long it took."""
+    startup_report[name] = {"status": "pending"}
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(func)
+        startup_report[name] = {"status": "ok", "seconds": round(time.perf_counter() - start, 3)}
+    except Exception as e:
+        startup_report[name] = {
+            "status": "error",
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": f"{type(e).__name__}: {e}"
+        }
+
+
+async def warm_up():
+    """Independent startup phases, run in parallel."""
+    start = time.perf_counter()
+    await asyncio.gather(
+        run_startup_phase("database", init_database_phase),
+        run_startup_phase("validation_agent", get_validation_agent),
+        # Spool files left behind by a worker that died mid-request
+        run_startup_phase("upload_spool", sweep_spool_dir),
+        run_startup_phase("zip_index", init_zip_index_phase),
+        run_startup_phase("poi_index", init_poi_index_phase),
+    )
+    
+    print("\n⏱️  Startup timing")
+    for name, phase in startup_report.items():
+        icon = "✅" if phase["status"] == "ok" else "❌"
+        error = f"  {phase['error']}" if phase.get("error") else ""
+        print(f"   {icon} {name:<18} {phase.get('seconds', 0):>7.2f}s{error}")
+    print(f"   Total (parallel): {time.perf_counter() - start:.2f}s\n")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm-up runs in the background so the server accepts connections (and
+    # /api/health answers) immediately; /api/ready flips once it succeeds.
+    warm_up_task = asyncio.create_task(warm_up())
+    broadcaster_task = asyncio.create_task(analytics_broadcaster())
+    yield
+    for task in (warm_up_task, broadcaster_task):
+        task.cancel()
+    
+    # Only set up if a scrape ran in this process
+    if "browser_pool" in sys.modules:
+        await asyncio.to_thread(sys.modules["browser_pool"].browser_pool.close_all)
+
+
+app = FastAPI(title="Health Atlas Provider Validator v2.1", lifespan=lifespan)
+
+# Reject oversized uploads before Starlette spools the multipart body
+# (registered first so CORS headers are still added to the 413)
+app.add_middleware(UploadSizeLimitMiddleware, paths={"/validate-file"})
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -64,15 +161,68 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+ANALYTICS_BROADCAST_INTERVAL = 5  # seconds between producer ticks
+
+# Last full stats payload pushed to viewers; new sockets start from this snapshot
+latest_analytics_snapshot: Dict[str, Any] = {}
+
+
+def diff_dashboard_stats(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Return only the stats fields whose values changed since the previous tick."""
+    return {
+        key: value
+        for key, value in current.items()
+        if key not in previous or previous[key] != value
+    }
+
+
+async def analytics_broadcaster():
+    """
+    Single producer for /ws/analytics.
+
+    Computes dashboard stats once per tick and fans them out to every socket,
+    so database load stays flat no matter how many dashboards are open.
+    Unchanged ticks are suppressed and changed fields are sent as deltas.
+    """
+    global latest_analytics_snapshot
+
+    while True:
+        await asyncio.sleep(ANALYTICS_BROADCAST_INTERVAL)
+
+        if not manager.active_connections:
+            continue
+
+        try:
+            result = (await load_analytics("dashboard-stats", build_dashboard_stats)).payload
+            if not result.get("success"):
+                continue
+
+            stats = result.get("stats", {})
+            changes = diff_dashboard_stats(latest_analytics_snapshot.get("stats", {}), stats)
+            latest_analytics_snapshot = result
+
+            if not changes:
+                continue
+
+            await manager.broadcast(json.dumps({
+                "type": "delta",
+                "changes": changes,
+                "timestamp": result.get("timestamp")
+            }))
+        except Exception as e:
+            print(f"❌ Analytics broadcaster error: {e}")
+
 
 @app.websocket("/ws/analytics")
 async def websocket_analytics(websocket: WebSocket):
     await manager.connect(websocket)
     try:
+        if latest_analytics_snapshot:
+            await websocket.send_json({"type": "snapshot", **latest_analytics_snapshot})
+
+        # The broadcaster pushes updates; this loop only watches for disconnects
         while True:
-            await asyncio.sleep(5)
-            stats = await get_dashboard_stats()
-            await websocket.send_json(stats)
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -85,8 +235,49 @@ async def health_check():
     return {"status": "healthy", "version": "2.1"}
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Ready once the database and validation agent have initialized."""
+    ready = all(
+        startup_report.get(phase, {}).get("status") == "ok"
+        for phase in REQUIRED_STARTUP_PHASES
+    )
+    return JSONResponse(
+        {"ready": ready, "phases": startup_report},
+        status_code=200 if ready else 503
+    )
+
+
+@app.get("/api/scraping/hosts")
+async def scraping_host_stats():
+    """Per-host request counts and queue wait times for website scraping."""
+    from host_scheduler import host_scheduler
+    return host_scheduler.stats()
+
+
+@app.get("/api/rate-limits")
+async def upstream_rate_limit_stats():
+    """Calls and wait times per rate-limited upstream (Nominatim, Overpass)."""
+    from rate_limiter import rate_limiter_stats
+    return rate_limiter_stats()
+
+
 MAX_CONCURRENT_WORKERS = 5
 
+# Individual providers returned by the globe endpoint past MAX_CLUSTER_ZOOM
+MAX_GEOLOCATION_POINTS = 5000
+
+# Review queue pagination
+REVIEW_QUEUE_PAGE_SIZE = 100
+REVIEW_QUEUE_MAX_PAGE_SIZE = 500
+REVIEW_QUEUE_COUNT_CAP = 10000
+
+# Upper bound on items in one bulk review decision
+BULK_REVIEW_MAX_ITEMS = 1000
+
+# Bump when CSV parsing changes so cached extractions are not reused
+CSV_EXTRACTOR_VERSION = "csv:pandas:1"
+
 
 def get_db_connection():
     """Get database connection with error handling."""
@@ -96,6 +287,38 @@ def get_db_connection():
     return psycopg2.connect(database_url)
 
 
+async def load_analytics(endpoint: str, build, **params) -> CachedResponse:
+    """
+    Return the cached payload for an analytics endpoint, building it on a miss.
+    
+    Failed builds are returned with no ETag and are never cached.
+    """
+    key = analytics_cache.make_key(endpoint, params)
+    entry = analytics_cache.get(key)
+    if entry is not None:
+        return entry
+    
+    generation = analytics_cache.generation
+    payload = await build(**params)
+    if not payload.get("success"):
+        return CachedResponse(payload, None)
+    
+    return analytics_cache.set(key, payload, generation)
+
+
+async def analytics_response(request: Request, endpoint: str, build, **params):
+    """Serve an analytics payload with ETag / If-None-Match support."""
+    entry = await load_analytics(endpoint, build, **params)
+    if entry.etag is None:
+        return entry.payload
+    
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(entry.payload, headers=headers)
+
+
 def normalize_provider_data(provider_info: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize provider data to match AgentState initial_data schema."""
     return {
@@ -182,20 +405,16 @@ def format_result_for_frontend(final_result: Dict[str, Any], provider_info: Dict
 @app.post("/validate-file")
 async def validate_file(file: UploadFile = File(...)):
     """Enhanced API endpoint with parallel processing and streaming results."""
+    from database_setup import get_cached_extraction, save_cached_extraction
     
-    # This prevents "I/O operation on closed file" error
-    temp_filename = f"temp_{uuid.uuid4()}_{file.filename}"
-    
+    # Stream the upload to the spool directory (hashing as we go) so large
+    # scans never sit fully in memory
     try:
-        # Read the entire file into memory first
-        file_contents = await file.read()
-        
-        # Save to disk immediately
-        with open(temp_filename, "wb") as buffer:
-            buffer.write(file_contents)
-        
-        print(f"✅ File saved: {temp_filename} ({len(file_contents)} bytes)")
+        upload = await spool_upload(file)
+        print(f"✅ File spooled: {upload.path} ({upload.size_bytes} bytes, sha256={upload.sha256[:12]})")
         
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         print(f"❌ Error saving file: {e}")
         return StreamingResponse(
@@ -203,6 +422,8 @@ async def validate_file(file: UploadFile = File(...)):
             media_type="text/event-stream"
         )
 
+    temp_filename = str(upload.path)
+
     # Now create the async generator with the saved file
     async def file_processor_stream():
         result_queue = Queue()
@@ -213,19 +434,36 @@ async def validate_file(file: UploadFile = File(...)):
             
             suffixes = Path(file.filename.lower()).suffixes
 
+            if '.csv' in suffixes:
+                extractor = CSV_EXTRACTOR_VERSION
+            elif any(ext in suffixes for ext in ['.pdf', '.png', '.jpg', '.jpeg']):
+                from pipeline.ocr_pipeline import run_ocr, OCR_EXTRACTOR_VERSION
+                extractor = OCR_EXTRACTOR_VERSION
+            else:
+                yield f"data: {json.dumps({'type': 'log', 'content': '❌ Unsupported file format. Use CSV, PDF, or image.'})}\n\n"
+                return
+
+            # Identical bytes already extracted with the same extractor → skip parsing / OCR
+            cached_providers = await asyncio.to_thread(get_cached_extraction, upload.sha256, extractor)
+
+            if cached_providers is not None:
+                provider_list = cached_providers
+                yield f"data: {json.dumps({'type': 'log', 'content': f'♻️ Same file processed before - reusing {len(provider_list)} extracted providers'})}\n\n"
 
             # ======================
             # CSV
             # ======================
-            if '.csv' in suffixes:
+            elif extractor == CSV_EXTRACTOR_VERSION:
                 yield f"data: {json.dumps({'type': 'log', 'content': '📄 Reading CSV file...'})}\n\n"
+                import pandas as pd
+                
                 df = pd.read_csv(temp_filename, dtype=str).fillna("")
                 provider_list = df.to_dict(orient='records')
 
             # ======================
             # PDF / IMAGE → GEMINI OCR
             # ======================
-            elif any(ext in suffixes for ext in ['.pdf', '.png', '.jpg', '.jpeg']):
+            else:
                 
                 print("🔥 ENTERED OCR BRANCH")
                 print("🔥 CALLING run_ocr WITH:", temp_filename)
@@ -252,15 +490,12 @@ async def validate_file(file: UploadFile = File(...)):
                     yield f"data: {json.dumps({'type': 'log', 'content': f'❌ Gemini OCR failed: {str(e)}'})}\n\n"
                     provider_list = []
 
-            # ======================
-            # UNSUPPORTED
-            # ======================
-            else:
-                yield f"data: {json.dumps({'type': 'log', 'content': '❌ Unsupported file format. Use CSV, PDF, or image.'})}\n\n"
-                return
-
-                                    
-            
+            # Only successful, non-empty extractions are worth reusing
+            if cached_providers is None and provider_list:
+                await asyncio.to_thread(
+                    save_cached_extraction, upload.sha256, extractor, provider_list,
+                    upload.original_name, upload.size_bytes
+                )
 
             total_records = len(provider_list)
             if total_records == 0:
@@ -301,7 +536,7 @@ async def validate_file(file: UploadFile = File(...)):
                         "quality_metrics": {}
                     }
 
-                    final_result = await asyncio.to_thread(validation_agent_app.invoke, initial_state)
+                    final_result = await asyncio.to_thread(get_validation_agent().invoke, initial_state)
                     result_payload = format_result_for_frontend(final_result, provider_info)
                     
                     path = result_payload.get("path", "UNKNOWN")
@@ -372,16 +607,15 @@ async def validate_file(file: UploadFile = File(...)):
             traceback.print_exc()
             yield f"data: {json.dumps({'type': 'log', 'content': error_msg})}\n\n"
         finally:
-            # Clean up temp file
-            if os.path.exists(temp_filename):
-                try:
-                    os.remove(temp_filename)
-                    print(f"🗑️ Cleaned up: {temp_filename}")
-                except Exception as e:
-                    print(f"⚠️ Could not remove temp file: {e}")
+            upload.remove()
             yield f"data: {json.dumps({'type': 'close', 'content': 'Stream closed.'})}\n\n"
 
-    return StreamingResponse(file_processor_stream(), media_type="text/event-stream")
+    # The background task covers clients that disconnect before the stream runs
+    return StreamingResponse(
+        file_processor_stream(),
+        media_type="text/event-stream",
+        background=BackgroundTask(upload.remove)
+    )
 
 
 @app.post("/validate-single")
@@ -414,7 +648,7 @@ async def validate_single_provider(provider_data: Dict[str, Any]):
             "quality_metrics": {}
         }
         
-        final_result = validation_agent_app.invoke(initial_state)
+        final_result = await asyncio.to_thread(get_validation_agent().invoke, initial_state)
         result_payload = format_result_for_frontend(final_result, provider_data)
         
         return {"status": "success", "data": result_payload}
@@ -450,6 +684,24 @@ async def apply_provider(
     file: UploadFile = File(...)
 ):
     """Handle provider application submissions."""
+    from database_setup import application_field_errors, save_provider_application
+    
+    provider_info = {
+        "full_name": fullName.strip(),
+        "email": email.strip(),
+        "phone": phoneNumber.strip(),
+        "specialty": speciality.strip(),
+        "license_number": licenseNumber.strip(),
+        "npi": npiId.strip(),
+        "practice_address": practiceAddress.strip()
+    }
+    
+    # Reject before anything is written, so a bad form never leaves a file behind
+    field_errors = application_field_errors(provider_info)
+    if field_errors:
+        raise HTTPException(status_code=422, detail=field_errors)
+    
+    file_path = None
     try:
         UPLOAD_DIR = Path("provider_applications")
         UPLOAD_DIR.mkdir(exist_ok=True)
@@ -485,17 +737,9 @@ async def apply_provider(
         
         application_data = {
             "application_id": application_id,
-            "submission_date": datetime.now().isoformat(),
+            "submission_date": datetime.now(timezone.utc).isoformat(),
             "status": status,
-            "provider_info": {
-                "full_name": fullName,
-                "email": email,
-                "phone": phoneNumber,
-                "specialty": speciality,
-                "license_number": licenseNumber,
-                "npi": npiId,
-                "practice_address": practiceAddress
-            },
+            "provider_info": provider_info,
             "ai_validation": {
                 "confidence_score": confidence_score,
                 "path": path,
@@ -513,20 +757,8 @@ async def apply_provider(
             }
         }
         
-        applications_file = Path("provider_applications.json")
-        applications = []
-        
-        if applications_file.exists():
-            try:
-                with applications_file.open("r") as f:
-                    applications = json.load(f)
-            except json.JSONDecodeError:
-                applications = []
-        
-        applications.append(application_data)
-        
-        with applications_file.open("w") as f:
-            json.dump(applications, f, indent=2)
+        if save_provider_application(application_data) is None:
+            raise RuntimeError("Could not store application record")
         
         print(f"✅ Application {application_id} saved for {fullName}")
         print(f"   Status: {status} | Confidence: {confidence_score:.1%} | Path: {path}")
@@ -555,6 +787,10 @@ async def apply_provider(
         import traceback
         traceback.print_exc()
         
+        # No application record points at the upload
+        if file_path is not None:
+            file_path.unlink(missing_ok=True)
+        
         return {
             "success": False,
             "message": f"Failed to save application: {str(e)}",
@@ -563,94 +799,172 @@ async def apply_provider(
 
 
 @app.get("/api/analytics/providers-geolocation")
-async def get_providers_geolocation():
-    """Returns provider locations for 3D globe visualization."""
+async def get_providers_geolocation(
+    request: Request,
+    zoom: int = Query(3, ge=0, le=22),
+    bbox: Optional[str] = None
+):
+    """
+    Returns provider locations for 3D globe visualization.
+    
+    Up to zoom MAX_CLUSTER_ZOOM providers are pre-clustered by geohash prefix;
+    beyond that individual providers inside `bbox` are returned.
+    `bbox` is "min_lon,min_lat,max_lon,max_lat".
+    """
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await analytics_response(
+        request, "providers-geolocation", build_providers_geolocation,
+        zoom=zoom, bounds=bounds
+    )
+
+
+def parse_bbox(bbox: Optional[str]) -> Optional[Dict[str, float]]:
+    """Parse a "min_lon,min_lat,max_lon,max_lat" bounding box."""
+    if not bbox:
+        return None
+    
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+    
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed maximums")
+    
+    return {"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat}
+
+
+def tier_status(tier: Optional[str]) -> str:
+    """Globe marker colour for a confidence tier."""
+    if tier == "PLATINUM":
+        return "green"
+    if tier == "GOLD":
+        return "yellow"
+    return "red"
+
+
+async def build_providers_geolocation(zoom: int = 3, bounds: Optional[Dict[str, float]] = None):
+    """Query provider locations / clusters for the globe (uncached)."""
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # FIXED: Use confidence_tier instead of tier
-        cursor.execute("""
-            SELECT 
-                id,
-                provider_name,
-                npi,
-                city,
-                state,
-                zip_code,
-                confidence_score,
-                confidence_tier,
-                validation_metadata,
-                created_at
-            FROM validated_providers
-            WHERE state IS NOT NULL
-            ORDER BY created_at DESC
-            LIMIT 500
-        """)
-        
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        precision = zoom_to_precision(zoom)
         
-        state_coords = {
-            "CA": {"lat": 36.7783, "lon": -119.4179},
-            "TX": {"lat": 31.9686, "lon": -99.9018},
-            "FL": {"lat": 27.6648, "lon": -81.5158},
-            "NY": {"lat": 42.1657, "lon": -74.9481},
-            "IL": {"lat": 40.6331, "lon": -89.3985},
-            "PA": {"lat": 41.2033, "lon": -77.1945},
-            "OH": {"lat": 40.4173, "lon": -82.9071},
-            "MA": {"lat": 42.4072, "lon": -71.3824},
-            "WA": {"lat": 47.7511, "lon": -120.7401},
-            "CO": {"lat": 39.5501, "lon": -105.7821},
-            "AZ": {"lat": 34.0489, "lon": -111.0937},
-            "MI": {"lat": 44.3148, "lon": -85.6024},
-            "GA": {"lat": 32.1656, "lon": -82.9001},
-            "NC": {"lat": 35.7596, "lon": -79.0193},
-            "NJ": {"lat": 40.0583, "lon": -74.4057},
-        }
+        conditions = ["geohash IS NOT NULL"]
+        params: Dict[str, Any] = {"precision": precision, "limit": MAX_GEOLOCATION_POINTS}
+        if bounds:
+            conditions.append("longitude BETWEEN %(min_lon)s AND %(max_lon)s")
+            conditions.append("latitude BETWEEN %(min_lat)s AND %(max_lat)s")
+            params.update(bounds)
+        where = " AND ".join(conditions)
         
+        clusters = []
         providers = []
-        for row in rows:
-            state = row['state']
-            coords = state_coords.get(state, {"lat": 39.8283, "lon": -98.5795})
+        
+        if precision is not None:
+            # One row per geohash cell at this zoom level
+            cursor.execute(f"""
+                SELECT 
+                    LEFT(geohash, %(precision)s) AS cell,
+                    COUNT(*) AS count,
+                    AVG(latitude) AS lat,
+                    AVG(longitude) AS lon,
+                    AVG(confidence_score) AS avg_confidence,
+                    COUNT(*) FILTER (WHERE confidence_tier = 'PLATINUM') AS platinum,
+                    COUNT(*) FILTER (WHERE confidence_tier = 'GOLD') AS gold,
+                    COUNT(*) FILTER (WHERE validation_path = 'GREEN') AS green,
+                    COUNT(*) FILTER (WHERE validation_path = 'YELLOW') AS yellow,
+                    COUNT(*) FILTER (WHERE validation_path = 'RED') AS red
+                FROM validated_providers
+                WHERE {where}
+                GROUP BY cell
+            """, params)
             
-            # Get tier from confidence_tier column
-            tier = row['confidence_tier'] or "UNKNOWN"
+            for row in cursor.fetchall():
+                clusters.append(format_geo_cluster(row, row['cell'], approximate=False))
             
-            # Determine status color based on tier
-            if tier == "PLATINUM":
-                status = "green"
-            elif tier == "GOLD":
-                status = "yellow"
-            else:
-                status = "red"
+            # Providers without recorded coordinates are placed at their state centroid
+            cursor.execute("""
+                SELECT 
+                    state AS cell,
+                    COUNT(*) AS count,
+                    AVG(confidence_score) AS avg_confidence,
+                    COUNT(*) FILTER (WHERE confidence_tier = 'PLATINUM') AS platinum,
+                    COUNT(*) FILTER (WHERE confidence_tier = 'GOLD') AS gold,
+                    COUNT(*) FILTER (WHERE validation_path = 'GREEN') AS green,
+                    COUNT(*) FILTER (WHERE validation_path = 'YELLOW') AS yellow,
+                    COUNT(*) FILTER (WHERE validation_path = 'RED') AS red
+                FROM validated_providers
+                WHERE geohash IS NULL AND state IS NOT NULL AND state != ''
+                GROUP BY state
+            """)
             
-            # Extract validation_path from metadata
-            validation_metadata = row['validation_metadata'] or {}
-            quality_metrics = validation_metadata.get('quality_metrics', {})
-            path = quality_metrics.get('path', 'UNKNOWN')
+            for row in cursor.fetchall():
+                centroid = STATE_CENTROIDS.get(row['cell'], US_CENTROID)
+                if bounds and not (
+                    bounds["min_lon"] <= centroid["lon"] <= bounds["max_lon"]
+                    and bounds["min_lat"] <= centroid["lat"] <= bounds["max_lat"]
+                ):
+                    continue
+                clusters.append(format_geo_cluster(
+                    {**row, "lat": centroid["lat"], "lon": centroid["lon"]},
+                    f"state:{row['cell']}", approximate=True
+                ))
+        
+        else:
+            cursor.execute(f"""
+                SELECT 
+                    id,
+                    provider_name,
+                    npi,
+                    city,
+                    state,
+                    zip_code,
+                    latitude,
+                    longitude,
+                    confidence_score,
+                    confidence_tier,
+                    validation_path,
+                    created_at
+                FROM validated_providers
+                WHERE {where}
+                ORDER BY created_at DESC
+                LIMIT %(limit)s
+            """, params)
             
-            providers.append({
-                "id": row['id'],
-                "name": row['provider_name'],
-                "npi": row['npi'],
-                "city": row['city'],
-                "state": state,
-                "zip_code": row['zip_code'],
-                "lat": coords["lat"] + (hash(str(row['id'])) % 1000 - 500) / 100,
-                "lon": coords["lon"] + (hash(str(row['id']) + "lon") % 1000 - 500) / 100,
-                "confidence": row['confidence_score'],
-                "status": status,
-                "tier": tier,
-                "path": path,
-                "validated_at": row['created_at'].isoformat() if row['created_at'] else None
-            })
+            for row in cursor.fetchall():
+                tier = row['confidence_tier'] or "UNKNOWN"
+                providers.append({
+                    "id": row['id'],
+                    "name": row['provider_name'],
+                    "npi": row['npi'],
+                    "city": row['city'],
+                    "state": row['state'],
+                    "zip_code": row['zip_code'],
+                    "lat": row['latitude'],
+                    "lon": row['longitude'],
+                    "confidence": row['confidence_score'],
+                    "status": tier_status(tier),
+                    "tier": tier,
+                    "path": row['validation_path'] or 'UNKNOWN',
+                    "validated_at": row['created_at'].isoformat() if row['created_at'] else None
+                })
+        
+        cursor.close()
+        conn.close()
         
         return {
             "success": True,
+            "zoom": zoom,
+            "geohash_precision": precision,
+            "clusters": clusters,
             "providers": providers,
-            "total": len(providers),
+            "total": sum(c["count"] for c in clusters) if precision is not None else len(providers),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -661,24 +975,72 @@ async def get_providers_geolocation():
         return {
             "success": False,
             "error": str(e),
+            "clusters": [],
             "providers": []
         }
 
 
+def format_geo_cluster(row: Dict[str, Any], cluster_id: str, approximate: bool) -> Dict[str, Any]:
+    """Shape one aggregated globe cluster."""
+    count = row['count']
+    platinum, gold = row['platinum'], row['gold']
+    
+    # Colour the cluster by its dominant tier
+    if platinum >= gold and platinum >= count - platinum - gold:
+        dominant_tier = "PLATINUM"
+    elif gold >= count - platinum - gold:
+        dominant_tier = "GOLD"
+    else:
+        dominant_tier = "QUESTIONABLE"
+    
+    return {
+        "id": cluster_id,
+        "lat": float(row['lat']),
+        "lon": float(row['lon']),
+        "count": count,
+        "avg_confidence": float(row['avg_confidence']) if row['avg_confidence'] is not None else None,
+        "status": tier_status(dominant_tier),
+        "tiers": {
+            "PLATINUM": platinum,
+            "GOLD": gold,
+            "QUESTIONABLE": count - platinum - gold
+        },
+        "paths": {
+            "GREEN": row['green'],
+            "YELLOW": row['yellow'],
+            "RED": row['red']
+        },
+        "approximate": approximate
+    }
+
+
 @app.get("/api/analytics/validation-heatmap")
-async def get_validation_heatmap():
+async def get_validation_heatmap(request: Request):
     """Returns real-time validation stage data for heatmap."""
+    return await analytics_response(request, "validation-heatmap", build_validation_heatmap)
+
+
+async def build_validation_heatmap():
+    """Query recent per-stage validation results (uncached)."""
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # Get recent validations with their execution metadata
+        # Stage statuses are promoted columns covered by idx_recent_validations
         cursor.execute("""
             SELECT 
                 id,
                 provider_name,
                 npi,
-                validation_metadata,
+                stage_vlm,
+                stage_npi,
+                stage_oig,
+                stage_license,
+                stage_address,
+                stage_web,
+                npi_match_confidence,
+                address_confidence,
+                digital_footprint_score,
                 created_at
             FROM validated_providers
             WHERE created_at >= NOW() - INTERVAL '24 hours'
@@ -692,25 +1054,20 @@ async def get_validation_heatmap():
         
         providers = []
         for row in rows:
-            validation_metadata = row['validation_metadata'] if row['validation_metadata'] else {}
-            execution_meta = validation_metadata.get('execution_metadata', {})
-            
-            # Extract stage statuses from execution metadata
             stages = {
-                "vlm": execution_meta.get("vlm", {}).get("status", "pending"),
-                "npi": execution_meta.get("nppes", {}).get("status", "pending"),
-                "oig": execution_meta.get("oig_leie", {}).get("status", "pending"),
-                "license": execution_meta.get("state_board", {}).get("status", "pending"),
-                "address": execution_meta.get("address", {}).get("status", "pending"),
-                "web": execution_meta.get("web_enrichment", {}).get("status", "pending"),
+                "vlm": row['stage_vlm'] or "pending",
+                "npi": row['stage_npi'] or "pending",
+                "oig": row['stage_oig'] or "pending",
+                "license": row['stage_license'] or "pending",
+                "address": row['stage_address'] or "pending",
+                "web": row['stage_web'] or "pending",
                 "score": "complete"
             }
             
-            # Extract confidence scores per stage
             stage_scores = {
-                "npi": execution_meta.get("nppes", {}).get("match_confidence", 0),
-                "address": execution_meta.get("address", {}).get("confidence", 0),
-                "web": execution_meta.get("web_enrichment", {}).get("digital_footprint_score", 0)
+                "npi": row['npi_match_confidence'] or 0,
+                "address": row['address_confidence'] or 0,
+                "web": row['digital_footprint_score'] or 0
             }
             
             providers.append({
@@ -741,8 +1098,13 @@ async def get_validation_heatmap():
 
 
 @app.get("/api/analytics/confidence-breakdown")
-async def get_confidence_breakdown():
+async def get_confidence_breakdown(request: Request):
     """Returns confidence score breakdowns for radar chart."""
+    return await analytics_response(request, "confidence-breakdown", build_confidence_breakdown)
+
+
+async def build_confidence_breakdown():
+    """Query recent score breakdowns for the radar chart (uncached)."""
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -755,7 +1117,13 @@ async def get_confidence_breakdown():
                 npi,
                 confidence_score,
                 confidence_tier,
-                validation_metadata,
+                validation_path,
+                score_identity,
+                score_address,
+                score_completeness,
+                score_freshness,
+                score_enrichment,
+                score_risk,
                 created_at
             FROM validated_providers
             ORDER BY created_at DESC
@@ -766,47 +1134,46 @@ async def get_confidence_breakdown():
         cursor.close()
         conn.close()
         
+        def dimension_score(row, column: str) -> int:
+            return int((row[column] or 0) * 100)
+        
         providers = []
         for row in rows:
-            validation_metadata = row['validation_metadata'] if row['validation_metadata'] else {}
-            quality_metrics = validation_metadata.get('quality_metrics', {})
-            score_breakdown = quality_metrics.get("score_breakdown", {})
-            
             # Extract 6-dimensional scores
             dimensions = [
                 {
                     "dimension": "Primary\nSource",
-                    "score": int(score_breakdown.get("identity", 0) * 100),
+                    "score": dimension_score(row, "score_identity"),
                     "max": 100,
                     "weight": 35
                 },
                 {
                     "dimension": "Address\nReliability",
-                    "score": int(score_breakdown.get("address", 0) * 100),
+                    "score": dimension_score(row, "score_address"),
                     "max": 100,
                     "weight": 20
                 },
                 {
                     "dimension": "Digital\nFootprint",
-                    "score": int(score_breakdown.get("enrichment", 0) * 100),
+                    "score": dimension_score(row, "score_enrichment"),
                     "max": 100,
                     "weight": 15
                 },
                 {
                     "dimension": "Data\nCompleteness",
-                    "score": int(score_breakdown.get("completeness", 0) * 100),
+                    "score": dimension_score(row, "score_completeness"),
                     "max": 100,
                     "weight": 15
                 },
                 {
                     "dimension": "Data\nFreshness",
-                    "score": int(score_breakdown.get("freshness", 0) * 100),
+                    "score": dimension_score(row, "score_freshness"),
                     "max": 100,
                     "weight": 10
                 },
                 {
                     "dimension": "Fraud\nRisk",
-                    "score": int(score_breakdown.get("risk", 0) * 100),
+                    "score": dimension_score(row, "score_risk"),
                     "max": 100,
                     "weight": 5
                 }
@@ -817,7 +1184,7 @@ async def get_confidence_breakdown():
                 "npi": row['npi'],
                 "overallScore": row['confidence_score'],
                 "tier": row['confidence_tier'] or "UNKNOWN",
-                "path": quality_metrics.get('path', 'UNKNOWN'),
+                "path": row['validation_path'] or 'UNKNOWN',
                 "dimensions": dimensions,
                 "validated_at": row['created_at'].isoformat() if row['created_at'] else None
             })
@@ -841,43 +1208,43 @@ async def get_confidence_breakdown():
 
 
 @app.get("/api/analytics/dashboard-stats")
-async def get_dashboard_stats():
+async def get_dashboard_stats(request: Request):
     """Returns real stats for Dashboard.jsx."""
+    return await analytics_response(request, "dashboard-stats", build_dashboard_stats)
+
+
+async def build_dashboard_stats():
+    """Query dashboard counters and recent activity (uncached)."""
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # Total providers
-        cursor.execute("SELECT COUNT(*) as count FROM validated_providers")
-        total_providers = cursor.fetchone()['count']
+        # Counters are maintained incrementally by save_validated_provider /
+        # save_to_review_queue, so this is a constant-size read
+        cursor.execute("SELECT metric, bucket, count, value_sum FROM dashboard_aggregates")
+        aggregates = {(row['metric'], row['bucket']): row for row in cursor.fetchall()}
         
-        # Providers needing review
-        cursor.execute("SELECT COUNT(*) as count FROM review_queue WHERE status = 'PENDING'")
-        needs_review = cursor.fetchone()['count']
+        def aggregate_count(metric: str, bucket: str) -> int:
+            row = aggregates.get((metric, bucket))
+            return row['count'] if row else 0
         
-        # Average confidence
-        cursor.execute("SELECT AVG(confidence_score) as avg FROM validated_providers")
-        avg_confidence = cursor.fetchone()['avg'] or 0
+        total_providers = aggregate_count('providers', 'total')
+        needs_review = aggregate_count('review', 'PENDING')
+        fraud_detected = aggregate_count('fraud', 'flagged')
         
-        # Path distribution - extract from validation_metadata JSON
-        cursor.execute("""
-            SELECT 
-                validation_metadata->'quality_metrics'->>'path' as path,
-                COUNT(*) as count
-            FROM validated_providers
-            WHERE validation_metadata->'quality_metrics'->>'path' IS NOT NULL
-            GROUP BY path
-        """)
-        path_results = cursor.fetchall()
-        path_distribution = {row['path']: row['count'] for row in path_results}
+        scored = aggregates.get(('confidence', 'scored'))
+        avg_confidence = scored['value_sum'] / scored['count'] if scored and scored['count'] else 0
         
-        # Fraud indicators count - extract from validation_metadata
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM validated_providers
-            WHERE validation_metadata->'quality_metrics'->>'fraud_indicator_count' != '0'
-        """)
-        fraud_detected = cursor.fetchone()['count']
+        path_distribution = {
+            bucket: row['count']
+            for (metric, bucket), row in aggregates.items()
+            if metric == 'path' and row['count'] > 0
+        }
+        tier_distribution = {
+            bucket: row['count']
+            for (metric, bucket), row in aggregates.items()
+            if metric == 'tier' and row['count'] > 0
+        }
         
         # Recent validations (last 24 hours)
         cursor.execute("""
@@ -886,7 +1253,7 @@ async def get_dashboard_stats():
                 npi,
                 confidence_score,
                 confidence_tier,
-                validation_metadata,
+                validation_path,
                 created_at
             FROM validated_providers
             WHERE created_at >= NOW() - INTERVAL '24 hours'
@@ -895,15 +1262,12 @@ async def get_dashboard_stats():
         """)
         recent_activity = []
         for row in cursor.fetchall():
-            validation_metadata = row['validation_metadata'] or {}
-            quality_metrics = validation_metadata.get('quality_metrics', {})
-            
             recent_activity.append({
                 "provider_name": row['provider_name'],
                 "npi": row['npi'],
                 "confidence_score": row['confidence_score'],
                 "tier": row['confidence_tier'] or "UNKNOWN",
-                "path": quality_metrics.get('path', 'UNKNOWN'),
+                "path": row['validation_path'] or 'UNKNOWN',
                 "validated_at": row['created_at'].isoformat()
             })
         
@@ -917,6 +1281,7 @@ async def get_dashboard_stats():
                 "needs_review": needs_review,
                 "avg_confidence": float(avg_confidence) * 100,
                 "path_distribution": path_distribution,
+                "tier_distribution": tier_distribution,
                 "fraud_detected": fraud_detected,
                 "recent_activity": recent_activity
             },
@@ -933,31 +1298,167 @@ async def get_dashboard_stats():
             "stats": {}
         }
     
+def encode_review_cursor(review) -> str:
+    """Opaque keyset cursor for the review queue: (priority_rank, created_at, id)."""
+    key = [review.priority_rank, review.created_at.isoformat() if review.created_at else None, review.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_review_cursor(cursor: str) -> tuple:
+    try:
+        priority_rank, created_at, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(priority_rank), datetime.fromisoformat(created_at), int(review_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def count_review_queue(db, status: str, query, filtered: bool) -> tuple:
+    """
+    Total for the review queue response as (count, is_estimate).
+    
+    Unfiltered status totals come straight from dashboard_aggregates. Filtered
+    totals are counted up to REVIEW_QUEUE_COUNT_CAP rows so the cost is bounded.
+    """
+    from sqlalchemy import func
+    from database_setup import DashboardAggregate
+    
+    if not filtered:
+        aggregates = db.query(func.coalesce(func.sum(DashboardAggregate.count), 0)).filter(
+            DashboardAggregate.metric == 'review'
+        )
+        if status != "ALL":
+            aggregates = aggregates.filter(DashboardAggregate.bucket == status)
+        return int(aggregates.scalar()), False
+    
+    capped = query.limit(REVIEW_QUEUE_COUNT_CAP + 1).subquery()
+    total = db.query(func.count()).select_from(capped).scalar()
+    if total > REVIEW_QUEUE_COUNT_CAP:
+        return REVIEW_QUEUE_COUNT_CAP, True
+    return total, False
+
+
 @app.get("/api/review-queue")
-async def get_review_queue(status: str = "PENDING"):
-    """Get review queue items"""
+async def get_review_queue(
+    status: str = "PENDING",
+    limit: int = Query(REVIEW_QUEUE_PAGE_SIZE, ge=1, le=REVIEW_QUEUE_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    reason: Optional[str] = None,
+    has_fraud: Optional[bool] = None,
+    min_confidence: Optional[float] = Query(None, ge=0, le=1),
+    max_confidence: Optional[float] = Query(None, ge=0, le=1),
+    priority: Optional[str] = None,
+    include_count: bool = True
+):
+    """
+    Get review queue items, one page at a time.
+    
+    Items are ordered HIGH priority first, then oldest first. Pass the
+    returned `next_cursor` back as `cursor` to fetch the following page.
+    `status=ALL` lists every status.
+    """
+    from sqlalchemy import case, func, tuple_
     from database_setup import SessionLocal, ReviewQueue
     
     db = SessionLocal()
     try:
-        reviews = db.query(ReviewQueue).filter_by(status=status).order_by(
-            ReviewQueue.priority.desc(),
-            ReviewQueue.created_at.asc()
-        ).all()
+        query = db.query(ReviewQueue)
+        if status != "ALL":
+            query = query.filter(ReviewQueue.status == status)
+        
+        filtered = False
+        if reason:
+            query = query.filter(ReviewQueue.review_reason.ilike(f"%{reason}%"))
+            filtered = True
+        if has_fraud is not None:
+            fraud_count = case(
+                (func.json_typeof(ReviewQueue.fraud_indicators) == 'array',
+                 func.json_array_length(ReviewQueue.fraud_indicators)),
+                else_=0
+            )
+            query = query.filter(fraud_count > 0 if has_fraud else fraud_count == 0)
+            filtered = True
+        if min_confidence is not None:
+            query = query.filter(ReviewQueue.confidence_score >= min_confidence)
+            filtered = True
+        if max_confidence is not None:
+            query = query.filter(ReviewQueue.confidence_score <= max_confidence)
+            filtered = True
+        if priority:
+            query = query.filter(ReviewQueue.priority == priority.upper())
+            filtered = True
+        
+        total, total_is_estimate = (
+            count_review_queue(db, status, query, filtered) if include_count else (None, False)
+        )
+        
+        if cursor:
+            query = query.filter(
+                tuple_(ReviewQueue.priority_rank, ReviewQueue.created_at, ReviewQueue.id)
+                > tuple_(*decode_review_cursor(cursor))
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        reviews = query.order_by(
+            ReviewQueue.priority_rank.asc(),
+            ReviewQueue.created_at.asc(),
+            ReviewQueue.id.asc()
+        ).limit(limit + 1).all()
+        
+        has_more = len(reviews) > limit
+        reviews = reviews[:limit]
         
         return {
             "success": True,
             "items": [r.to_dict() for r in reviews],
-            "total": len(reviews)
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "next_cursor": encode_review_cursor(reviews[-1]) if has_more else None,
+            "has_more": has_more
         }
     finally:
         db.close()
 
 
+def review_to_provider_record(review) -> tuple:
+    """Build the (golden_record, state) saved when a review item is approved."""
+    original_data = review.original_data or {}
+    
+    # Convert to golden_record format
+    golden_record = {
+        "provider_name": review.provider_name,
+        "npi": review.npi,
+        "specialty": original_data.get("specialty", ""),
+        "address": original_data.get("address", ""),
+        "city": original_data.get("city", ""),
+        "state": original_data.get("state", ""),
+        "zip_code": original_data.get("zip_code", ""),
+        "phone": original_data.get("phone", ""),
+        "website": original_data.get("website", ""),
+        "license_status": "MANUAL_APPROVAL",
+        "oig_excluded": False,
+    }
+    
+    # Create state with manual approval tier
+    state = {
+        "confidence_score": 0.75,  # Manual approval = 75%
+        "quality_metrics": {
+            "confidence_tier": "MANUAL_APPROVAL"
+        },
+        "qa_flags": [],
+        "fraud_indicators": [],
+        "execution_metadata": {}
+    }
+    
+    return golden_record, state
+
+
 @app.post("/api/review-queue/{review_id}/approve")
 async def approve_review(review_id: int, data: dict):
     """Approve a provider from review queue"""
-    from database_setup import SessionLocal, ReviewQueue, save_validated_provider
+    from database_setup import (
+        SessionLocal, ReviewQueue, save_validated_provider,
+        apply_aggregate_deltas, review_status_deltas
+    )
     
     db = SessionLocal()
     try:
@@ -967,36 +1468,13 @@ async def approve_review(review_id: int, data: dict):
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
         
-        # Convert to golden_record format
-        golden_record = {
-            "provider_name": review.provider_name,
-            "npi": review.npi,
-            "specialty": review.original_data.get("specialty", ""),
-            "address": review.original_data.get("address", ""),
-            "city": review.original_data.get("city", ""),
-            "state": review.original_data.get("state", ""),
-            "zip_code": review.original_data.get("zip_code", ""),
-            "phone": review.original_data.get("phone", ""),
-            "website": review.original_data.get("website", ""),
-            "license_status": "MANUAL_APPROVAL",
-            "oig_excluded": False,
-        }
-        
-        # Create state with manual approval tier
-        state = {
-            "confidence_score": 0.75,  # Manual approval = 75%
-            "quality_metrics": {
-                "confidence_tier": "MANUAL_APPROVAL"
-            },
-            "qa_flags": [],
-            "fraud_indicators": [],
-            "execution_metadata": {}
-        }
+        golden_record, state = review_to_provider_record(review)
         
         # Save to validated_providers
         provider_id = save_validated_provider(golden_record, state)
         
         # Update review status
+        apply_aggregate_deltas(db, review_status_deltas(review.status, 'APPROVED'))
         review.status = 'APPROVED'
         review.reviewed_at = datetime.now()
         review.reviewer_name = data.get('reviewer_name')
@@ -1004,6 +1482,7 @@ async def approve_review(review_id: int, data: dict):
         review.reviewer_decision = 'APPROVE'
         
         db.commit()
+        analytics_cache.invalidate()
         
         return {
             "success": True,
@@ -1020,7 +1499,9 @@ async def approve_review(review_id: int, data: dict):
 @app.post("/api/review-queue/{review_id}/reject")
 async def reject_review(review_id: int, data: dict):
     """Reject a provider"""
-    from database_setup import SessionLocal, ReviewQueue
+    from database_setup import (
+        SessionLocal, ReviewQueue, apply_aggregate_deltas, review_status_deltas
+    )
     
     db = SessionLocal()
     try:
@@ -1029,6 +1510,7 @@ async def reject_review(review_id: int, data: dict):
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
         
+        apply_aggregate_deltas(db, review_status_deltas(review.status, 'REJECTED'))
         review.status = 'REJECTED'
         review.reviewed_at = datetime.now()
         review.reviewer_name = data.get('reviewer_name')
@@ -1036,6 +1518,7 @@ async def reject_review(review_id: int, data: dict):
         review.reviewer_decision = 'REJECT'
         
         db.commit()
+        analytics_cache.invalidate()
         
         return {
             "success": True,
@@ -1048,6 +1531,127 @@ async def reject_review(review_id: int, data: dict):
     finally:
         db.close()
 
+
+@app.post("/api/review-queue/bulk")
+async def bulk_review_decision(data: dict):
+    """
+    Approve or reject many review items in one transaction.
+    
+    Body: {"review_ids": [...], "decision": "APPROVE" | "REJECT",
+           "reviewer_name": ..., "reviewer_notes": ...}
+    
+    Each item gets its own savepoint, so one bad item is reported as an
+    error without undoing the rest. Items that are not PENDING are skipped.
+    """
+    from database_setup import (
+        SessionLocal, ReviewQueue, ValidatedProvider, upsert_validated_provider,
+        apply_aggregate_deltas, review_status_deltas
+    )
+    
+    decision = str(data.get("decision", "")).upper()
+    if decision not in ("APPROVE", "REJECT"):
+        raise HTTPException(status_code=400, detail="decision must be APPROVE or REJECT")
+    
+    try:
+        review_ids = list(dict.fromkeys(int(i) for i in data.get("review_ids") or []))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="review_ids must be a list of integers")
+    
+    if not review_ids:
+        raise HTTPException(status_code=400, detail="review_ids is empty")
+    if len(review_ids) > BULK_REVIEW_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_REVIEW_MAX_ITEMS} items per request")
+    
+    new_status = 'APPROVED' if decision == 'APPROVE' else 'REJECTED'
+    outcome = new_status.lower()
+    
+    db = SessionLocal()
+    try:
+        # Lock the items so a concurrent single-item decision cannot interleave
+        reviews = {
+            r.id: r for r in db.query(ReviewQueue)
+            .filter(ReviewQueue.id.in_(review_ids))
+            .with_for_update()
+            .all()
+        }
+        
+        # One lookup for every provider an approval may update
+        existing_providers = {}
+        if decision == 'APPROVE':
+            npis = {r.npi for r in reviews.values() if r.npi}
+            existing_providers = {
+                p.npi: p for p in db.query(ValidatedProvider)
+                .filter(ValidatedProvider.npi.in_(npis))
+                .all()
+            }
+        
+        reviewed_at = datetime.now()
+        status_deltas = []
+        results = []
+        
+        for review_id in review_ids:
+            review = reviews.get(review_id)
+            
+            if review is None:
+                results.append({"review_id": review_id, "outcome": "not_found"})
+                continue
+            
+            if review.status != 'PENDING':
+                results.append({
+                    "review_id": review_id,
+                    "outcome": "skipped",
+                    "detail": f"Already {review.status}"
+                })
+                continue
+            
+            try:
+                with db.begin_nested():
+                    provider_id = None
+                    if decision == 'APPROVE':
+                        golden_record, state = review_to_provider_record(review)
+                        provider = upsert_validated_provider(
+                            db, golden_record, state, existing_providers.get(review.npi)
+                        )
+                        existing_providers[provider.npi] = provider
+                        provider_id = provider.id
+                    
+                    review.status = new_status
+                    review.reviewed_at = reviewed_at
+                    review.reviewer_name = data.get('reviewer_name')
+                    review.reviewer_notes = data.get('reviewer_notes')
+                    review.reviewer_decision = decision
+                
+            except Exception as e:
+                results.append({"review_id": review_id, "outcome": "error", "detail": str(e)})
+                continue
+            
+            status_deltas.extend(review_status_deltas('PENDING', new_status))
+            result = {"review_id": review_id, "outcome": outcome}
+            if provider_id is not None:
+                result["provider_id"] = provider_id
+            results.append(result)
+        
+        apply_aggregate_deltas(db, status_deltas)
+        db.commit()
+        analytics_cache.invalidate()
+        
+        summary = {}
+        for result in results:
+            summary[result["outcome"]] = summary.get(result["outcome"], 0) + 1
+        
+        return {
+            "success": True,
+            "decision": decision,
+            "summary": summary,
+            "results": results
+        }
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
+
     
 
 
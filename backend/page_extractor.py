@@ -0,0 +1,236 @@
+"""
+Provider Page Text Extraction
+File: backend/page_extractor.py
+
+page_text() turns provider website HTML into compact text: navigation,
+headers, footers, forms and similar boilerplate are dropped, and the rest
+is emitted one block per line with headings marked by HEADING_PREFIX. It
+uses lxml directly in a single streaming pass over the tree.
+
+relevant_snippet() then picks the sections most likely to mention
+education, board certifications, languages and accepted insurance (by
+heading and keyword density) and returns them under a character budget,
+so the enrichment prompt carries credentials instead of menus.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from config import WEBSITE_SNIPPET_CHARS
+
+
+HEADING_PREFIX = "## "
+
+# Elements that never carry provider details
+BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "iframe", "canvas",
+    "nav", "header", "footer", "aside", "form", "button", "select",
+]
+
+# class / id fragments of site chrome
+BOILERPLATE_ATTR_RE = re.compile(
+    r"(^|[\s_-])(nav|navbar|menu|breadcrumbs?|cookie|consent|banner|footer|header|"
+    r"sidebar|social|share|skip|search|modal|popup|newsletter)([\s_-]|$)",
+    re.I
+)
+
+# Larger class/id matches are kept; site chrome is rarely this long
+BOILERPLATE_MAX_CHARS = 1500
+
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd",
+    "table", "tr", "td", "th", "br", "blockquote", "address", "figure", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# Category -> (heading words, body keywords)
+SECTION_KEYWORDS: Dict[str, Tuple[List[str], List[str]]] = {
+    "education": (
+        ["education", "training", "background", "credentials", "qualifications"],
+        ["medical school", "residency", "fellowship", "internship", "university",
+         "college", "graduated", "degree", "m.d.", "d.o.", "school of medicine"],
+    ),
+    "certifications": (
+        ["certification", "board", "credentials", "affiliations", "memberships"],
+        ["board certified", "board-certified", "certified", "diplomate",
+         "american board", "fellow of", "facs", "facp", "faap", "licensed"],
+    ),
+    "languages": (
+        ["language"],
+        ["languages", "speaks", "spoken", "fluent", "bilingual", "english",
+         "spanish", "mandarin", "cantonese", "vietnamese", "french", "hindi",
+         "arabic", "russian", "korean", "tagalog", "portuguese"],
+    ),
+    "insurance": (
+        ["insurance", "plans", "billing", "payment"],
+        ["insurance", "accepted", "in-network", "medicare", "medicaid", "aetna",
+         "cigna", "blue cross", "bcbs", "unitedhealthcare", "united healthcare",
+         "humana", "tricare", "kaiser", "anthem", "ppo", "hmo"],
+    ),
+}
+
+_WORD_RE = re.compile(r"\w+")
+
+# lxml refuses str input that declares its own encoding (XHTML pages)
+_XML_DECLARATION_RE = re.compile(r"^[\s\ufeff]*<\?xml[^>]*\?>", re.I)
+
+
+def page_text(html: str) -> str:
+    """Boilerplate-free page text, one block per line, headings prefixed."""
+    import lxml.html
+    from lxml import etree
+
+    if not html or not html.strip():
+        return ""
+    # Already decoded (response.text), so the declared encoding is moot
+    html = _XML_DECLARATION_RE.sub("", html, count=1)
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+
+    etree.strip_elements(root, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+    for el in list(root.iter(*BOILERPLATE_TAGS)):
+        el.drop_tree()
+    for el in root.xpath("//body//*[@class or @id or @role]"):
+        if el.get("role") in ("navigation", "banner", "contentinfo", "search"):
+            el.drop_tree()
+        elif (BOILERPLATE_ATTR_RE.search(f"{el.get('class', '')} {el.get('id', '')}")
+              and len(el.text_content()) < BOILERPLATE_MAX_CHARS):
+            # Size guard: wrappers like class="has-sidebar" hold the real content
+            el.drop_tree()
+
+    body = root.find("body")
+    if body is None:
+        body = root
+
+    lines: List[str] = []
+    buffer: List[str] = []
+    heading_depth = 0
+
+    def flush(prefix: str = ""):
+        line = " ".join(" ".join(buffer).split())
+        buffer.clear()
+        if line and (not lines or lines[-1] != prefix + line):
+            lines.append(prefix + line)
+
+    for event, el in etree.iterwalk(body, events=("start", "end")):
+        tag = el.tag if isinstance(el.tag, str) else ""
+        if event == "start":
+            if tag in BLOCK_TAGS and not heading_depth:
+                flush()
+            if tag in HEADING_TAGS:
+                heading_depth += 1
+            if el.text:
+                buffer.append(el.text)
+        else:
+            if tag in HEADING_TAGS:
+                heading_depth -= 1
+                if not heading_depth:
+                    flush(HEADING_PREFIX)
+            elif tag in BLOCK_TAGS and not heading_depth:
+                flush()
+            if el.tail and el is not body:
+                buffer.append(el.tail)
+    flush()
+
+    return "\n".join(lines)
+
+
+def _split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """[(heading, body lines)] in document order; text before any heading has heading ""."""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.splitlines():
+        if line.startswith(HEADING_PREFIX):
+            sections.append((line[len(HEADING_PREFIX):], []))
+        elif line.strip():
+            sections[-1][1].append(line)
+    return [s for s in sections if s[0] or s[1]]
+
+
+def _keyword_hits(text: str, keywords: List[str]) -> int:
+    return sum(text.count(k) for k in keywords)
+
+
+def _category_score(heading: str, body: str, category: str) -> float:
+    heading_words, keywords = SECTION_KEYWORDS[category]
+    heading = heading.lower()
+    hits = _keyword_hits(body, keywords) + _keyword_hits(heading, keywords)
+    if not hits and not any(w in heading for w in heading_words):
+        return 0.0
+
+    # Hits per 100 words, floored so a one-line section cannot dominate
+    words = len(_WORD_RE.findall(body))
+    density = hits * 100.0 / max(words, 20)
+    heading_bonus = 10.0 if any(w in heading for w in heading_words) else 0.0
+    return heading_bonus + density
+
+
+def _fit_section(heading: str, lines: List[str], category: str, budget: int) -> str:
+    """Section text trimmed to the budget, keeping keyword lines first."""
+    header = f"{HEADING_PREFIX}{heading}" if heading else ""
+    full = "\n".join(([header] if header else []) + lines)
+    if len(full) <= budget:
+        return full
+
+    keywords = SECTION_KEYWORDS[category][1]
+    kept = [header] if header else []
+    used = len(header)
+    ranked = sorted(range(len(lines)), key=lambda i: -_keyword_hits(lines[i].lower(), keywords))
+    chosen = []
+    for i in ranked:
+        if used + len(lines[i]) + 1 > budget:
+            continue
+        chosen.append(i)
+        used += len(lines[i]) + 1
+    kept.extend(lines[i] for i in sorted(chosen))
+
+    if not chosen and budget - used > 40:
+        kept.append(lines[ranked[0]][:budget - used - 1])
+    return "\n".join(kept)
+
+
+def relevant_snippet(text: str, budget: int = WEBSITE_SNIPPET_CHARS) -> str:
+    """
+    Sections of page text most relevant to provider credentials, under budget.
+
+    Categories take turns picking their best remaining section so one long
+    insurance list cannot crowd out education. Falls back to the start of
+    the text when nothing matches.
+    """
+    if len(text) <= budget:
+        return text
+
+    sections = _split_sections(text)
+    candidates = {}
+    for category in SECTION_KEYWORDS:
+        scored = []
+        for index, (heading, lines) in enumerate(sections):
+            score = _category_score(heading, "\n".join(lines).lower(), category)
+            if score > 0:
+                scored.append((score, index))
+        candidates[category] = [index for _, index in sorted(scored, reverse=True)]
+
+    picked: Dict[int, str] = {}
+    remaining = budget
+    progress = True
+    while remaining > 0 and progress:
+        progress = False
+        for category, indexes in candidates.items():
+            while indexes and indexes[0] in picked:
+                indexes.pop(0)
+            if not indexes or remaining <= 0:
+                continue
+            index = indexes.pop(0)
+            heading, lines = sections[index]
+            chunk = _fit_section(heading, lines, category, remaining)
+            if chunk:
+                picked[index] = chunk
+                remaining -= len(chunk) + 1
+                progress = True
+
+    if not picked:
+        return text[:budget]
+
+    return "\n".join(picked[i] for i in sorted(picked))
@@ -1,5 +1,13 @@
 import json
-from services.gemini_ocr import extract_providers_from_pdf, GeminiOCRError
+import hashlib
+from services.gemini_ocr import extract_providers_from_pdf, GeminiOCRError, MODEL, PROMPT
+
+
+# Identifies the model + prompt that produced an extraction. Cached results
+# from a different model or prompt are never reused.
+OCR_EXTRACTOR_VERSION = (
+    f"gemini-ocr:{MODEL}:{hashlib.sha1(PROMPT.encode('utf-8')).hexdigest()[:8]}"
+)
 
 
 def run_ocr(file_path: str):
@@ -0,0 +1,392 @@
+"""
+Local Healthcare POI Index
+File: backend/poi_index.py
+
+Healthcare points of interest (amenity=hospital/doctors/clinic/dentist/
+pharmacy, any healthcare=* tag) imported from an OpenStreetMap extract into
+an on-disk grid index, so "is there a medical facility within 50 m?" is
+answered in-process instead of by an Overpass query per provider.
+
+Build once from a Geofabrik extract (.osm.pbf needs pyosmium; .osm,
+.osm.bz2 and .osm.gz are read with the standard library):
+
+    python poi_index.py us-latest.osm.pbf
+
+Layout of POI_INDEX_DIR:
+
+    cells.npy           int64 grid cell key per (cell, POI) pair, sorted
+    cell_pois.npy       int64 POI number for each cells.npy entry
+    vertices.npy        float64 (lat, lon) geometry of every POI: a node's
+                        point, or all node locations of a way
+    vertex_offsets.npy  int64 start of each POI's vertices (count + 1)
+    pois.jsonl          name / amenity / address, one JSON line per POI
+    poi_offsets.npy     int64 byte offset of each line (count + 1)
+    index.json          format, cell size, source file, build time, counts
+
+Everything is memory-mapped, so loading is instant, the pages are shared
+between worker processes and only the records a query returns are decoded.
+
+Ways (hospital campuses, clinic buildings) keep their full geometry and are
+registered in every grid cell their bounding box touches. A radius query
+binary-searches the few grid rows the circle touches, then measures the
+exact distance to each candidate: to the point for nodes, to the nearest
+segment for ways, and 0 for a point inside a closed way - the same matches
+as Overpass' way(around:r).
+"""
+
+import json
+import math
+import mmap
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config import POI_INDEX_DIR
+
+
+INDEX_FORMAT = 2
+
+CELL_DEGREES = 0.01  # ~1.1 km of latitude
+_LON_CELLS = int(round(360 / CELL_DEGREES)) + 1
+
+HEALTHCARE_AMENITIES = {"hospital", "doctors", "clinic", "dentist", "pharmacy"}
+
+_METERS_PER_DEGREE = 111320.0
+
+
+def is_healthcare_poi(tags: Dict[str, str]) -> bool:
+    """Same selection as the Overpass query in production_tools."""
+    if "healthcare" in tags:
+        return True
+    return tags.get("amenity") in HEALTHCARE_AMENITIES and "name" in tags
+
+
+def _poi_record(tags: Dict[str, str], osm_type: str, osm_id: int) -> dict:
+    return {
+        "name": tags.get("name", "Unknown"),
+        "amenity": tags.get("amenity", tags.get("healthcare", "medical")),
+        "healthcare": tags.get("healthcare", ""),
+        "address": tags.get("addr:street", ""),
+        "city": tags.get("addr:city", ""),
+        "osm_type": osm_type,
+        "osm_id": osm_id,
+    }
+
+
+def _cell_key(lat_idx, lon_idx):
+    return lat_idx * _LON_CELLS + lon_idx
+
+
+def _cell_index(value, offset):
+    return int(math.floor((value + offset) / CELL_DEGREES))
+
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    import numpy as np
+
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 6371000.0 * 2 * np.arcsin(np.sqrt(a))
+
+
+def _distance_to_shape_m(lat: float, lon: float, vertices) -> float:
+    """
+    Meters from a point to a way: 0 inside a closed way, else the distance
+    to the nearest segment. Uses a local flat projection around the point,
+    which is exact enough at the radii (tens of meters) this is used for.
+    """
+    import numpy as np
+
+    y = (vertices[:, 0] - lat) * _METERS_PER_DEGREE
+    x = (vertices[:, 1] - lon) * _METERS_PER_DEGREE * math.cos(math.radians(lat))
+    ax, ay, bx, by = x[:-1], y[:-1], x[1:], y[1:]
+
+    closed = len(vertices) >= 4 and x[0] == x[-1] and y[0] == y[-1]
+    if closed:
+        # Ray casting along +x from the query point (the origin)
+        crosses = (ay > 0) != (by > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_at = ax - ay * (bx - ax) / (by - ay)
+        if np.count_nonzero(crosses & (x_at > 0)) % 2 == 1:
+            return 0.0
+
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, -(ax * dx + ay * dy) / length_sq, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return float(np.min(np.hypot(ax + t * dx, ay + t * dy)))
+
+
+class PoiIndex:
+    def __init__(self, index_dir: str = POI_INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._cells = None
+        self._cell_pois = None
+        self._vertices = None
+        self._vertex_offsets = None
+        self._poi_offsets = None
+        self._records = None
+        self.count = 0
+        self.info: Dict = {}
+        self.load_error: Optional[str] = None
+
+    def load(self) -> bool:
+        """Map the index files (once). Returns False if no index was built."""
+        if self._loaded:
+            return True
+
+        with self._lock:
+            if self._loaded:
+                return True
+            if self.load_error is not None:
+                return False
+
+            try:
+                import numpy as np
+
+                with (self.index_dir / "index.json").open("r", encoding="utf-8") as f:
+                    self.info = json.load(f)
+                if self.info.get("format") != INDEX_FORMAT:
+                    raise ValueError(
+                        f"index format {self.info.get('format', 1)} is out of date; rebuild the index"
+                    )
+
+                def array(name):
+                    return np.load(self.index_dir / name, mmap_mode="r")
+
+                self._cells = array("cells.npy")
+                self._cell_pois = array("cell_pois.npy")
+                self._vertices = array("vertices.npy")
+                self._vertex_offsets = array("vertex_offsets.npy")
+                self._poi_offsets = array("poi_offsets.npy")
+                self.count = len(self._poi_offsets) - 1
+
+                if self.count > 0:
+                    with (self.index_dir / "pois.jsonl").open("rb") as f:
+                        self._records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+                if not (len(self._cells) == len(self._cell_pois)
+                        and len(self._vertex_offsets) == self.count + 1
+                        and self.count == self.info.get("count")):
+                    raise ValueError("index files are out of sync; rebuild the index")
+
+                self._loaded = True
+                print(f"🏥 POI index loaded: {self.count:,} healthcare POIs")
+                return True
+            except FileNotFoundError:
+                self.load_error = f"No POI index at {self.index_dir}"
+                return False
+            except Exception as e:
+                self.load_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ POI index unavailable: {self.load_error}")
+                return False
+
+    @property
+    def available(self) -> bool:
+        return self.load()
+
+    def _record(self, poi: int) -> dict:
+        start, end = int(self._poi_offsets[poi]), int(self._poi_offsets[poi + 1])
+        return json.loads(self._records[start:end])
+
+    def query_radius(self, lat: float, lon: float, radius_m: float) -> List[dict]:
+        """POIs within radius_m of a point, nearest first, each with distance_m."""
+        import numpy as np
+
+        if not self.load() or not self.count:
+            return []
+
+        dlat = radius_m / _METERS_PER_DEGREE
+        dlon = radius_m / (_METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        lon_lo, lon_hi = _cell_index(lon - dlon, 180), _cell_index(lon + dlon, 180)
+
+        # One contiguous key range per grid row the circle touches
+        candidates = []
+        for lat_idx in range(_cell_index(lat - dlat, 90), _cell_index(lat + dlat, 90) + 1):
+            start = np.searchsorted(self._cells, _cell_key(lat_idx, lon_lo), side="left")
+            end = np.searchsorted(self._cells, _cell_key(lat_idx, lon_hi), side="right")
+            if end > start:
+                candidates.append(np.asarray(self._cell_pois[start:end]))
+
+        if not candidates:
+            return []
+
+        matches = []
+        for poi in np.unique(np.concatenate(candidates)).tolist():
+            vertices = np.asarray(
+                self._vertices[self._vertex_offsets[poi]:self._vertex_offsets[poi + 1]]
+            )
+            if len(vertices) == 1:
+                distance = float(_haversine_m(lat, lon, vertices[0, 0], vertices[0, 1]))
+            else:
+                distance = _distance_to_shape_m(lat, lon, vertices)
+            if distance <= radius_m:
+                matches.append((distance, poi))
+
+        return [{**self._record(poi), "distance_m": round(distance, 1)}
+                for distance, poi in sorted(matches)]
+
+
+poi_index = PoiIndex()
+
+
+# ============================================
+# IMPORTER
+# ============================================
+
+def _iter_pbf(path: Path) -> Iterator[dict]:
+    import osmium
+
+    found = []
+
+    class Handler(osmium.SimpleHandler):
+        def node(self, n):
+            tags = dict(n.tags)
+            if is_healthcare_poi(tags) and n.location.valid():
+                found.append(([(n.location.lat, n.location.lon)], _poi_record(tags, "node", n.id)))
+
+        def way(self, w):
+            tags = dict(w.tags)
+            if not is_healthcare_poi(tags):
+                return
+            geometry = [(nd.lat, nd.lon) for nd in w.nodes if nd.location.valid()]
+            if geometry:
+                found.append((geometry, _poi_record(tags, "way", w.id)))
+
+    Handler().apply_file(str(path), locations=True)
+    for geometry, record in found:
+        yield {"geometry": geometry, **record}
+
+
+def _open_xml(path: Path):
+    if path.suffix == ".bz2":
+        import bz2
+        return bz2.open(path, "rb")
+    if path.suffix == ".gz":
+        import gzip
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def _iter_top_level(path: Path):
+    """Each complete <node>/<way>/<relation>, discarded once the caller moves on."""
+    import xml.etree.ElementTree as ET
+
+    with _open_xml(path) as f:
+        root = None
+        depth = 0
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = el
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield el
+                root.clear()
+
+
+def _iter_xml(path: Path) -> Iterator[dict]:
+    """Two streaming passes: POIs and the node refs of POI ways, then those nodes' coordinates."""
+    way_refs: Dict[int, List[int]] = {}
+    way_records: Dict[int, dict] = {}
+
+    for el in _iter_top_level(path):
+        if el.tag not in ("node", "way"):
+            continue
+        tags = {t.get("k"): t.get("v") for t in el.iter("tag")}
+        if is_healthcare_poi(tags):
+            osm_id = int(el.get("id"))
+            if el.tag == "node":
+                yield {"geometry": [(float(el.get("lat")), float(el.get("lon")))],
+                       **_poi_record(tags, "node", osm_id)}
+            else:
+                way_refs[osm_id] = [int(nd.get("ref")) for nd in el.iter("nd")]
+                way_records[osm_id] = _poi_record(tags, "way", osm_id)
+
+    if not way_refs:
+        return
+
+    wanted = {ref for refs in way_refs.values() for ref in refs}
+    locations: Dict[int, tuple] = {}
+    for el in _iter_top_level(path):
+        if el.tag == "node" and int(el.get("id")) in wanted:
+            locations[int(el.get("id"))] = (float(el.get("lat")), float(el.get("lon")))
+
+    for way_id, refs in way_refs.items():
+        geometry = [locations[r] for r in refs if r in locations]
+        if geometry:
+            yield {"geometry": geometry, **way_records[way_id]}
+
+
+def build_index(extract_path: str, index_dir: str = POI_INDEX_DIR) -> int:
+    """Import healthcare POIs from an OSM extract. Returns the POI count."""
+    import numpy as np
+
+    path = Path(extract_path)
+    out = Path(index_dir)
+    start = time.perf_counter()
+    print(f"🏥 Importing healthcare POIs from {path} ...")
+
+    pois = list(_iter_pbf(path) if path.name.endswith(".pbf") else _iter_xml(path))
+
+    vertex_offsets = np.zeros(len(pois) + 1, dtype=np.int64)
+    cell_keys: List[int] = []
+    cell_pois: List[int] = []
+    for i, poi in enumerate(pois):
+        vertex_offsets[i + 1] = vertex_offsets[i] + len(poi["geometry"])
+        lats = [lat for lat, _ in poi["geometry"]]
+        lons = [lon for _, lon in poi["geometry"]]
+        # Every cell of the bounding box, so a query near any part of a way finds it
+        for lat_idx in range(_cell_index(min(lats), 90), _cell_index(max(lats), 90) + 1):
+            for lon_idx in range(_cell_index(min(lons), 180), _cell_index(max(lons), 180) + 1):
+                cell_keys.append(_cell_key(lat_idx, lon_idx))
+                cell_pois.append(i)
+
+    vertices = np.array([point for poi in pois for point in poi["geometry"]],
+                        dtype=np.float64).reshape(-1, 2)
+    cells = np.array(cell_keys, dtype=np.int64)
+    order = np.argsort(cells, kind="stable")
+
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / "cells.npy", cells[order])
+    np.save(out / "cell_pois.npy", np.array(cell_pois, dtype=np.int64)[order])
+    np.save(out / "vertices.npy", vertices)
+    np.save(out / "vertex_offsets.npy", vertex_offsets)
+
+    poi_offsets = np.zeros(len(pois) + 1, dtype=np.int64)
+    with (out / "pois.jsonl").open("wb") as f:
+        for i, poi in enumerate(pois):
+            line = json.dumps({k: v for k, v in poi.items() if k != "geometry"}).encode("utf-8") + b"\n"
+            f.write(line)
+            poi_offsets[i + 1] = poi_offsets[i] + len(line)
+    np.save(out / "poi_offsets.npy", poi_offsets)
+
+    with (out / "index.json").open("w", encoding="utf-8") as f:
+        json.dump({
+            "format": INDEX_FORMAT,
+            "cell_degrees": CELL_DEGREES,
+            "source": path.name,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "count": len(pois),
+            "vertex_count": len(vertices),
+        }, f, indent=2)
+
+    print(f"✅ Indexed {len(pois):,} POIs into {out} in {time.perf_counter() - start:.1f}s")
+    return len(pois)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the local healthcare POI index from an OSM extract")
+    parser.add_argument("extract", help="OSM extract (.osm.pbf, .osm, .osm.bz2, .osm.gz)")
+    parser.add_argument("--out", default=POI_INDEX_DIR, help="Index directory")
+    args = parser.parse_args()
+    build_index(args.extract, args.out)
@@ -11,17 +11,14 @@ SERPER_API_KEY=your_serper_key_here
 
 import requests
 import os
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 import time
 import re
 from typing import Dict, Optional, List
 from datetime import datetime
 
+from config import POI_OVERPASS_FALLBACK
+from rate_limiter import rate_limiter
+
 # Import state scrapers
 from state_scrapers import get_scraper, is_state_supported, SUPPORTED_STATES
 
@@ -51,6 +48,8 @@ def check_oig_leie_exclusion(npi: str = None, first_name: str = None, last_name:
         # OIG LEIE downloadable database (updated monthly)
         # Download from: https://oig.hhs.gov/exclusions/downloadables/UPDATED.csv
         
+        from bs4 import BeautifulSoup
+        
         base_url = "https://exclusions.oig.hhs.gov/search.aspx"
         
         # For production: Download and cache the CSV file monthly
@@ -325,32 +324,18 @@ def search_google_scholar(provider_name: str, year_min: int = 2024) -> dict:
         provider_name (str): The search query
         year_min (int): The oldest year to include (default 2024)
     """
-    from dotenv import load_dotenv
-    load_dotenv()
-        
-    api_key = os.getenv("SERPER_API_KEY")
-    if not api_key:
-        return {"error": "SERPER_API_KEY not found in .env file"}
+    from serper_client import serper_search, SerperConfigError
     
     print(f" 📚 Searching Google Scholar for: {provider_name} (Since {year_min})")
     
     try:
-        url = "https://google.serper.dev/scholar"
-        
         payload = {
             "q": f'"{provider_name}"',
             "num": 10,
             "as_ylo": year_min,
         }
         
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = serper_search("scholar", payload)
         
         publications = []
         
@@ -374,6 +359,8 @@ def search_google_scholar(provider_name: str, year_min: int = 2024) -> dict:
             "query": provider_name
         }
         
+    except SerperConfigError as e:
+        return {"error": str(e)}
     except Exception as e:
         print(f" ⚠️ Google Scholar search failed: {e}")
         return {"error": str(e), "publication_count": 0}
@@ -389,46 +376,16 @@ def geocode_address_nominatim(address: str, city: str, state: str, zip_code: str
     
     No API key required!
     Rate limit: 1 request per second
+    
+    Validation code should use geocoding.geocode_address, which shares one
+    result per address between the address and facility checks.
     """
+    from geocoding import geocode_nominatim
+    
     full_address = f"{address}, {city}, {state} {zip_code}, USA"
     
     try:
-        # Nominatim API (OpenStreetMap's geocoder)
-        url = "https://nominatim.openstreetmap.org/search"
-        
-        params = {
-            'q': full_address,
-            'format': 'json',
-            'limit': 1,
-            'addressdetails': 1
-        }
-        
-        headers = {
-            'User-Agent': 'HealthcareProviderVerification/1.0'  # Required by Nominatim
-        }
-        
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        results = response.json()
-        
-        if results:
-            result = results[0]
-            return {
-                "success": True,
-                "latitude": float(result['lat']),
-                "longitude": float(result['lon']),
-                "formatted_address": result.get('display_name', ''),
-                "address_details": result.get('address', {}),
-                "osm_type": result.get('osm_type', ''),
-                "osm_id": result.get('osm_id', '')
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Address not found"
-            }
-            
+        return geocode_nominatim(full_address)
     except Exception as e:
         return {
             "success": False,
@@ -461,6 +418,8 @@ def check_nearby_medical_facilities_overpass(lat: float, lon: float, radius: int
         out body;
         """
         
+        waited = rate_limiter("overpass").acquire()
+        
         response = requests.post(overpass_url, data={'data': query}, timeout=30)
         response.raise_for_status()
         
@@ -485,7 +444,8 @@ def check_nearby_medical_facilities_overpass(lat: float, lon: float, radius: int
             "success": True,
             "facility_count": len(medical_facilities),
             "facilities": medical_facilities,
-            "is_medical_area": len(medical_facilities) > 0
+            "is_medical_area": len(medical_facilities) > 0,
+            "rate_limit_wait_seconds": waited
         }
         
     except Exception as e:
@@ -496,6 +456,35 @@ def check_nearby_medical_facilities_overpass(lat: float, lon: float, radius: int
         }
 
 
+def find_nearby_medical_facilities(lat: float, lon: float, radius: int = 50) -> dict:
+    """
+    Medical facilities within radius meters, from the local POI index when
+    one has been built (see poi_index.py), otherwise from Overpass.
+    """
+    from poi_index import poi_index
+    
+    if poi_index.available:
+        facilities = poi_index.query_radius(lat, lon, radius)
+        return {
+            "success": True,
+            "facility_count": len(facilities),
+            "facilities": facilities,
+            "is_medical_area": len(facilities) > 0,
+            "source": "local_index"
+        }
+    
+    if not POI_OVERPASS_FALLBACK:
+        return {
+            "success": False,
+            "error": poi_index.load_error or "POI index unavailable",
+            "facility_count": 0
+        }
+    
+    result = check_nearby_medical_facilities_overpass(lat, lon, radius=radius)
+    result["source"] = "overpass"
+    return result
+
+
 def verify_medical_facility(address: str, city: str, state: str, zip_code: str) -> dict:
     """
     Verify if address is a medical facility using FREE OpenStreetMap data
@@ -503,20 +492,20 @@ def verify_medical_facility(address: str, city: str, state: str, zip_code: str)
     NO API KEY REQUIRED! 100% Free
     
     Uses:
-    1. Nominatim for geocoding (OSM)
-    2. Overpass API for nearby medical facility search (OSM)
+    1. The shared geocoding layer (same result as tools.validate_address)
+    2. Local OSM POI index (or Overpass API) for nearby medical facility search
     """
     full_address = f"{address}, {city}, {state} {zip_code}"
     print(f"  📍 Geo-verifying (FREE): {full_address}")
     
     try:
-        # Step 1: Geocode the address using Nominatim
-        time.sleep(1)  # Respect Nominatim rate limit (1 req/sec)
+        # Step 1: Geocode the address (usually already memoized by validate_address)
+        from geocoding import geocode_address
         
-        geocode_result = geocode_address_nominatim(address, city, state, zip_code)
+        geocode_result = geocode_address(address, city, state, zip_code)
         
         if not geocode_result.get('success'):
-            print(f"  ❌ Address not found in OpenStreetMap")
+            print(f"  ❌ Address could not be geocoded")
             return {
                 "is_medical_facility": False,
                 "facility_type": "Address Not Found",
@@ -530,10 +519,8 @@ def verify_medical_facility(address: str, city: str, state: str, zip_code: str)
         
         print(f"  ✅ Geocoded: {lat}, {lon}")
         
-        # Step 2: Check for nearby medical facilities using Overpass API
-        time.sleep(1)  # Be polite to free services
-        
-        nearby_result = check_nearby_medical_facilities_overpass(lat, lon, radius=50)
+        # Step 2: Check for nearby medical facilities (local POI index, else Overpass)
+        nearby_result = find_nearby_medical_facilities(lat, lon, radius=50)
         
         if not nearby_result.get('success'):
             print(f"  ⚠️ Could not check nearby facilities")
@@ -582,7 +569,13 @@ def verify_medical_facility(address: str, city: str, state: str, zip_code: str)
             "fraud_indicators": fraud_indicators,
             "confidence": 1.0 if is_medical else 0.3,
             "check_date": datetime.now().isoformat(),
-            "data_source": "OpenStreetMap (Nominatim + Overpass API)"
+            "geocode_source": geocode_result.get('source'),
+            "rate_limit_wait_seconds": round(
+                geocode_result.get('rate_limit_wait_seconds', 0.0)
+                + nearby_result.get('rate_limit_wait_seconds', 0.0), 3
+            ),
+            "data_source": "OpenStreetMap (local POI index)" if nearby_result.get('source') == "local_index"
+                           else "OpenStreetMap (Overpass API)"
         }
         
     except Exception as e:
@@ -613,7 +606,7 @@ def reverse_geocode_nominatim(lat: float, lon: float) -> dict:
             'User-Agent': 'HealthcareProviderVerification/1.0'
         }
         
-        time.sleep(1)  # Rate limit
+        waited = rate_limiter("nominatim").acquire()
         
         response = requests.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
@@ -626,7 +619,8 @@ def reverse_geocode_nominatim(lat: float, lon: float) -> dict:
             "address_details": result.get('address', {}),
             "osm_type": result.get('osm_type', ''),
             "category": result.get('category', ''),
-            "type": result.get('type', '')
+            "type": result.get('type', ''),
+            "rate_limit_wait_seconds": waited
         }
         
     except Exception as e:
@@ -649,13 +643,7 @@ def search_provider_web_presence(provider_name: str, npi: str, phone: str = None
     - Recent mentions
     - Website presence
     """
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    api_key = os.getenv("SERPER_API_KEY")
-    
-    if not api_key:
-        return {"error": "SERPER_API_KEY not found"}
+    from serper_client import serper_search, SerperConfigError
     
     search_query = f'"{provider_name}" NPI {npi}'
     if phone:
@@ -664,20 +652,12 @@ def search_provider_web_presence(provider_name: str, npi: str, phone: str = None
     print(f"  🔍 Searching web presence: {search_query}")
     
     try:
-        url = "https://google.serper.dev/search"
-        
         payload = {
             "q": search_query,
             "num": 10
         }
         
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        data = response.json()
+        data = serper_search("search", payload)
         
         # Extract knowledge graph (Google Business Profile)
         knowledge_graph = data.get('knowledgeGraph', {})
@@ -705,6 +685,8 @@ def search_provider_web_presence(provider_name: str, npi: str, phone: str = None
             "search_date": datetime.now().isoformat()
         }
         
+    except SerperConfigError as e:
+        return {"error": str(e)}
     except Exception as e:
         print(f"  ⚠️ Web presence search failed: {e}")
         return {"error": str(e), "web_presence_score": 0.0}
@@ -0,0 +1,87 @@
+"""
+Upstream Rate Limiters
+File: backend/rate_limiter.py
+
+Process-wide token buckets for free OpenStreetMap services, shared by every
+validation worker thread. Replaces fixed time.sleep(1) calls, which both
+slept when the service was idle and let parallel workers exceed the
+service's policy together.
+
+    waited = rate_limiter("nominatim").acquire()
+
+acquire() reserves a token and sleeps only as long as the bucket requires;
+it returns the seconds waited so callers can report it.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from config import (
+    NOMINATIM_RATE_PER_SECOND,
+    NOMINATIM_BURST,
+    OVERPASS_RATE_PER_SECOND,
+    OVERPASS_BURST,
+)
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate_per_second: float, burst: int = 1):
+        self.name = name
+        self.rate = rate_per_second
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt); returns the delay before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # Negative balance = callers already queued ahead of this one
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self.calls += 1
+            self.total_wait += delay
+            self.max_wait = max(self.max_wait, delay)
+            return delay
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": int(self.capacity),
+                "calls": self.calls,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.calls, 3) if self.calls else 0.0,
+                "max_wait_seconds": round(self.max_wait, 3),
+            }
+
+
+_limiters: Dict[str, TokenBucket] = {
+    # https://operations.osmfoundation.org/policies/nominatim/ - max 1 req/s
+    "nominatim": TokenBucket("nominatim", NOMINATIM_RATE_PER_SECOND, NOMINATIM_BURST),
+    "overpass": TokenBucket("overpass", OVERPASS_RATE_PER_SECOND, OVERPASS_BURST),
+}
+
+
+def rate_limiter(upstream: str) -> TokenBucket:
+    return _limiters[upstream]
+
+
+def rate_limiter_stats() -> dict:
+    return {name: bucket.stats() for name, bucket in _limiters.items()}
@@ -0,0 +1,133 @@
+"""
+Serper API Client
+File: backend/serper_client.py
+
+Shared client for google.serper.dev searches (scholar, web presence):
+
+- keep-alive connection pool per worker thread, API key read once
+- responses cached by the exact request payload: in-process for
+  SERPER_MEMO_TTL_SECONDS (covers same-name providers within a batch) and
+  in the search_cache table for SERPER_CACHE_TTL_SECONDS (skipped while the
+  database is unreachable, see cache_db.py)
+- identical concurrent queries are collapsed into one request
+
+Callers get the parsed JSON response; transport / HTTP errors are raised.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache_db import cache_call
+from config import SERPER_MEMO_TTL_SECONDS, SERPER_CACHE_TTL_SECONDS, SERPER_TIMEOUT
+from singleflight import SingleFlight
+
+
+SERPER_BASE_URL = "https://google.serper.dev"
+
+_MEMO_MAX_ENTRIES = 5000
+
+_session_local = threading.local()
+_memo: "OrderedDict[str, tuple]" = OrderedDict()
+_memo_lock = threading.Lock()
+_in_flight = SingleFlight()
+_api_key: Optional[str] = None
+
+
+class SerperConfigError(RuntimeError):
+    pass
+
+
+def get_api_key() -> str:
+    global _api_key
+    if _api_key is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _api_key = os.getenv("SERPER_API_KEY") or ""
+    if not _api_key:
+        raise SerperConfigError("SERPER_API_KEY not found in .env file")
+    return _api_key
+
+
+def _session() -> requests.Session:
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        _session_local.session = session
+    return session
+
+
+def query_key(endpoint: str, payload: dict) -> str:
+    """Cache key for a search: the endpoint plus the exact payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{endpoint}\n{body}".encode("utf-8")).hexdigest()
+
+
+def _memo_get(key: str) -> Optional[dict]:
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if time.monotonic() - stored_at > SERPER_MEMO_TTL_SECONDS:
+            del _memo[key]
+            return None
+        _memo.move_to_end(key)
+        return data
+
+
+def _memo_put(key: str, data: dict):
+    with _memo_lock:
+        _memo[key] = (time.monotonic(), data)
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+
+def _post(endpoint: str, payload: dict) -> dict:
+    response = _session().post(
+        f"{SERPER_BASE_URL}/{endpoint}",
+        json=payload,
+        headers={"X-API-KEY": get_api_key()},
+        timeout=SERPER_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def serper_search(endpoint: str, payload: dict) -> dict:
+    """
+    POST a search to Serper (e.g. endpoint "search" or "scholar").
+
+    Returns:
+        The response JSON. Treat it as read-only; cache hits return a copy.
+    """
+    key = query_key(endpoint, payload)
+
+    data = _memo_get(key)
+    if data is None:
+        def lookup():
+            cached = cache_call("get_cached_search", key)
+            if cached is not None:
+                _memo_put(key, cached)
+                return cached
+
+            fresh = _post(endpoint, payload)
+            _memo_put(key, fresh)
+            cache_call("save_cached_search", key, endpoint, payload, fresh, SERPER_CACHE_TTL_SECONDS)
+            return fresh
+
+        data, _ = _in_flight.run(key, lookup)
+
+    return copy.deepcopy(data)
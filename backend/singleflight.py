@@ -0,0 +1,59 @@
+"""
+Single-Flight Call Deduplication
+File: backend/singleflight.py
+
+SingleFlight collapses concurrent calls for the same key into one: the
+first caller runs the function and every caller that arrives while it is
+running waits for and shares its result (or exception). Used to stop
+parallel validation workers from repeating the same website fetch,
+geocode or search.
+
+    result, shared = _in_flight.run(key, lambda: fetch(key))
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def run(self, key: str, func: Callable[[], Any]) -> tuple:
+        """
+        Returns:
+            (result, shared) where shared is True if another caller did the work
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
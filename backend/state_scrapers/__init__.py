@@ -4,36 +4,69 @@ File: backend/state_scrapers/__init__.py
 
 This package contains state-specific medical license verification scrapers.
 Each state has its own module with a verification function.
+
+Scraper modules pull in selenium / webdriver_manager, so they are imported
+on first use rather than with the package. While USE_MOCK_STATE_SCRAPERS is
+set, get_scraper() returns the mock response directly and the scraper
+modules are never imported.
 """
 
-from .ca import verify_california_medical_board
-from .tx import verify_texas_medical_board
-from .fl import verify_florida_medical_board
-from .ny import verify_new_york_medical_board
-from .il import verify_illinois_medical_board
-from .pa import verify_pennsylvania_medical_board
-from .oh import verify_ohio_medical_board
-from .mi import verify_michigan_medical_board
-from .nc import verify_north_carolina_medical_board
-from .ga import verify_georgia_medical_board
+import importlib
+from collections.abc import Mapping
+from functools import partial
 
+from config import USE_MOCK_STATE_SCRAPERS
+from .mock_response import mock_license_response
 
-# State scraper registry - maps state codes to their verification functions
-STATE_SCRAPERS = {
-    "CA": verify_california_medical_board,
-    "TX": verify_texas_medical_board,
-    "FL": verify_florida_medical_board,
-    "NY": verify_new_york_medical_board,
-    "IL": verify_illinois_medical_board,
-    "PA": verify_pennsylvania_medical_board,
-    "OH": verify_ohio_medical_board,
-    "MI": verify_michigan_medical_board,
-    "NC": verify_north_carolina_medical_board,
-    "GA": verify_georgia_medical_board,
+
+# State code -> (module, verification function). Modules load on first lookup.
+_SCRAPER_LOCATIONS = {
+    "CA": ("ca", "verify_california_medical_board"),
+    "TX": ("tx", "verify_texas_medical_board"),
+    "FL": ("fl", "verify_florida_medical_board"),
+    "NY": ("ny", "verify_new_york_medical_board"),
+    "IL": ("il", "verify_illinois_medical_board"),
+    "PA": ("pa", "verify_pennsylvania_medical_board"),
+    "OH": ("oh", "verify_ohio_medical_board"),
+    "MI": ("mi", "verify_michigan_medical_board"),
+    "NC": ("nc", "verify_north_carolina_medical_board"),
+    "GA": ("ga", "verify_georgia_medical_board"),
 }
 
+_FUNCTION_MODULES = {func: module for module, func in _SCRAPER_LOCATIONS.values()}
+
+
+def _load_function(module: str, func: str):
+    return getattr(importlib.import_module(f".{module}", __name__), func)
+
+
+class _LazyScraperRegistry(Mapping):
+    """Read-only state code -> verification function map that imports on access."""
+
+    def __getitem__(self, state_code: str):
+        return _load_function(*_SCRAPER_LOCATIONS[state_code])
+
+    def __iter__(self):
+        return iter(_SCRAPER_LOCATIONS)
+
+    def __len__(self):
+        return len(_SCRAPER_LOCATIONS)
+
+
+# State scraper registry - maps state codes to their verification functions
+STATE_SCRAPERS = _LazyScraperRegistry()
+
 # List of supported states
-SUPPORTED_STATES = list(STATE_SCRAPERS.keys())
+SUPPORTED_STATES = list(_SCRAPER_LOCATIONS.keys())
+
+
+def _mock_scraper(state_code: str, license_number: str, last_name: str) -> dict:
+    """Same response each scraper module returns in mock mode."""
+    return mock_license_response(
+        state_code=state_code,
+        license_number=license_number,
+        provider_name=last_name
+    )
 
 
 def get_scraper(state_code: str):
@@ -42,11 +75,18 @@ def get_scraper(state_code: str):
     
     Args:
         state_code: Two-letter state code (e.g., 'CA', 'TX')
-        
+    
     Returns:
         Verification function for the state, or None if not supported
     """
-    return STATE_SCRAPERS.get(state_code.upper())
+    state_code = state_code.upper()
+    if state_code not in _SCRAPER_LOCATIONS:
+        return None
+
+    if USE_MOCK_STATE_SCRAPERS:
+        return partial(_mock_scraper, state_code)
+
+    return STATE_SCRAPERS[state_code]
 
 
 def is_state_supported(state_code: str) -> bool:
@@ -55,13 +95,20 @@ def is_state_supported(state_code: str) -> bool:
     
     Args:
         state_code: Two-letter state code
-        
+    
     Returns:
         True if state has automated scraper, False otherwise
     """
     return state_code.upper() in SUPPORTED_STATES
 
 
+def __getattr__(name: str):
+    # Keeps `from state_scrapers import verify_<state>_medical_board` working
+    if name in _FUNCTION_MODULES:
+        return _load_function(_FUNCTION_MODULES[name], name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'verify_california_medical_board',
     'verify_texas_medical_board',
@@ -77,4 +124,4 @@ __all__ = [
     'SUPPORTED_STATES',
     'get_scraper',
     'is_state_supported',
-]
\ No newline at end of file
+]
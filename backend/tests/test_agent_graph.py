@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+
+def _stub(result=None):
+    return lambda state: dict(result or {})
+
+
+def _part(agent, name, **fields):
+    def node(state):
+        start = time.time()
+        time.sleep(0.01)
+        return {"execution_metadata": agent.web_part_metadata(name, start, **fields)}
+    return node
+
+
+def _counted(calls, name, node):
+    def wrapper(state):
+        calls.append(name)
+        return node(state)
+    return wrapper
+
+
+def test_web_enrichment_parts_join_once(database_setup):
+    import agent
+
+    calls = []
+    graph = agent.build_workflow({
+        "verify_npi": _stub({"npi_result": {"status": "ok"}}),
+        "check_oig": _stub({"oig_leie_result": {"excluded": False}}),
+        "verify_license": _stub({"state_board_result": {"status": "ok"}}),
+        "validate_address": _stub({"address_result": {"is_valid": True}}),
+        "web_website": _part(agent, "website", website_fetch=None),
+        "web_scholar": _part(agent, "scholar", recent_publications_count=2),
+        "web_web_presence": _part(agent, "web_presence", digital_footprint_score=0.8),
+        "web_enrichment": _counted(calls, "web_enrichment", agent.web_enrichment_node),
+        "merge_results": _counted(calls, "merge_results", agent.merge_parallel_results_node),
+        "quality_assurance": _stub(),
+        "ai_arbitration": _stub(),
+        "confidence_scorer": _stub({"requires_human_review": False}),
+        "auto_approve": _stub({"final_profile": {"status": "approved"}}),
+        "human_review": _stub(),
+    }).compile()
+
+    result = graph.invoke({"initial_data": {"full_name": "Jane Smith"}, "log": [],
+                           "execution_metadata": {}})
+
+    assert calls == ["web_enrichment", "merge_results"]
+    web = result["execution_metadata"]["web_enrichment"]
+    assert set(web["parts"]) == {"website", "scholar", "web_presence"}
+    assert web["recent_publications_count"] == 2
+    assert web["digital_footprint_score"] == 0.8
@@ -0,0 +1,36 @@
+import pytest
+
+from analytics_cache import AnalyticsCache, etag_matches
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('"xyz"', False),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_entry_built_before_invalidation_is_not_stored():
+    cache = AnalyticsCache(ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate()
+    entry = cache.set("dashboard-stats", {"total": 1}, generation)
+
+    assert entry.payload == {"total": 1}
+    assert cache.get("dashboard-stats") is None
+
+
+def test_etag_follows_payload():
+    cache = AnalyticsCache(ttl_seconds=60)
+    first = cache.set("a", {"total": 1}, cache.generation)
+    same = cache.set("b", {"total": 1}, cache.generation)
+    changed = cache.set("c", {"total": 2}, cache.generation)
+
+    assert first.etag == same.etag != changed.etag
+    assert cache.get("a").etag == first.etag
@@ -0,0 +1,83 @@
+import pytest
+
+from browser_pool import BrowserPool, PooledBrowser
+
+
+class _Driver:
+    def __init__(self):
+        self.quit_called = False
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = BrowserPool(size=2, max_pages_per_session=3, acquire_timeout=1)
+    drivers = []
+
+    def start():
+        drivers.append(_Driver())
+        pool._started += 1
+        return PooledBrowser(drivers[-1])
+
+    monkeypatch.setattr(pool, "_start_browser", start)
+    pool.drivers = drivers
+    return pool
+
+
+def test_browser_is_reused(pool):
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        pass
+    assert first is second
+    assert pool.stats()["started"] == 1
+
+
+def test_browser_retired_after_max_pages(pool):
+    for _ in range(4):
+        with pool.session():
+            pass
+    assert pool.stats()["started"] == 2
+    assert pool.drivers[0].quit_called
+
+
+def test_failed_page_retires_browser(pool):
+    with pytest.raises(ValueError):
+        with pool.session():
+            raise ValueError("WebDriver error")
+    assert pool.drivers[0].quit_called
+    assert pool.stats()["idle"] == 0
+
+
+def test_unhealthy_idle_browser_replaced(pool):
+    with pool.session():
+        pass
+    pool.drivers[0].alive = False
+    with pool.session() as driver:
+        assert driver is pool.drivers[1]
+
+
+def test_close_all_retires_idle_and_in_use_browsers(pool):
+    with pool.session() as in_use:
+        with pool.session() as idle:
+            pass
+        pool.close_all()
+        assert pool.drivers[1].quit_called
+        assert not pool.drivers[0].quit_called
+    # Released after shutdown: quit instead of going back to the idle queue
+    assert pool.drivers[0].quit_called
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,95 @@
+import types
+
+import pytest
+from sqlalchemy.exc import OperationalError, IntegrityError
+
+import cache_db
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """A stand-in database_setup whose cache functions the test controls."""
+    calls = []
+    behaviour = {"mode": "ok"}
+
+    def get_cached_geocode(key):
+        calls.append(key)
+        if behaviour["mode"] == "down":
+            raise OperationalError("SELECT", {}, Exception("could not connect to server"))
+        if behaviour["mode"] == "bad_row":
+            raise IntegrityError("INSERT", {}, Exception("duplicate key"))
+        return {"key": key}
+
+    module = types.SimpleNamespace(get_cached_geocode=get_cached_geocode)
+    now = [1000.0]
+    monkeypatch.setattr(cache_db, "_module", module)
+    monkeypatch.setattr(cache_db, "_disabled_reason", None)
+    monkeypatch.setattr(cache_db, "_failures", 0)
+    monkeypatch.setattr(cache_db, "_retry_at", 0.0)
+    monkeypatch.setattr(cache_db.time, "monotonic", lambda: now[0])
+    return types.SimpleNamespace(calls=calls, behaviour=behaviour, now=now)
+
+
+def test_call_passes_through(fake_db):
+    assert cache_db.cache_call("get_cached_geocode", "a") == {"key": "a"}
+    assert fake_db.calls == ["a"]
+
+
+def test_connection_failure_opens_circuit(fake_db):
+    fake_db.behaviour["mode"] = "down"
+    assert cache_db.cache_call("get_cached_geocode", "a", default="miss") == "miss"
+
+    # Skipped without touching the database until the retry delay passes
+    for key in "bcd":
+        assert cache_db.cache_call("get_cached_geocode", key) is None
+    assert fake_db.calls == ["a"]
+    assert cache_db.cache_db_status()["consecutive_failures"] == 1
+
+
+def test_probe_after_delay_and_recovery(fake_db):
+    fake_db.behaviour["mode"] = "down"
+    cache_db.cache_call("get_cached_geocode", "a")
+
+    fake_db.now[0] += cache_db.CACHE_DB_RETRY_SECONDS
+    cache_db.cache_call("get_cached_geocode", "b")  # probe fails: delay doubles
+    assert fake_db.calls == ["a", "b"]
+    assert cache_db.cache_db_status()["retry_in_seconds"] == 2 * cache_db.CACHE_DB_RETRY_SECONDS
+
+    fake_db.behaviour["mode"] = "ok"
+    fake_db.now[0] += 2 * cache_db.CACHE_DB_RETRY_SECONDS
+    assert cache_db.cache_call("get_cached_geocode", "c") == {"key": "c"}
+    assert cache_db.cache_db_status()["consecutive_failures"] == 0
+    assert cache_db.cache_call("get_cached_geocode", "d") == {"key": "d"}
+
+
+def test_only_one_probe_while_half_open(fake_db):
+    fake_db.behaviour["mode"] = "down"
+    cache_db.cache_call("get_cached_geocode", "a")
+    fake_db.now[0] += cache_db.CACHE_DB_RETRY_SECONDS
+
+    # The first caller after the delay probes; the circuit is re-armed for the rest
+    assert cache_db._database_setup() is not None
+    assert cache_db._database_setup() is None
+
+
+def test_backoff_is_capped(fake_db):
+    fake_db.behaviour["mode"] = "down"
+    for _ in range(20):
+        fake_db.now[0] += cache_db.CACHE_DB_MAX_RETRY_SECONDS
+        cache_db.cache_call("get_cached_geocode", "a")
+    assert cache_db.cache_db_status()["retry_in_seconds"] == cache_db.CACHE_DB_MAX_RETRY_SECONDS
+
+
+def test_other_errors_do_not_trip_the_circuit(fake_db):
+    fake_db.behaviour["mode"] = "bad_row"
+    assert cache_db.cache_call("get_cached_geocode", "a") is None
+    fake_db.behaviour["mode"] = "ok"
+    assert cache_db.cache_call("get_cached_geocode", "b") == {"key": "b"}
+
+
+def test_unconfigured_database_disables_caches(monkeypatch):
+    monkeypatch.setattr(cache_db, "_module", None)
+    monkeypatch.setattr(cache_db, "_disabled_reason", "ValueError: DATABASE_URL not configured")
+    monkeypatch.setattr(cache_db, "_failures", 0)
+    assert cache_db.cache_call("get_cached_geocode", "a", default="miss") == "miss"
+    assert cache_db.cache_db_status()["enabled"] is False
@@ -0,0 +1,42 @@
+class _FakeQuery:
+    def __init__(self, row):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+
+class _FakeSession:
+    def __init__(self, row):
+        self.row = row
+        self.closed = False
+
+    def query(self, model):
+        return _FakeQuery(self.row)
+
+    def close(self):
+        self.closed = True
+
+
+def _patch(database_setup, monkeypatch, existing_row):
+    calls = []
+    session = _FakeSession(existing_row)
+    monkeypatch.setattr(database_setup, "SessionLocal", lambda: session)
+    monkeypatch.setattr(database_setup, "backfill_promoted_columns", lambda: calls.append("backfill") or 0)
+    monkeypatch.setattr(database_setup, "rebuild_dashboard_aggregates", lambda: calls.append("rebuild") or True)
+    return calls, session
+
+
+def test_empty_aggregate_table_is_seeded(database_setup, monkeypatch):
+    calls, session = _patch(database_setup, monkeypatch, existing_row=None)
+    assert database_setup.seed_dashboard_aggregates() is True
+    # Rebuild reads the promoted columns, so they are backfilled first
+    assert calls == ["backfill", "rebuild"]
+    assert session.closed
+
+
+def test_populated_aggregate_table_is_left_alone(database_setup, monkeypatch):
+    calls, session = _patch(database_setup, monkeypatch, existing_row=object())
+    assert database_setup.seed_dashboard_aggregates() is False
+    assert calls == []
+    assert session.closed
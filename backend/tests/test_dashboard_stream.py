@@ -0,0 +1,15 @@
+def test_diff_dashboard_stats_sends_only_changed_fields(database_setup):
+    import main
+
+    previous = {"total_providers": 10, "pending_reviews": 2, "by_state": {"MA": 4}}
+    current = {"total_providers": 11, "pending_reviews": 2, "by_state": {"MA": 4}, "flagged": 1}
+    assert main.diff_dashboard_stats(previous, current) == {"total_providers": 11, "flagged": 1}
+
+
+def test_diff_dashboard_stats_first_tick_and_no_change(database_setup):
+    import main
+
+    stats = {"total_providers": 10, "by_state": {"MA": 4}}
+    assert main.diff_dashboard_stats({}, stats) == stats
+    assert main.diff_dashboard_stats(stats, dict(stats)) == {}
+    assert main.diff_dashboard_stats(stats, {**stats, "by_state": {"MA": 5}}) == {"by_state": {"MA": 5}}
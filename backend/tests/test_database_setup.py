@@ -0,0 +1,74 @@
+from geo_clustering import encode_geohash
+
+
+def _state(coordinates, **address_fields):
+    return {
+        "quality_metrics": {"path": "GREEN", "fraud_indicator_count": 0},
+        "execution_metadata": {},
+        "address_result": {"coordinates": coordinates, **address_fields},
+    }
+
+
+def test_geocoded_coordinates_are_persisted(database_setup):
+    columns = database_setup.promoted_metadata_columns(
+        _state({"lat": 42.36, "lng": -71.06}, coordinates_source="geocode")
+    )
+    assert columns["latitude"] == 42.36
+    assert columns["longitude"] == -71.06
+    assert columns["geohash"] == encode_geohash(42.36, -71.06)
+
+
+def test_zip_centroid_coordinates_are_not_persisted(database_setup):
+    columns = database_setup.promoted_metadata_columns(
+        _state({"lat": 42.36, "lng": -71.06}, coordinates_source="zip_centroid")
+    )
+    assert columns["latitude"] is None
+    assert columns["longitude"] is None
+    assert columns["geohash"] is None
+
+
+def test_states_without_source_keep_geocoded_coordinates(database_setup):
+    columns = database_setup.promoted_metadata_columns(_state({"lat": 40.7, "lon": -74.0}))
+    assert columns["geohash"] == encode_geohash(40.7, -74.0)
+
+
+def test_missing_or_invalid_coordinates(database_setup):
+    assert database_setup.promoted_metadata_columns(_state(None))["geohash"] is None
+    assert database_setup.promoted_metadata_columns(_state({"lat": 95, "lng": 0}))["latitude"] is None
+
+
+class _RecordingEngine:
+    def __init__(self):
+        self.statements = []
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return type("Result", (), {"rowcount": 0})()
+
+
+def _zip_centroid_updates(engine):
+    return [sql for sql in engine.statements if "zip_centroid" in sql]
+
+
+def test_startup_does_not_scan_for_zip_centroids(database_setup, monkeypatch):
+    engine = _RecordingEngine()
+    monkeypatch.setattr(database_setup, "engine", engine)
+    database_setup.ensure_promoted_columns()
+    assert engine.statements
+    assert _zip_centroid_updates(engine) == []
+
+
+def test_backfill_clears_zip_centroid_coordinates(database_setup, monkeypatch):
+    engine = _RecordingEngine()
+    monkeypatch.setattr(database_setup, "engine", engine)
+    database_setup.backfill_promoted_columns()
+    assert len(_zip_centroid_updates(engine)) == 1
@@ -0,0 +1,35 @@
+import pytest
+
+from geo_clustering import (
+    MAX_CLUSTER_ZOOM, encode_geohash, geohash_for_coordinates, zoom_to_precision,
+)
+
+
+def test_encode_geohash_known_values():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode_geohash(42.3601, -71.0589, 5) == "drt2z"
+
+
+def test_geohash_prefixes_nest():
+    fine = encode_geohash(42.3601, -71.0589, 9)
+    assert encode_geohash(42.3601, -71.0589, 4) == fine[:4]
+
+
+@pytest.mark.parametrize("coordinates", [
+    None, {}, {"lat": "x", "lng": 1}, {"lat": 95, "lng": 0}, {"lat": 0, "lng": 181},
+])
+def test_geohash_for_invalid_coordinates(coordinates):
+    assert geohash_for_coordinates(coordinates) is None
+
+
+def test_geohash_for_coordinates_accepts_lon_key():
+    assert geohash_for_coordinates({"lat": 42.3601, "lon": -71.0589}).startswith("drt2z")
+
+
+@pytest.mark.parametrize("zoom, precision", [(0, 2), (2, 2), (3, 3), (7, 4), (10, 5), (13, 6)])
+def test_zoom_to_precision(zoom, precision):
+    assert zoom_to_precision(zoom) == precision
+
+
+def test_zoom_past_last_cluster_level_returns_points():
+    assert zoom_to_precision(MAX_CLUSTER_ZOOM + 1) is None
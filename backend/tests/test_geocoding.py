@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+import geocoding
+from geocoding import canonical_address, geocode_address
+
+
+@pytest.mark.parametrize("address, city, state, zip_code, expected", [
+    ("123 North Main Street, Suite 4", "Boston", "MA", "02110",
+     "123 N MAIN ST|BOSTON|MA|02110"),
+    ("123 N. Main St", "boston", "ma", "02110-1234",
+     "123 N MAIN ST|BOSTON|MA|02110"),
+    # Leading zero lost in a spreadsheet
+    ("123 N Main St", "Boston", "MA", "2110",
+     "123 N MAIN ST|BOSTON|MA|02110"),
+    ("500 Fifth Avenue", "New York", "NY", "10110",
+     "500 FIFTH AVE|NEW YORK|NY|10110"),
+])
+def test_canonical_address(address, city, state, zip_code, expected):
+    assert canonical_address(address, city, state, zip_code) == expected
+
+
+def test_canonical_address_matches_zip_index_normalization():
+    from zip_index import normalize_zip
+
+    for zip_code in ["2110", "02110", "02110-0001", " 2110 "]:
+        assert canonical_address("1 Main St", "Boston", "MA", zip_code).endswith(
+            "|" + normalize_zip(zip_code))
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Empty memo, no persistent cache, and a counting fake upstream."""
+    monkeypatch.setattr(geocoding, "_memo", type(geocoding._memo)())
+    monkeypatch.setattr(geocoding, "cache_call", lambda *args, default=None: default)
+    upstream = []
+
+    def fake_uncached(address, city, state, zip_code):
+        upstream.append(address)
+        time.sleep(0.05)
+        return geocoding._result("nominatim", success=True, latitude=42.0, longitude=-71.0,
+                                 rate_limit_wait_seconds=1.0)
+
+    monkeypatch.setattr(geocoding, "_geocode_uncached", fake_uncached)
+    return upstream
+
+
+def test_same_address_geocoded_once(isolated):
+    first = geocode_address("123 North Main Street", "Boston", "MA", "02110")
+    second = geocode_address("123 N Main St, Suite 9", "Boston", "MA", "2110")
+
+    assert isolated == ["123 North Main Street"]
+    assert first["rate_limit_wait_seconds"] == 1.0
+    # The memo hit did not wait on the rate limit
+    assert second["rate_limit_wait_seconds"] == 0.0
+    second["latitude"] = 0
+    assert geocode_address("123 N Main St", "Boston", "MA", "02110")["latitude"] == 42.0
+
+
+def test_concurrent_lookups_collapsed(isolated):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        geocode_address("1 Main St", "Boston", "MA", "02110"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(isolated) == 1
+    assert len(results) == 5
+    assert all(r["success"] for r in results)
+
+
+def test_transport_errors_not_memoized(isolated, monkeypatch):
+    monkeypatch.setattr(geocoding, "_geocode_uncached",
+                        lambda *args: isolated.append("x") or geocoding._result("nominatim", error="timeout"))
+    assert geocode_address("1 Main St", "Boston", "MA", "02110")["error"] == "timeout"
+    geocode_address("1 Main St", "Boston", "MA", "02110")
+    assert isolated == ["x", "x"]
+
+
+def test_persistent_hit_is_marked_cached(monkeypatch):
+    monkeypatch.setattr(geocoding, "_memo", type(geocoding._memo)())
+    stored = geocoding._result("geoapify", success=True, latitude=1.0, longitude=2.0)
+    monkeypatch.setattr(geocoding, "cache_call",
+                        lambda name, *args, default=None: stored if name == "get_cached_geocode" else None)
+    monkeypatch.setattr(geocoding, "_geocode_uncached", lambda *args: pytest.fail("went upstream"))
+
+    result = geocode_address("1 Main St", "Boston", "MA", "02110")
+    assert result["cached"] is True
+    assert result["latitude"] == 1.0
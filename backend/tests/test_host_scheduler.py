@@ -0,0 +1,85 @@
+import threading
+import time
+
+import host_scheduler as host_scheduler_module
+from host_scheduler import HostScheduler, host_key
+
+
+def test_host_key():
+    assert host_key("https://www.Example.org/doctors") == "example.org"
+    assert host_key("http://clinic.example.org:8080/") == "clinic.example.org"
+
+
+def _hammer(scheduler, urls, hold=0.05):
+    peak = {}
+    active = {}
+    lock = threading.Lock()
+
+    def request(url):
+        with scheduler.slot(url):
+            host = host_key(url)
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(hold)
+            with lock:
+                active[host] -= 1
+
+    threads = [threading.Thread(target=request, args=(u,)) for u in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return peak
+
+
+def test_concurrency_is_limited_per_host():
+    scheduler = HostScheduler(concurrency=2, min_interval=0)
+    peak = _hammer(scheduler, ["https://a.example/"] * 6 + ["https://b.example/"] * 6)
+    assert peak == {"a.example": 2, "b.example": 2}
+    assert scheduler.stats()["hosts"]["a.example"]["requests"] == 6
+
+
+def test_starts_are_spaced():
+    scheduler = HostScheduler(concurrency=5, min_interval=0.05)
+    start = time.monotonic()
+    waits = []
+    for _ in range(4):
+        with scheduler.slot("https://a.example/") as waited:
+            waits.append(waited)
+    assert time.monotonic() - start >= 0.15
+    assert waits[0] < 0.01
+    # Another host is not held back by a.example
+    with scheduler.slot("https://b.example/") as waited:
+        assert waited < 0.01
+
+
+def test_idle_hosts_are_pruned(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(host_scheduler_module.time, "monotonic", lambda: now[0])
+    scheduler = HostScheduler(concurrency=1, min_interval=0)
+
+    for i in range(50):
+        with scheduler.slot(f"https://site{i}.example/"):
+            pass
+    assert len(scheduler.stats()["hosts"]) == 50
+
+    now[0] += host_scheduler_module.HOST_IDLE_SECONDS + 1
+    with scheduler.slot("https://fresh.example/"):
+        stats = scheduler.stats()
+
+    assert list(stats["hosts"]) == ["fresh.example"]
+    assert stats["pruned"]["hosts"] == 50
+    assert stats["pruned"]["requests"] == 50
+
+
+def test_busy_host_is_not_pruned(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(host_scheduler_module.time, "monotonic", lambda: now[0])
+    scheduler = HostScheduler(concurrency=1, min_interval=0)
+
+    with scheduler.slot("https://busy.example/"):
+        now[0] += host_scheduler_module.HOST_IDLE_SECONDS + 1
+        with scheduler.slot("https://other.example/"):
+            pass
+        assert "busy.example" in scheduler.stats()["hosts"]
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = [
+    "selenium", "bs4", "PIL", "PyPDF2", "pdf2image",
+    "pandas", "numpy", "lxml", "langgraph", "pgeocode", "database_setup",
+]
+
+
+def _loaded_after_import(module: str) -> list:
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = {"PATH": "/usr/bin:/bin", "DATABASE_URL": ""}
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    last_line = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    return [m for m in last_line.split(",") if m]
+
+
+@pytest.mark.parametrize("module", ["main", "tools", "production_tools", "state_scrapers"])
+def test_import_has_no_heavy_side_effects(module):
+    assert _loaded_after_import(module) == []
@@ -0,0 +1,84 @@
+from page_extractor import HEADING_PREFIX, page_text, relevant_snippet
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Dr. Smith</title><script>var x = 1;</script></head>
+<body>
+  <nav><a href="/">Home</a><a href="/about">About</a></nav>
+  <div class="cookie-banner">We use cookies</div>
+  <main>
+    <h1>Jane Smith, MD</h1>
+    <h2>Education</h2>
+    <p>Medical school: Harvard Medical School</p>
+    <p>Residency: Massachusetts General Hospital</p>
+    <h2>Insurance</h2>
+    <ul><li>Aetna</li><li>Medicare</li></ul>
+  </main>
+  <footer>Copyright 2024</footer>
+</body></html>
+"""
+
+
+def test_page_text_drops_boilerplate_and_marks_headings():
+    text = page_text(PAGE)
+    assert text.splitlines() == [
+        f"{HEADING_PREFIX}Jane Smith, MD",
+        f"{HEADING_PREFIX}Education",
+        "Medical school: Harvard Medical School",
+        "Residency: Massachusetts General Hospital",
+        f"{HEADING_PREFIX}Insurance",
+        "Aetna",
+        "Medicare",
+    ]
+
+
+def test_page_text_xhtml_with_encoding_declaration():
+    xhtml = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" '
+             '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+             '<html xmlns="http://www.w3.org/1999/xhtml"><body>'
+             '<h2>Board Certification</h2><p>American Board of Internal Medicine</p>'
+             '</body></html>')
+    assert page_text(xhtml) == (f"{HEADING_PREFIX}Board Certification\n"
+                                "American Board of Internal Medicine")
+
+
+def test_page_text_empty():
+    assert page_text("") == ""
+    assert page_text("   ") == ""
+
+
+def test_relevant_snippet_short_text_unchanged():
+    assert relevant_snippet("short text", budget=100) == "short text"
+
+
+def test_relevant_snippet_prefers_credential_sections():
+    filler = "\n".join(f"Visit our beautiful lobby, item {i}." for i in range(60))
+    text = "\n".join([
+        f"{HEADING_PREFIX}Welcome", filler,
+        f"{HEADING_PREFIX}Education", "Residency at Johns Hopkins University, fellowship in cardiology.",
+        f"{HEADING_PREFIX}Languages", "Dr. Lee speaks English and Spanish.",
+    ])
+    snippet = relevant_snippet(text, budget=300)
+
+    assert len(snippet) <= 300
+    assert "Johns Hopkins" in snippet
+    assert "Spanish" in snippet
+    assert "lobby" not in snippet
+
+
+def test_relevant_snippet_long_insurance_list_does_not_crowd_out_education():
+    insurers = "\n".join(f"Aetna PPO plan {i} accepted" for i in range(200))
+    text = "\n".join([
+        f"{HEADING_PREFIX}Insurance", insurers,
+        f"{HEADING_PREFIX}Education", "Graduated from Yale School of Medicine.",
+    ])
+    snippet = relevant_snippet(text, budget=400)
+    assert len(snippet) <= 400
+    assert "Yale School of Medicine" in snippet
+    assert "Aetna" in snippet
+
+
+def test_relevant_snippet_falls_back_to_prefix():
+    text = "x" * 500
+    assert relevant_snippet(text, budget=100) == "x" * 100
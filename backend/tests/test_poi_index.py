@@ -0,0 +1,96 @@
+import poi_index
+from poi_index import PoiIndex, build_index
+
+
+# Small campus polygon (~110 m x ~80 m) around 42.3400, -71.1000 plus one
+# standalone clinic node ~1 km away.
+CAMPUS = [(42.3395, -71.1005), (42.3395, -71.0995), (42.3405, -71.0995),
+          (42.3405, -71.1005), (42.3395, -71.1005)]
+EXTRACT = """<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+{nodes}
+  <node id="100" lat="42.3490" lon="-71.1000">
+    <tag k="amenity" v="clinic"/>
+    <tag k="name" v="Corner Clinic"/>
+  </node>
+  <node id="200" lat="42.3300" lon="-71.1000">
+    <tag k="amenity" v="cafe"/>
+    <tag k="name" v="Not Healthcare"/>
+  </node>
+  <way id="500">
+{refs}
+    <tag k="amenity" v="hospital"/>
+    <tag k="name" v="General Hospital"/>
+  </way>
+</osm>
+"""
+
+
+def _build(tmp_path):
+    nodes = "\n".join(f'  <node id="{i + 1}" lat="{lat}" lon="{lon}"/>'
+                      for i, (lat, lon) in enumerate(CAMPUS[:-1]))
+    refs = "\n".join(f'    <nd ref="{i + 1}"/>' for i in [0, 1, 2, 3, 0])
+    extract = tmp_path / "extract.osm"
+    extract.write_text(EXTRACT.format(nodes=nodes, refs=refs), encoding="utf-8")
+
+    out = tmp_path / "index"
+    assert build_index(str(extract), str(out)) == 2
+    index = PoiIndex(str(out))
+    assert index.load()
+    return index
+
+
+def test_point_near_way_edge_matches(tmp_path):
+    index = _build(tmp_path)
+    # ~14 m south of the campus' south edge, far from its centroid
+    matches = index.query_radius(42.3395 - 14 / 111320.0, -71.1000, 50)
+    assert [m["name"] for m in matches] == ["General Hospital"]
+    assert 13 <= matches[0]["distance_m"] <= 15
+    assert matches[0]["osm_type"] == "way"
+
+
+def test_point_inside_closed_way_is_distance_zero(tmp_path):
+    index = _build(tmp_path)
+    matches = index.query_radius(42.3400, -71.1000, 10)
+    assert [m["name"] for m in matches] == ["General Hospital"]
+    assert matches[0]["distance_m"] == 0.0
+
+
+def test_node_match_and_miss(tmp_path):
+    index = _build(tmp_path)
+    assert [m["name"] for m in index.query_radius(42.3490, -71.1002, 50)] == ["Corner Clinic"]
+    assert index.query_radius(42.3300, -71.1000, 50) == []
+
+
+def test_results_sorted_by_distance(tmp_path):
+    index = _build(tmp_path)
+    matches = index.query_radius(42.3445, -71.1000, 1000)
+    assert [m["name"] for m in matches] == ["General Hospital", "Corner Clinic"]
+    assert matches[0]["distance_m"] <= matches[1]["distance_m"]
+
+
+def test_records_are_memory_mapped(tmp_path):
+    index = _build(tmp_path)
+    assert not hasattr(index, "_pois")
+    assert index._cells.__class__.__name__ == "memmap"
+    assert index._vertices.__class__.__name__ == "memmap"
+
+
+def test_missing_or_outdated_index(tmp_path):
+    assert not PoiIndex(str(tmp_path / "missing")).load()
+
+    index_dir = tmp_path / "old"
+    index_dir.mkdir()
+    (index_dir / "index.json").write_text('{"count": 0}', encoding="utf-8")
+    index = PoiIndex(str(index_dir))
+    assert not index.load()
+    assert "rebuild" in index.load_error
+
+
+def test_distance_to_open_way_uses_segments():
+    import numpy as np
+
+    line = np.array([(42.0, -71.0), (42.0, -70.99)])  # ~830 m east-west
+    # 20 m north of the middle of the segment, ~400 m from either end
+    d = poi_index._distance_to_shape_m(42.0 + 20 / 111320.0, -70.995, line)
+    assert 19 <= d <= 21
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+VALID_INFO = {
+    "full_name": "Jane Smith",
+    "email": "jane@example.com",
+    "phone": "(617) 555-0100",
+    "specialty": "Cardiology",
+    "license_number": "MA-12345",
+    "npi": "1234567890",
+    "practice_address": "1 Main St, Boston, MA 02110",
+}
+
+
+def test_valid_application_has_no_errors(database_setup):
+    assert database_setup.application_field_errors(VALID_INFO) == []
+
+
+@pytest.mark.parametrize("field, value", [
+    ("npi", "12345678901"),
+    ("npi", "12345abcde"),
+    ("npi", ""),
+    ("phone", "5" * 31),
+    ("full_name", "x" * 201),
+])
+def test_invalid_fields_are_reported(database_setup, field, value):
+    errors = database_setup.application_field_errors({**VALID_INFO, field: value})
+    assert len(errors) == 1
+    assert errors[0].startswith(f"{field}:")
+
+
+def test_submission_date_stored_as_utc(database_setup):
+    aware = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    row = database_setup._application_row_values({
+        "application_id": "APP_1", "submission_date": aware.isoformat(), "provider_info": VALID_INFO
+    })
+    assert row["submission_date"] == aware
+
+    # Legacy records carry naive server-local time
+    naive = datetime(2024, 5, 1, 12, 0)
+    row = database_setup._application_row_values({
+        "application_id": "APP_2", "submission_date": naive.isoformat(), "provider_info": VALID_INFO
+    })
+    assert row["submission_date"].tzinfo is not None
+    assert row["submission_date"] == naive.astimezone(timezone.utc)
+
+
+def test_apply_rejects_invalid_form_before_saving_file(database_setup, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    saved = []
+    monkeypatch.setattr(database_setup, "save_provider_application", lambda data: saved.append(data))
+
+    form = {
+        "fullName": "Jane Smith", "email": "jane@example.com", "phoneNumber": "555-0100",
+        "speciality": "Cardiology", "licenseNumber": "MA-12345", "npiId": "123-NOT-AN-NPI",
+        "practiceAddress": "1 Main St", "aiRawResult": "{}", "aiParsedResult": "{}",
+    }
+    response = TestClient(main.app).post(
+        "/api/providers/apply", data=form, files={"file": ("license.pdf", b"%PDF-1.4", "application/pdf")}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == ["npi: must be exactly 10 digits"]
+    assert saved == []
+    assert not (tmp_path / "provider_applications").exists() or \
+        not any((tmp_path / "provider_applications").iterdir())
+
+
+def test_apply_removes_file_when_save_fails(database_setup, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(database_setup, "save_provider_application", lambda data: None)
+
+    form = {
+        "fullName": "Jane Smith", "email": "jane@example.com", "phoneNumber": "555-0100",
+        "speciality": "Cardiology", "licenseNumber": "MA-12345", "npiId": "1234567890",
+        "practiceAddress": "1 Main St", "aiRawResult": "{}", "aiParsedResult": "{}",
+    }
+    response = TestClient(main.app).post(
+        "/api/providers/apply", data=form, files={"file": ("license.pdf", b"%PDF-1.4", "application/pdf")}
+    )
+
+    assert response.json()["success"] is False
+    assert list((tmp_path / "provider_applications").iterdir()) == []
+
+
+class _Insert:
+    def __init__(self, table):
+        self.rows = []
+
+    def values(self, rows):
+        self.rows = rows
+        return self
+
+    def on_conflict_do_nothing(self, index_elements):
+        return self
+
+
+class _Engine:
+    def __init__(self):
+        self.inserted = []
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, stmt):
+        self.inserted.extend(stmt.rows)
+        return type("Result", (), {"rowcount": len(stmt.rows)})()
+
+
+def test_migration_skips_records_that_do_not_fit(database_setup, tmp_path, monkeypatch):
+    import json
+
+    engine = _Engine()
+    monkeypatch.setattr(database_setup, "engine", engine)
+    monkeypatch.setattr(database_setup, "pg_insert", _Insert)
+
+    legacy = tmp_path / "provider_applications.json"
+    legacy.write_text(json.dumps([
+        {"application_id": "APP_1", "submission_date": "2024-05-01T12:00:00", "provider_info": VALID_INFO},
+        {"application_id": "APP_2", "provider_info": {**VALID_INFO, "npi": "12345678901"}},
+        {"application_id": "APP_3", "submission_date": "not a date", "provider_info": VALID_INFO},
+        {"application_id": "APP_4", "provider_info": {**VALID_INFO, "phone": "5" * 40}},
+    ]))
+
+    assert database_setup.migrate_provider_applications_json(str(legacy)) == 1
+    assert [row["application_id"] for row in engine.inserted] == ["APP_1"]
+    assert not legacy.exists()
+    assert (tmp_path / "provider_applications.json.migrated").exists()
+
+    rejected = json.loads((tmp_path / "provider_applications.json.rejected").read_text())
+    assert [r["application_id"] for r in rejected] == ["APP_2", "APP_3", "APP_4"]
+    assert rejected[0]["migration_errors"] == ["npi: must be exactly 10 digits"]
@@ -0,0 +1,50 @@
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_is_free_then_requests_are_spaced(clock):
+    bucket = TokenBucket("test", rate_per_second=2.0, burst=2)
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.5, 0.5]
+    assert clock.slept == [0.5, 0.5]
+
+
+def test_idle_time_refills_up_to_burst(clock):
+    bucket = TokenBucket("test", rate_per_second=1.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+def test_queued_callers_wait_in_turn(clock):
+    bucket = TokenBucket("test", rate_per_second=1.0, burst=1)
+    # Reservations made before anyone sleeps, as with concurrent workers
+    assert [bucket._reserve() for _ in range(3)] == [0.0, 1.0, 2.0]
+
+    stats = bucket.stats()
+    assert stats["calls"] == 3
+    assert stats["max_wait_seconds"] == 2.0
+    assert stats["avg_wait_seconds"] == 1.0
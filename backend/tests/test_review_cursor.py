@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+
+def test_review_cursor_round_trip(database_setup):
+    import main
+
+    created = datetime(2025, 3, 4, 5, 6, 7, 890000, tzinfo=timezone.utc)
+    review = SimpleNamespace(priority_rank=1, created_at=created, id=42)
+    assert main.decode_review_cursor(main.encode_review_cursor(review)) == (1, created, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "WzEsMl0=", "WyJ4IiwgbnVsbCwgMV0="])
+def test_invalid_review_cursor_is_a_400(database_setup, cursor):
+    import main
+
+    with pytest.raises(HTTPException) as error:
+        main.decode_review_cursor(cursor)
+    assert error.value.status_code == 400
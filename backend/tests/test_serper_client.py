@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+import serper_client
+from serper_client import query_key, serper_search
+
+
+def test_query_key_ignores_key_order_but_not_values():
+    assert query_key("search", {"q": "Jane Smith MD", "num": 10}) == \
+        query_key("search", {"num": 10, "q": "Jane Smith MD"})
+    assert query_key("search", {"q": "a"}) != query_key("scholar", {"q": "a"})
+    assert query_key("search", {"q": "a"}) != query_key("search", {"q": "b"})
+
+
+@pytest.fixture
+def fake_upstream(monkeypatch):
+    monkeypatch.setattr(serper_client, "_memo", type(serper_client._memo)())
+    stored = {}
+
+    def fake_cache_call(name, *args, default=None):
+        if name == "get_cached_search":
+            return stored.get(args[0], default)
+        if name == "save_cached_search":
+            stored[args[0]] = args[3]
+        return default
+
+    posts = []
+
+    def fake_post(endpoint, payload):
+        posts.append((endpoint, payload["q"]))
+        time.sleep(0.05)
+        return {"organic": [{"title": payload["q"]}]}
+
+    monkeypatch.setattr(serper_client, "cache_call", fake_cache_call)
+    monkeypatch.setattr(serper_client, "_post", fake_post)
+    return posts, stored
+
+
+def test_repeated_query_posts_once_and_is_persisted(fake_upstream):
+    posts, stored = fake_upstream
+    first = serper_search("search", {"q": "Dr. Jane Smith"})
+    first["organic"].clear()  # callers get their own copy
+    second = serper_search("search", {"q": "Dr. Jane Smith"})
+
+    assert posts == [("search", "Dr. Jane Smith")]
+    assert second == {"organic": [{"title": "Dr. Jane Smith"}]}
+    assert query_key("search", {"q": "Dr. Jane Smith"}) in stored
+
+
+def test_persistent_hit_skips_post(fake_upstream, monkeypatch):
+    posts, stored = fake_upstream
+    stored[query_key("scholar", {"q": "x"})] = {"organic": []}
+    assert serper_search("scholar", {"q": "x"}) == {"organic": []}
+    assert posts == []
+
+
+def test_concurrent_identical_queries_collapsed(fake_upstream):
+    posts, _ = fake_upstream
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(serper_search("search", {"q": "same"})))
+               for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert posts == [("search", "same")]
+    assert len(results) == 6
+
+
+def test_missing_api_key(monkeypatch):
+    monkeypatch.setattr(serper_client, "_api_key", "")
+    with pytest.raises(serper_client.SerperConfigError):
+        serper_client.get_api_key()
@@ -0,0 +1,36 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.05)
+        return "page"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.run("k", work))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(result == "page" for result, _ in results)
+    # Finished calls are forgotten
+    assert flight.run("k", lambda: "again") == ("again", False)
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.run("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.run("k", lambda: 1) == (1, False)
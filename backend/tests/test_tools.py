@@ -0,0 +1,39 @@
+import pandas as pd
+
+from tools import PROVIDER_COLUMN_MAP, extract_provider_records, map_provider_columns
+
+
+def test_map_provider_columns_matches_known_headers():
+    columns = map_provider_columns(pd.Index(["provider name", "npi", "zip code", "notes"]))
+    assert columns["full_name"] == "provider name"
+    assert columns["NPI"] == "npi"
+    assert "notes" not in columns.values()
+
+
+def test_extract_provider_records_cleans_and_fills_fields():
+    df = pd.DataFrame({
+        "provider name": ["  Dr. Ada Lee ", None, "Dr. Bo Chan"],
+        "npi": [1234567893, 1234567894, None],
+        "city": ["Boston", "Austin", None],
+    })
+    records = extract_provider_records(df)
+
+    assert [r["full_name"] for r in records] == ["Dr. Ada Lee", "Dr. Bo Chan"]
+    assert records[0]["city"] == "Boston"
+    assert records[1]["NPI"] == "" and records[1]["city"] == ""
+    assert all(set(PROVIDER_COLUMN_MAP) <= set(r) for r in records)
+
+
+def test_extract_provider_records_keeps_datetime_text():
+    df = pd.DataFrame({
+        "provider name": ["Dr. Ada Lee", "Dr. Bo Chan", "Dr. Cy Diaz"],
+        "license number": pd.to_datetime(
+            ["2024-01-02", "2024-01-03 04:05:06.123456", None], format="mixed"),
+    })
+    records = extract_provider_records(df)
+    column = map_provider_columns(df.columns)["license_number"]
+
+    assert [r["license_number"] for r in records] == [
+        str(value) if not pd.isna(value) else "" for value in df[column]
+    ]
+    assert records[1]["license_number"] == "2024-01-03 04:05:06.123456"
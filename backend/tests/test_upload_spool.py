@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+import upload_spool
+from upload_spool import UploadSizeLimitMiddleware, UploadTooLargeError, spool_upload
+
+
+MAX_BYTES = 1024 * 1024
+
+
+def _app(calls):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, paths={"/upload"}, max_bytes=MAX_BYTES)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await file.read())}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def _multipart(payload: bytes, boundary: str = "xyz") -> bytes:
+    return (f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="roster.csv"\r\n'
+            "Content-Type: text/csv\r\n\r\n").encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+
+
+def test_upload_under_limit_reaches_endpoint():
+    calls = []
+    client = TestClient(_app(calls))
+    response = client.post("/upload", files={"file": ("roster.csv", b"a" * 1000, "text/csv")})
+    assert response.status_code == 200
+    assert response.json() == {"size": 1000}
+    assert calls == ["roster.csv"]
+
+
+def test_oversized_content_length_rejected_before_parsing():
+    calls = []
+    client = TestClient(_app(calls))
+    response = client.post("/upload", files={"file": ("roster.csv", b"a" * (MAX_BYTES + 100 * 1024), "text/csv")})
+    assert response.status_code == 413
+    assert "1 MB" in response.json()["detail"]
+    assert calls == []
+
+
+def test_oversized_chunked_body_cut_off():
+    calls = []
+    client = TestClient(_app(calls))
+    body = _multipart(b"a" * (MAX_BYTES + 100 * 1024))
+
+    def chunks():
+        for i in range(0, len(body), 64 * 1024):
+            yield body[i:i + 64 * 1024]
+
+    response = client.post("/upload", content=chunks(),
+                           headers={"Content-Type": "multipart/form-data; boundary=xyz"})
+    assert response.status_code == 413
+    assert calls == []
+
+
+def test_other_paths_not_limited():
+    client = TestClient(_app([]))
+    response = client.post("/other", files={"file": ("big.csv", b"a" * (MAX_BYTES + 100 * 1024), "text/csv")})
+    assert response.status_code == 200
+
+
+def test_spool_upload_hashes_and_caps(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_spool, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    payload = b"npi,name\n1234567890,Jane\n" * 100
+
+    upload = asyncio.run(spool_upload(StarletteUploadFile(io.BytesIO(payload), filename="Roster.CSV"),
+                                      chunk_size=64))
+    assert upload.path.suffix == ".csv"
+    assert upload.path.read_bytes() == payload
+    assert upload.size_bytes == len(payload)
+    assert upload.sha256 == hashlib.sha256(payload).hexdigest()
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(StarletteUploadFile(io.BytesIO(payload), filename="big.csv"),
+                                 max_bytes=100, chunk_size=64))
+    # Only the first upload is left; the partial one was removed
+    assert [p.name for p in tmp_path.iterdir()] == [upload.path.name]
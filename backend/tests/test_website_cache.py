@@ -0,0 +1,65 @@
+import os
+import time
+
+from website_cache import WebsiteCache, canonical_url
+
+
+def test_canonical_url():
+    assert canonical_url("http://WWW.Example.com:80/About/?utm_source=x&b=2&a=1") == \
+        "https://example.com/About?a=1&b=2"
+    assert canonical_url("https://example.com") == canonical_url("https://example.com/")
+    assert canonical_url("https://example.com:8443/x") == "https://example.com:8443/x"
+
+
+def test_put_get_and_freshness(tmp_path):
+    cache = WebsiteCache(str(tmp_path), ttl_seconds=60)
+    assert cache.get("https://example.com") is None
+
+    cache.put("https://example.com/", "Board certified", "http", etag='"abc"')
+    entry = cache.get("http://www.example.com")
+    assert entry["text"] == "Board certified"
+    assert entry["etag"] == '"abc"'
+    assert cache.is_fresh(entry)
+    assert not cache.is_fresh({**entry, "validated_at": time.time() - 120})
+
+
+def _entry_files(tmp_path):
+    return sorted(p for p in tmp_path.glob("*/*.json"))
+
+
+def test_entry_cap_evicts_least_recently_used(tmp_path):
+    cache = WebsiteCache(str(tmp_path), max_entries=10, max_bytes=10 ** 9)
+    for i in range(10):
+        cache.put(f"https://site{i}.example", f"text {i}", "http")
+        # mtime resolution: keep the use order unambiguous
+        os.utime(cache._path(f"https://site{i}.example"), (1000 + i, 1000 + i))
+    cache._scan()
+
+    cache.get("https://site0.example")  # site0 becomes most recently used
+    cache.put("https://site10.example", "text 10", "http")
+
+    assert len(_entry_files(tmp_path)) == 9  # evicted down to 90% of the cap
+    assert cache.get("https://site0.example") is not None
+    assert cache.get("https://site1.example") is None
+    assert cache.get("https://site10.example") is not None
+
+
+def test_byte_cap(tmp_path):
+    cache = WebsiteCache(str(tmp_path), max_entries=1000, max_bytes=5000)
+    for i in range(20):
+        cache.put(f"https://site{i}.example", "x" * 900, "http")
+
+    assert cache.stats()["bytes"] <= 5000
+    assert sum(p.stat().st_size for p in _entry_files(tmp_path)) <= 5000
+    assert cache.get("https://site19.example") is not None
+
+
+def test_existing_directory_counted_after_restart(tmp_path):
+    first = WebsiteCache(str(tmp_path), max_entries=5)
+    for i in range(5):
+        first.put(f"https://site{i}.example", "text", "http")
+
+    restarted = WebsiteCache(str(tmp_path), max_entries=5)
+    assert restarted.stats()["entries"] == 5
+    restarted.put("https://new.example", "text", "http")
+    assert len(_entry_files(tmp_path)) <= 5
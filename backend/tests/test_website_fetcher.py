@@ -0,0 +1,140 @@
+from contextlib import contextmanager
+
+import pytest
+import requests
+
+import website_fetcher
+from website_fetcher import FetchResult
+
+
+class _Response:
+    def __init__(self, status_code=200, location=None, body="", content_type="text/html"):
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        if location:
+            self.headers["Location"] = location
+        self.text = body
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _Session:
+    def __init__(self, routes):
+        self.routes = routes
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None, allow_redirects=True):
+        assert allow_redirects is False
+        self.requested.append(url)
+        return self.routes[url]
+
+    def get_redirect_target(self, response):
+        if response.status_code in (301, 302, 303, 307, 308):
+            return response.headers.get("Location")
+        return None
+
+
+class _RecordingScheduler:
+    def __init__(self):
+        self.slots = []
+
+    @contextmanager
+    def slot(self, url):
+        self.slots.append(url)
+        yield 0.25
+
+
+PAGE = "<html><body>" + "<p>Board certified in internal medicine.</p>" * 20 + "</body></html>"
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    recorder = _RecordingScheduler()
+    monkeypatch.setattr(website_fetcher, "host_scheduler", recorder)
+    return recorder
+
+
+def test_each_redirect_hop_takes_its_hosts_slot(monkeypatch, scheduler):
+    session = _Session({
+        "https://clinic.example/": _Response(301, location="https://www.health-system.example/clinic"),
+        "https://www.health-system.example/clinic": _Response(302, location="/clinic/"),
+        "https://www.health-system.example/clinic/": _Response(200, body=PAGE),
+    })
+    monkeypatch.setattr(website_fetcher, "get_http_session", lambda: session)
+
+    result = website_fetcher._fetch_over_http("https://clinic.example/")
+
+    assert scheduler.slots == session.requested == [
+        "https://clinic.example/",
+        "https://www.health-system.example/clinic",
+        "https://www.health-system.example/clinic/",
+    ]
+    assert result.final_url == "https://www.health-system.example/clinic/"
+    assert result.queue_wait_seconds == 0.75
+    assert "Board certified" in result.text
+
+
+def test_redirect_loop_is_bounded(monkeypatch, scheduler):
+    session = _Session({"https://loop.example/": _Response(302, location="https://loop.example/")})
+    monkeypatch.setattr(website_fetcher, "get_http_session", lambda: session)
+
+    with pytest.raises(requests.TooManyRedirects):
+        website_fetcher._fetch_over_http("https://loop.example/")
+    assert len(session.requested) == website_fetcher.MAX_REDIRECTS + 1
+
+
+def test_browser_escalation_loads_final_url(monkeypatch):
+    http_result = FetchResult("https://clinic.example/", text="", escalation_reason="spa_shell",
+                              final_url="https://app.health-system.example/")
+    monkeypatch.setattr(website_fetcher, "_fetch_over_http", lambda url, cached=None: http_result)
+    loaded = []
+    monkeypatch.setattr(website_fetcher, "_fetch_with_browser",
+                        lambda url: loaded.append(url) or ("Rendered text", 0.0))
+
+    result = website_fetcher._fetch_live("https://clinic.example/")
+    assert loaded == ["https://app.health-system.example/"]
+    assert result.path == "browser"
+    assert result.text == "Rendered text"
+
+
+def _failing_browser(url):
+    raise RuntimeError("chrome crashed")
+
+
+def test_browser_failure_keeps_http_text(monkeypatch):
+    http_result = FetchResult("https://clinic.example/", text="Dr. Smith, Cardiology",
+                              escalation_reason="thin_text")
+    monkeypatch.setattr(website_fetcher, "_fetch_over_http", lambda url, cached=None: http_result)
+    monkeypatch.setattr(website_fetcher, "_fetch_with_browser", _failing_browser)
+
+    result = website_fetcher._fetch_live("https://clinic.example/")
+    assert result.ok
+    assert result.path == "http"
+    assert result.text == "Dr. Smith, Cardiology"
+    assert result.to_metadata()["browser_error"] == "RuntimeError: chrome crashed"
+
+
+def test_browser_failure_without_http_text_is_an_error(monkeypatch):
+    http_result = FetchResult("https://clinic.example/", status_code=403, escalation_reason="http_403")
+    monkeypatch.setattr(website_fetcher, "_fetch_over_http", lambda url, cached=None: http_result)
+    monkeypatch.setattr(website_fetcher, "_fetch_with_browser", _failing_browser)
+
+    result = website_fetcher._fetch_live("https://clinic.example/")
+    assert not result.ok
+    assert result.path == "browser"
+    assert result.error == "RuntimeError: chrome crashed"
+
+
+def test_degraded_text_is_not_cached(monkeypatch):
+    degraded = FetchResult("https://clinic.example/", text="Thin text")
+    degraded.browser_error = "RuntimeError: chrome crashed"
+    monkeypatch.setattr(website_fetcher, "_fetch_live", lambda url, cached=None: degraded)
+    stored = []
+    monkeypatch.setattr(website_fetcher.website_cache, "get", lambda url: None)
+    monkeypatch.setattr(website_fetcher.website_cache, "put", lambda *args: stored.append(args))
+
+    result = website_fetcher._fetch_cached("https://clinic.example/")
+    assert result.text == "Thin text"
+    assert stored == []
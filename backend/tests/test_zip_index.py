@@ -0,0 +1,105 @@
+import csv
+
+import pgeocode
+import pytest
+
+import zip_index as zip_index_module
+from zip_index import ZipIndex, normalize_city, normalize_zip
+
+
+ROWS = [
+    # country, zip, place, state name, state, county, ..., lat, lon
+    ("US", "02110", "Boston", "Massachusetts", "MA", "Suffolk", "", "", "", "42.3574", "-71.0514", "4"),
+    ("US", "10001", "New York", "New York", "NY", "New York", "", "", "", "40.7484", "-73.9967", "4"),
+    ("US", "10001", "New York City", "New York", "NY", "New York", "", "", "", "40.7484", "-73.9967", "4"),
+    ("US", "63101", "Saint Louis", "Missouri", "MO", "St. Louis City", "", "", "", "38.6313", "-90.1922", "4"),
+]
+
+
+def _write_data(directory):
+    with open(directory / "US.txt", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(pgeocode.DATA_FIELDS)
+        writer.writerows(ROWS)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(pgeocode, "STORAGE_DIR", str(tmp_path))
+    _write_data(tmp_path)
+    return ZipIndex()
+
+
+def test_normalizers():
+    assert normalize_zip("2110") == "02110"
+    assert normalize_zip("02110-1234") == "02110"
+    assert normalize_zip(None) == ""
+    assert normalize_city("Saint Louis") == normalize_city("St. Louis") == "ST LOUIS"
+
+
+def test_lookup_merges_places(index):
+    entry = index.lookup("10001")
+    assert entry["state"] == "NY"
+    assert entry["cities"] == ["New York", "New York City"]
+    assert index.centroid("2110") == {"lat": 42.3574, "lng": -71.0514}
+
+
+def test_check_consistent(index):
+    result = index.check("St. Louis", "mo", "63101")
+    assert result["zip_found"] and result["state_match"] and result["city_match"]
+    assert result["issues"] == []
+
+
+def test_check_state_and_city_mismatch(index):
+    result = index.check("Cambridge", "NY", "02110")
+    assert result["state_match"] is False
+    assert result["city_match"] is False
+    assert len(result["issues"]) == 2
+
+
+def test_check_unknown_zip_and_far_geocode(index):
+    assert index.check("Boston", "MA", "99999")["zip_found"] is False
+
+    result = index.check("Boston", "MA", "02110", coordinates={"lat": 40.75, "lng": -74.0})
+    assert result["geocode_distance_km"] > 250
+    assert any("km from ZIP" in issue for issue in result["issues"])
+
+
+def test_failed_load_is_retried_after_backoff(tmp_path, monkeypatch):
+    monkeypatch.setattr(pgeocode, "STORAGE_DIR", str(tmp_path))
+    attempts = []
+
+    def offline(country):
+        attempts.append(country)
+        raise OSError("network unreachable")
+
+    monkeypatch.setattr(pgeocode, "Nominatim", offline)
+    now = [1000.0]
+    monkeypatch.setattr(zip_index_module.time, "monotonic", lambda: now[0])
+
+    index = ZipIndex()
+    assert not index.load()
+    assert index.check("Boston", "MA", "02110") == {"available": False, "issues": []}
+    assert len(attempts) == 1  # within the backoff, no new attempt
+
+    # Network is back: the data file appears and the backoff has passed
+    _write_data(tmp_path)
+    now[0] += zip_index_module.ZIP_INDEX_RETRY_SECONDS + 1
+    assert index.load()
+    assert index.load_error is None
+    assert index.lookup("02110")["state"] == "MA"
+
+
+def test_backoff_doubles(tmp_path, monkeypatch):
+    monkeypatch.setattr(pgeocode, "STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(pgeocode, "Nominatim", lambda country: (_ for _ in ()).throw(OSError("offline")))
+    now = [0.0]
+    monkeypatch.setattr(zip_index_module.time, "monotonic", lambda: now[0])
+
+    index = ZipIndex()
+    base = zip_index_module.ZIP_INDEX_RETRY_SECONDS
+    index.load()
+    assert index._retry_at == base
+    now[0] = index._retry_at
+    index.load()
+    assert index._retry_at == now[0] + 2 * base
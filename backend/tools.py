@@ -25,8 +25,14 @@ Environment Variables Required:
 - GEOAPIFY_API_KEY (for address validation)
 - OPENAI_API_KEY (optional fallback)
 - ANTHROPIC_API_KEY (optional fallback)
+
+Heavy dependencies (selenium, BeautifulSoup, PyPDF2, pdf2image, PIL, pandas,
+anthropic, openai) are imported inside the functions that use them, so
+importing this module for NPI / address lookups does not load them.
 """
 
+from __future__ import annotations
+
 import requests
 import json
 import os
@@ -38,18 +44,12 @@ from io import BytesIO
 from typing import List, Dict, Any, Optional, Union, Tuple
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 import mimetypes
 
-# PDF Processing
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_path
-from PIL import Image
-import pandas as pd
-
-# Web Scraping
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    import pandas as pd
+    from PIL import Image
 
 # # VLM/OCR APIs
 # import google.generativeai as genai
@@ -57,11 +57,14 @@ from bs4 import BeautifulSoup
 #     from openai import OpenAI
 # except ImportError:
 #     OpenAI = None
-    
-try:
-    from anthropic import Anthropic
-except ImportError:
-    Anthropic = None
+
+
+def _optional_import(module: str, name: str):
+    """Import an optional SDK class on first use; None if it is not installed."""
+    try:
+        return getattr(__import__(module, fromlist=[name]), name)
+    except ImportError:
+        return None
 
 from dotenv import load_dotenv
 
@@ -106,6 +109,7 @@ def detect_file_type(file_path: str) -> Tuple[str, str]:
     elif extension in pdf_extensions:
         # Check if it's scanned or typed
         try:
+            from PyPDF2 import PdfReader
             reader = PdfReader(str(file_path))
             if len(reader.pages) > 0:
                 text = reader.pages[0].extract_text().strip()
@@ -202,74 +206,134 @@ def search_npi_registry(
 
 
 def scrape_provider_website(url: str) -> str:
-    """Scrapes text from a website using a headless Microsoft Edge browser."""
+    """
+    Scrapes text from a website: plain HTTP first, falling back to a pooled
+    headless Microsoft Edge browser for script-rendered pages.
+    
+    See website_fetcher.fetch_website for the path / latency details.
+    """
     print(f"\nTOOL: Scraping website at URL: {url}")
     
-    edge_options = Options()
-    edge_options.add_argument("--headless")
-    edge_options.add_argument("--no-sandbox")
-    edge_options.add_argument("--disable-dev-shm-usage")
+    from website_fetcher import fetch_website
     
-    driver = None
-    try:
-        driver = webdriver.Edge(options=edge_options)
-        driver.get(url)
-        time.sleep(3)
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, "html.parser")
-        text_content = soup.get_text(separator=' ', strip=True)
-        print("TOOL: Successfully scraped website.")
-        return text_content
-    except Exception as e:
-        return f"An error occurred while scraping the website: {e}"
-    finally:
-        if driver:
-            driver.quit()
+    result = fetch_website(url)
+    if result.error:
+        return f"An error occurred while scraping the website: {result.error}"
+    
+    print(f"TOOL: Successfully scraped website ({result.path}, {result.latency_seconds:.2f}s).")
+    return result.text
 
 
 def validate_address(address: str, city: str, state: str, zip_code: str) -> dict:
-    """Validates an address using the Geoapify Geocoding API."""
+    """
+    Validates an address through the shared geocoding layer (Geoapify when
+    GEOAPIFY_API_KEY is set, Nominatim otherwise). The geocode is reused by
+    verify_medical_facility for the same address.
+    """
     full_address = f"{address}, {city}, {state} {zip_code}, USA"
-    print(f"\nTOOL: Validating address with Geoapify: {full_address}")
+    print(f"\nTOOL: Validating address: {full_address}")
 
-    api_key = os.environ.get("GEOAPIFY_API_KEY")
-    if not api_key:
-        return {"error": "GEOAPIFY_API_KEY environment variable not set."}
+    from geocoding import geocode_address
 
-    url = "https://api.geoapify.com/v1/geocode/search"
-    params = {"text": full_address, "apiKey": api_key}
+    geocode = geocode_address(address, city, state, zip_code)
 
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+    if geocode["error"] and not geocode["not_found"]:
+        return {"error": f"An error occurred geocoding the address: {geocode['error']}"}
 
-        if data.get("features"):
-            first_result = data["features"][0]["properties"]
-            confidence = first_result.get("rank", {}).get("confidence", 0)
-            
-            verdict = "Not Confident"
-            if confidence >= 0.95:
-                verdict = "High Confidence Match"
-            elif confidence >= 0.7:
-                verdict = "Medium Confidence Match"
-
-            result = {
-                "verdict": verdict,
-                "confidence_score": confidence,
-                "found_address": first_result.get("formatted")
-            }
-            return result
-        else:
-            return {"verdict": "Address Not Found", "confidence_score": 0}
-    except requests.exceptions.RequestException as e:
-        return {"error": f"An error occurred calling the Geoapify API: {e}"}
+    if not geocode["success"]:
+        return {"verdict": "Address Not Found", "confidence_score": 0, "geocode_source": geocode["source"]}
+
+    confidence = geocode["confidence"]
+    verdict = "Not Confident"
+    if confidence >= 0.95:
+        verdict = "High Confidence Match"
+    elif confidence >= 0.7:
+        verdict = "Medium Confidence Match"
+
+    return {
+        "verdict": verdict,
+        "confidence_score": confidence,
+        "found_address": geocode["formatted_address"],
+        "geocode_source": geocode["source"]
+    }
 
 
 # ============================================
 # EXCEL & CSV PARSERS
 # ============================================
 
+# Flexible column mapping (handle various naming conventions). A roster
+# column maps to a field if its lowercased header contains any of the names.
+PROVIDER_COLUMN_MAP = {
+    'full_name': ['full_name', 'fullname', 'name', 'provider_name', 'provider', 'doctor', 'physician'],
+    'NPI': ['npi', 'npi_number', 'npi#', 'national_provider_identifier'],
+    'specialty': ['specialty', 'speciality', 'type', 'provider_type', 'medical_specialty'],
+    'address': ['address', 'street', 'street_address', 'address_1', 'address1'],
+    'city': ['city', 'town'],
+    'state': ['state', 'st'],
+    'zip_code': ['zip', 'zip_code', 'zipcode', 'postal_code', 'zip code'],
+    'phone': ['phone', 'telephone', 'phone_number', 'tel', 'contact'],
+    'license_number': ['license', 'license_number', 'license#', 'medical_license', 'lic'],
+    'website': ['website', 'url', 'web', 'site'],
+    'last_updated': ['last_updated', 'updated', 'date', 'last_update', 'update_date']
+}
+
+
+def map_provider_columns(columns) -> Dict[str, str]:
+    """Field -> first roster column whose header matches it."""
+    field_columns = {}
+    for field, possible_names in PROVIDER_COLUMN_MAP.items():
+        for col in columns:
+            if any(pn in col for pn in possible_names):
+                field_columns[field] = col
+                break
+    return field_columns
+
+
+def _clean_text_column(column: pd.Series) -> pd.Series:
+    """Cell values as stripped strings, "" for missing; whole column at once."""
+    import pandas as pd
+    
+    missing = column.isna()
+    if pd.api.types.is_datetime64_any_dtype(column):
+        # str(Timestamp) per value: drops midnight-only fractions like the
+        # row-by-row parser did, but keeps real microseconds and time zones
+        text = column.map(str, na_action="ignore")
+    else:
+        text = column.astype(str)
+    return text.str.strip().mask(missing, "")
+
+
+def extract_provider_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Provider dicts from a roster DataFrame with lowercased headers.
+    
+    Every field in PROVIDER_COLUMN_MAP is present ("" if unmapped or
+    missing); rows without a full_name are dropped.
+    """
+    import pandas as pd
+    
+    # Headers that collide after lowercasing: the first one wins
+    df = df.loc[:, ~df.columns.duplicated()]
+    field_columns = map_provider_columns(df.columns)
+    print(f"    ✅ Mapped {len(field_columns)} fields: {list(field_columns.keys())}")
+    
+    if 'full_name' not in field_columns:
+        return []
+    
+    out = pd.DataFrame(
+        {field: _clean_text_column(df[column]) for field, column in field_columns.items()},
+        index=df.index
+    )
+    out = out[out['full_name'] != ""]
+    
+    for field in PROVIDER_COLUMN_MAP:
+        if field not in out.columns:
+            out[field] = ""
+    
+    return out.to_dict('records')
+
+
 def parse_excel_file(file_path: str) -> List[Dict[str, Any]]:
     """
     Parse Excel files (XLSX, XLS, XLSM, XLSB) to extract provider data.
@@ -282,6 +346,8 @@ def parse_excel_file(file_path: str) -> List[Dict[str, Any]]:
     """
     print(f"\n📊 Parsing Excel file: {file_path}")
     
+    import pandas as pd
+    
     try:
         # Try to read all sheets
         all_sheets = pd.read_excel(file_path, sheet_name=None, engine='openpyxl')
@@ -292,62 +358,17 @@ def parse_excel_file(file_path: str) -> List[Dict[str, Any]]:
             print(f"  📄 Processing sheet: {sheet_name}")
             
             # Clean column names (lowercase, strip spaces)
-            df.columns = df.columns.str.strip().str.lower()
+            df.columns = df.columns.astype(str).str.strip().str.lower()
             
             # Skip empty sheets
             if df.empty:
                 print(f"    ⚠️ Sheet is empty, skipping")
                 continue
             
-            # Flexible column mapping (handle various naming conventions)
-            column_map = {
-                'full_name': ['full_name', 'fullname', 'name', 'provider_name', 'provider', 'doctor', 'physician'],
-                'NPI': ['npi', 'npi_number', 'npi#', 'national_provider_identifier'],
-                'specialty': ['specialty', 'speciality', 'type', 'provider_type', 'medical_specialty'],
-                'address': ['address', 'street', 'street_address', 'address_1', 'address1'],
-                'city': ['city', 'town'],
-                'state': ['state', 'st'],
-                'zip_code': ['zip', 'zip_code', 'zipcode', 'postal_code', 'zip code'],
-                'phone': ['phone', 'telephone', 'phone_number', 'tel', 'contact'],
-                'license_number': ['license', 'license_number', 'license#', 'medical_license', 'lic'],
-                'website': ['website', 'url', 'web', 'site'],
-                'last_updated': ['last_updated', 'updated', 'date', 'last_update', 'update_date']
-            }
+            providers = extract_provider_records(df)
+            all_providers.extend(providers)
             
-            # Find matching columns
-            field_columns = {}
-            for field, possible_names in column_map.items():
-                for col in df.columns:
-                    if any(pn in col for pn in possible_names):
-                        field_columns[field] = col
-                        break
-            
-            print(f"    ✅ Mapped {len(field_columns)} fields: {list(field_columns.keys())}")
-            
-            # Extract providers row by row
-            for idx, row in df.iterrows():
-                provider = {}
-                
-                for field, column in field_columns.items():
-                    value = row[column]
-                    
-                    # Handle NaN/None values
-                    if pd.isna(value):
-                        provider[field] = ""
-                    else:
-                        # Convert to string and clean
-                        provider[field] = str(value).strip()
-                
-                # Only add if we have at least a name
-                if provider.get('full_name'):
-                    # Fill missing fields
-                    for field in column_map.keys():
-                        if field not in provider:
-                            provider[field] = ""
-                    
-                    all_providers.append(provider)
-            
-            print(f"    ✅ Extracted {len(all_providers)} provider(s) from this sheet")
+            print(f"    ✅ Extracted {len(providers)} provider(s) from this sheet")
         
         print(f"  🎯 Total: {len(all_providers)} provider(s) from {len(all_sheets)} sheet(s)")
         return all_providers
@@ -368,6 +389,8 @@ def parse_csv_file(file_path: str) -> List[Dict[str, Any]]:
     """
     print(f"\n📋 Parsing CSV file: {file_path}")
     
+    import pandas as pd
+    
     try:
         # Try different encodings
         encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
@@ -385,54 +408,9 @@ def parse_csv_file(file_path: str) -> List[Dict[str, Any]]:
             raise ValueError("Could not read CSV with any standard encoding")
         
         # Clean column names
-        df.columns = df.columns.str.strip().str.lower()
+        df.columns = df.columns.astype(str).str.strip().str.lower()
         
-        # Use same column mapping as Excel
-        column_map = {
-            'full_name': ['full_name', 'fullname', 'name', 'provider_name', 'provider', 'doctor', 'physician'],
-            'NPI': ['npi', 'npi_number', 'npi#', 'national_provider_identifier'],
-            'specialty': ['specialty', 'speciality', 'type', 'provider_type', 'medical_specialty'],
-            'address': ['address', 'street', 'street_address', 'address_1', 'address1'],
-            'city': ['city', 'town'],
-            'state': ['state', 'st'],
-            'zip_code': ['zip', 'zip_code', 'zipcode', 'postal_code', 'zip code'],
-            'phone': ['phone', 'telephone', 'phone_number', 'tel', 'contact'],
-            'license_number': ['license', 'license_number', 'license#', 'medical_license', 'lic'],
-            'website': ['website', 'url', 'web', 'site'],
-            'last_updated': ['last_updated', 'updated', 'date', 'last_update', 'update_date']
-        }
-        
-        # Find matching columns
-        field_columns = {}
-        for field, possible_names in column_map.items():
-            for col in df.columns:
-                if any(pn in col for pn in possible_names):
-                    field_columns[field] = col
-                    break
-        
-        print(f"  ✅ Mapped {len(field_columns)} fields: {list(field_columns.keys())}")
-        
-        # Extract providers
-        providers = []
-        for idx, row in df.iterrows():
-            provider = {}
-            
-            for field, column in field_columns.items():
-                value = row[column]
-                
-                if pd.isna(value):
-                    provider[field] = ""
-                else:
-                    provider[field] = str(value).strip()
-            
-            # Only add if we have at least a name
-            if provider.get('full_name'):
-                # Fill missing fields
-                for field in column_map.keys():
-                    if field not in provider:
-                        provider[field] = ""
-                
-                providers.append(provider)
+        providers = extract_provider_records(df)
         
         print(f"  🎯 Extracted {len(providers)} provider(s)")
         return providers
@@ -455,6 +433,8 @@ def preprocess_image(image: Image.Image, enhance: bool = True) -> Image.Image:
     - Convert to RGB
     - Optional: sharpen, contrast adjustment
     """
+    from PIL import Image
+    
     # Convert to RGB if needed
     if image.mode != 'RGB':
         image = image.convert('RGB')
@@ -656,6 +636,7 @@ Return ONLY the JSON, no other text."""
 def extract_with_openai_gpt4o_mini(images: List[Image.Image], source_name: str = "document") -> Dict[str, Any]:
     """FALLBACK 1: OpenAI GPT-4o-mini"""
     
+    OpenAI = _optional_import("openai", "OpenAI")
     if OpenAI is None:
         raise ImportError("OpenAI library not installed")
     
@@ -741,6 +722,7 @@ def extract_with_openai_gpt4o_mini(images: List[Image.Image], source_name: str =
 def extract_with_claude_haiku(images: List[Image.Image], source_name: str = "document") -> Dict[str, Any]:
     """FALLBACK 2: Anthropic Claude Haiku"""
     
+    Anthropic = _optional_import("anthropic", "Anthropic")
     if Anthropic is None:
         raise ImportError("Anthropic library not installed")
     
@@ -751,6 +733,8 @@ def extract_with_claude_haiku(images: List[Image.Image], source_name: str = "doc
     print(f"🌟 Fallback: Extracting with Claude Haiku...")
     
     try:
+        from pdf2image import convert_from_path
+        
         client = Anthropic(api_key=api_key)
         images = convert_from_path(pdf_path, dpi=300, fmt='jpeg')
         all_providers = []
@@ -853,6 +837,9 @@ def load_file_as_images(file_path: str) -> Tuple[List[Image.Image], str]:
     """
     category, specific_type = detect_file_type(file_path)
     
+    from PIL import Image
+    from pdf2image import convert_from_path
+    
     print(f"\n📂 Loading file: {file_path}")
     print(f"   Type: {category} ({specific_type})")
     
@@ -0,0 +1,170 @@
+"""
+Upload Spooling
+File: backend/upload_spool.py
+
+Streams multipart uploads to a spool directory in fixed-size chunks so large
+scanned rosters never sit fully in memory. The SHA-256 of the content is
+computed while the bytes are written, and uploads over UPLOAD_MAX_BYTES are
+rejected part-way through.
+
+Starlette parses the whole multipart body into its own temp file before the
+endpoint runs, so UploadSizeLimitMiddleware enforces the cap earlier: from
+Content-Length when the client sends one, otherwise as the body arrives.
+
+Spool files are removed by the request that created them; anything left
+behind by a crashed worker is swept at startup by sweep_spool_dir().
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from config import (
+    UPLOAD_SPOOL_DIR,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_SPOOL_MAX_AGE_SECONDS,
+)
+
+
+# Multipart framing (boundaries, part headers, small form fields) on top of
+# the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+def _limit_message(max_bytes: int) -> str:
+    return f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit"
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that refuses oversized request bodies on upload paths
+    before they are parsed: a declared Content-Length over the limit gets a
+    413 without reading the body, and a chunked body is cut off with a 413
+    as soon as the received bytes pass the limit.
+    """
+
+    def __init__(self, app, paths, max_bytes: int = UPLOAD_MAX_BYTES):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+        self.max_body_bytes = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers") or []).get(b"content-length")
+        if content_length is not None and content_length.isdigit() \
+                and int(content_length) > self.max_body_bytes:
+            response = JSONResponse({"detail": _limit_message(self.max_bytes)}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Re-raised by FastAPI's body parsing and rendered as a 413
+                    raise HTTPException(status_code=413, detail=_limit_message(self.max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class SpooledUpload:
+    """An upload written to the spool directory."""
+
+    def __init__(self, path: Path, original_name: str, size_bytes: int, sha256: str):
+        self.path = path
+        self.original_name = original_name
+        self.size_bytes = size_bytes
+        self.sha256 = sha256
+
+    def remove(self):
+        """Delete the spool file. Safe to call more than once."""
+        try:
+            if self.path.exists():
+                self.path.unlink()
+                print(f"🗑️ Cleaned up: {self.path}")
+        except OSError as e:
+            print(f"⚠️ Could not remove spool file {self.path}: {e}")
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> SpooledUpload:
+    """
+    Copy an upload to the spool directory chunk by chunk.
+
+    The original suffix is kept (the OCR step picks a loader by extension).
+    Raises UploadTooLargeError once more than `max_bytes` has been received;
+    the partial file is removed before raising.
+    """
+    spool_dir = Path(UPLOAD_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+
+    suffix = Path(file.filename or "").suffix.lower()
+    path = spool_dir / f"{uuid.uuid4().hex}{suffix}"
+
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(_limit_message(max_bytes))
+
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        await file.close()
+
+    return SpooledUpload(path, file.filename or path.name, size, digest.hexdigest())
+
+
+def sweep_spool_dir(max_age_seconds: float = UPLOAD_SPOOL_MAX_AGE_SECONDS) -> int:
+    """Remove spool files older than `max_age_seconds`. Returns the number removed."""
+    spool_dir = Path(UPLOAD_SPOOL_DIR)
+    if not spool_dir.is_dir():
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+
+    for entry in os.scandir(spool_dir):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            print(f"⚠️ Could not remove orphaned spool file {entry.path}: {e}")
+
+    if removed:
+        print(f"🗑️ Removed {removed} orphaned upload spool file(s)")
+    return removed
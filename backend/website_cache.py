@@ -0,0 +1,200 @@
+"""
+Website Content Cache
+File: backend/website_cache.py
+
+On-disk cache of text extracted from provider websites, keyed by normalized
+URL. Rosters often list the same hospital or group-practice site for many
+providers; with this cache only the first one is scraped.
+
+Entries store the extracted text plus the response's ETag / Last-Modified.
+Within WEBSITE_CACHE_TTL_SECONDS an entry is served as-is; after that the
+fetcher revalidates it with a conditional GET and reuses the text on a 304.
+
+The directory is capped at WEBSITE_CACHE_MAX_BYTES / WEBSITE_CACHE_MAX_ENTRIES.
+A file's mtime records its last use, and past either cap the least
+recently used entries are deleted down to 90% of it. The in-process view
+of the directory is rebuilt from disk periodically, so files written by
+other workers are counted too.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import (
+    WEBSITE_CACHE_DIR,
+    WEBSITE_CACHE_TTL_SECONDS,
+    WEBSITE_CACHE_MAX_BYTES,
+    WEBSITE_CACHE_MAX_ENTRIES,
+)
+
+
+# Query parameters that never change page content
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid")
+
+# Eviction stops at this fraction of the cap, so it does not run on every write
+_EVICT_TO = 0.9
+# Re-read the directory this often to count other workers' entries
+_RESCAN_SECONDS = 600
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for use as a cache key."""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+
+    # http/https variants of a site serve the same content
+    return urlunsplit(("https", host, path, query, ""))
+
+
+class WebsiteCache:
+    def __init__(self, cache_dir: str = WEBSITE_CACHE_DIR,
+                 ttl_seconds: float = WEBSITE_CACHE_TTL_SECONDS,
+                 max_bytes: int = WEBSITE_CACHE_MAX_BYTES,
+                 max_entries: int = WEBSITE_CACHE_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        # Entry path -> size in bytes, least recently used first (built lazily)
+        self._entries: Optional["OrderedDict[Path, int]"] = None
+        self._total_bytes = 0
+        self._scanned_at = 0.0
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a URL (fresh or stale), or None."""
+        path = self._path(url)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+
+        self._touch(path)
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("validated_at", 0) < self.ttl_seconds
+
+    def put(self, url: str, text: str, path: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        now = time.time()
+        self._write(url, {
+            "url": canonical_url(url),
+            "text": text,
+            "path": path,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "validated_at": now,
+        })
+
+    def mark_validated(self, url: str, entry: Dict[str, Any]):
+        """Restart the TTL after a 304 Not Modified."""
+        self._write(url, {**entry, "validated_at": time.time()})
+
+    def _write(self, url: str, entry: Dict[str, Any]):
+        # Write to a temp file and rename so readers never see a partial entry
+        target = self._path(url)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, target)
+            size = target.stat().st_size
+        except OSError as e:
+            print(f"⚠️ Could not write website cache entry: {e}")
+            return
+
+        self._record_write(target, size)
+
+    # ---- size cap (LRU by file mtime) ----
+
+    def _touch(self, path: Path):
+        try:
+            os.utime(path)  # mtime = last use, so the order survives restarts
+        except OSError:
+            pass
+        with self._lock:
+            if self._entries is not None and path in self._entries:
+                self._entries.move_to_end(path)
+
+    def _scan(self):
+        files = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+        files.sort(key=lambda item: item[0])
+
+        self._entries = OrderedDict((path, size) for _, path, size in files)
+        self._total_bytes = sum(size for _, _, size in files)
+        self._scanned_at = time.monotonic()
+
+    def _record_write(self, path: Path, size: int):
+        with self._lock:
+            if self._entries is None or time.monotonic() - self._scanned_at > _RESCAN_SECONDS:
+                self._scan()  # includes the entry just written
+            else:
+                self._total_bytes += size - self._entries.pop(path, 0)
+                self._entries[path] = size
+
+            if self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        target_bytes = self.max_bytes * _EVICT_TO
+        target_entries = int(self.max_entries * _EVICT_TO)
+        removed = 0
+
+        while self._entries and (self._total_bytes > target_bytes or len(self._entries) > target_entries):
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                path.unlink(missing_ok=True)
+                removed += 1
+            except OSError as e:
+                print(f"⚠️ Could not evict website cache entry {path}: {e}")
+
+        print(f"🗑️ Website cache over its cap: evicted {removed} least recently used entries")
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._entries is None:
+                self._scan()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+website_cache = WebsiteCache()
@@ -0,0 +1,294 @@
+"""
+Provider Website Fetcher
+File: backend/website_fetcher.py
+
+Most practice websites are static HTML, so pages are fetched over a pooled
+HTTP session first and reduced to boilerplate-free text with lxml
+(page_extractor.py). The headless browser pool is only used when the HTTP
+response looks script-rendered (almost no text, SPA shell markers) or the
+site refuses non-browser clients.
+
+Extracted text is kept in the on-disk website cache (see website_cache.py)
+and concurrent fetches of the same URL are collapsed into one. Every
+network request (HTTP or browser) holds a per-host slot from
+host_scheduler.py so one domain is never hit by many workers at once.
+Redirects are followed hop by hop, each under its own host's slot, and a
+browser escalation loads the final URL the HTTP redirects led to.
+
+fetch_website() returns which path was used and how long it took so the
+caller can record it in execution_metadata.
+"""
+
+import copy
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import WEBSITE_HTTP_TIMEOUT, WEBSITE_MIN_TEXT_CHARS
+from host_scheduler import host_scheduler
+from page_extractor import page_text
+from singleflight import SingleFlight
+from website_cache import website_cache, canonical_url
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36 Edg/124.0"
+)
+
+# Redirect hops followed per fetch (requests' own default is 30)
+MAX_REDIRECTS = 5
+
+# Responses that usually mean "use a real browser" rather than "no such page"
+BROWSER_RETRY_STATUS_CODES = {403, 429, 503}
+
+# Empty application shells rendered client-side
+SPA_MARKERS = [
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.I),
+    re.compile(r'<app-root[^>]*>\s*</app-root>', re.I),
+    re.compile(r'\bng-app\b', re.I),
+    re.compile(r'<noscript>[^<]*(enable|requires?)\s+javascript', re.I),
+]
+
+_session_local = threading.local()
+_in_flight = SingleFlight()
+
+
+class FetchResult:
+    """Text extracted from a provider website and how it was obtained."""
+
+    def __init__(self, url: str, text: str = "", path: str = "http",
+                 latency_seconds: float = 0.0, status_code: Optional[int] = None,
+                 error: Optional[str] = None, escalation_reason: Optional[str] = None,
+                 cache_status: str = "miss", etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, final_url: Optional[str] = None):
+        self.url = url
+        # Where redirects led (the URL the text actually came from)
+        self.final_url = final_url or url
+        self.text = text
+        self.path = path  # "http" or "browser"
+        self.latency_seconds = latency_seconds
+        self.status_code = status_code
+        self.error = error
+        self.escalation_reason = escalation_reason
+        # Set when the browser escalation failed and the HTTP text was kept
+        self.browser_error: Optional[str] = None
+        # miss, hit, revalidated (304), stale (served after a failed refresh),
+        # or shared (another request for the same URL was already running)
+        self.cache_status = cache_status
+        self.etag = etag
+        self.last_modified = last_modified
+        # Time spent waiting for a per-host slot (included in latency_seconds)
+        self.queue_wait_seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(self.text)
+
+    def to_metadata(self) -> dict:
+        return {
+            "url": self.url,
+            "final_url": self.final_url,
+            "path": self.path,
+            "latency_seconds": round(self.latency_seconds, 3),
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            "status_code": self.status_code,
+            "text_chars": len(self.text),
+            "escalation_reason": self.escalation_reason,
+            "browser_error": self.browser_error,
+            "cache_status": self.cache_status,
+            "error": self.error,
+        }
+
+
+def get_http_session() -> requests.Session:
+    """Keep-alive session with a connection pool, one per worker thread."""
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=1, backoff_factor=0.5, status_forcelist=[502, 504])
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+            "Accept-Language": "en-US,en;q=0.8",
+        })
+        _session_local.session = session
+    return session
+
+
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if not urlparse(url).scheme:
+        url = f"https://{url}"
+    return url
+
+
+def script_rendered_reason(html: str, text: str) -> Optional[str]:
+    """Why an HTTP response needs a browser, or None if its text is usable."""
+    if len(text) >= WEBSITE_MIN_TEXT_CHARS:
+        return None
+
+    for marker in SPA_MARKERS:
+        if marker.search(html):
+            return "spa_shell"
+
+    return "too_little_text"
+
+
+def _fetch_over_http(url: str, cached: Optional[dict] = None) -> FetchResult:
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    # Redirects are followed here rather than by requests, so a hop to
+    # another host waits for that host's slot too
+    session = get_http_session()
+    current = url
+    waited = 0.0
+    for _ in range(MAX_REDIRECTS + 1):
+        with host_scheduler.slot(current) as hop_wait:
+            response = session.get(
+                current, headers=headers, timeout=WEBSITE_HTTP_TIMEOUT, allow_redirects=False
+            )
+        waited += hop_wait
+
+        location = session.get_redirect_target(response)
+        if not location:
+            break
+        response.close()
+        current = urljoin(current, location)
+    else:
+        raise requests.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects", response=response)
+
+    result = _response_to_result(url, response, cached)
+    result.final_url = current
+    result.queue_wait_seconds = waited
+    return result
+
+
+def _response_to_result(url: str, response: requests.Response,
+                        cached: Optional[dict] = None) -> FetchResult:
+    if response.status_code == 304 and cached:
+        return FetchResult(url, text=cached["text"], path=cached["path"], status_code=304,
+                           cache_status="revalidated", etag=cached.get("etag"),
+                           last_modified=cached.get("last_modified"))
+
+    if response.status_code in BROWSER_RETRY_STATUS_CODES:
+        return FetchResult(url, status_code=response.status_code,
+                           escalation_reason=f"http_{response.status_code}")
+
+    if response.status_code >= 400:
+        return FetchResult(url, status_code=response.status_code,
+                           error=f"HTTP {response.status_code}")
+
+    content_type = response.headers.get("Content-Type", "")
+    if "html" not in content_type and "xml" not in content_type:
+        return FetchResult(url, status_code=response.status_code,
+                           error=f"Unsupported content type: {content_type or 'unknown'}")
+
+    html = response.text
+    text = page_text(html)
+    return FetchResult(url, text=text, status_code=response.status_code,
+                       escalation_reason=script_rendered_reason(html, text),
+                       etag=response.headers.get("ETag"),
+                       last_modified=response.headers.get("Last-Modified"))
+
+
+def _fetch_with_browser(url: str) -> tuple:
+    """Returns (text, seconds spent waiting for the host slot)."""
+    from browser_pool import browser_pool
+
+    with host_scheduler.slot(url) as waited:
+        html = browser_pool.fetch_html(url)
+    return page_text(html), waited
+
+
+def fetch_website(url: str) -> FetchResult:
+    """
+    Fetch the visible text of a provider website.
+
+    Tries plain HTTP first and escalates to the headless browser only when
+    the page looks script-rendered or blocks non-browser clients. Results
+    come from the website cache when fresh.
+    """
+    url = normalize_url(url)
+    start = time.perf_counter()
+
+    result, shared = _in_flight.run(canonical_url(url), lambda: _fetch_cached(url))
+    if shared:
+        result = copy.copy(result)
+        result.cache_status = "shared"
+        result.latency_seconds = time.perf_counter() - start
+    return result
+
+
+def _fetch_cached(url: str) -> FetchResult:
+    start = time.perf_counter()
+    cached = website_cache.get(url)
+
+    if cached and website_cache.is_fresh(cached):
+        return FetchResult(url, text=cached["text"], path=cached["path"],
+                           latency_seconds=time.perf_counter() - start, cache_status="hit")
+
+    result = _fetch_live(url, cached)
+
+    if result.cache_status == "revalidated":
+        website_cache.mark_validated(url, cached)
+    elif result.ok and result.browser_error is None:
+        # Degraded (browser failed) text is not cached so the next fetch retries the browser
+        website_cache.put(url, result.text, result.path, result.etag, result.last_modified)
+    elif cached:
+        # Site unreachable right now; the previous copy beats nothing
+        print(f"  ⚠️ Refresh failed ({result.error}), using cached copy: {url}")
+        result.text = cached["text"]
+        result.path = cached["path"]
+        result.cache_status = "stale"
+        result.error = None
+
+    result.latency_seconds = time.perf_counter() - start
+    return result
+
+
+def _fetch_live(url: str, cached: Optional[dict] = None) -> FetchResult:
+    try:
+        result = _fetch_over_http(url, cached)
+    except requests.RequestException as e:
+        # Connection-level failures (DNS, TLS, timeouts) will not be fixed by a browser
+        return FetchResult(url, path="http", error=f"{type(e).__name__}: {e}")
+
+    if result.error is not None or result.escalation_reason is None:
+        return result
+
+    print(f"  🌐 Escalating to headless browser ({result.escalation_reason}): {url}")
+    try:
+        text, waited = _fetch_with_browser(result.final_url)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if not result.text:
+            result.path = "browser"
+            result.error = error
+            return result
+        # Thin HTTP text is still better than nothing
+        print(f"  ⚠️ Browser fetch failed ({error}), keeping HTTP text: {url}")
+        result.browser_error = error
+        return result
+
+    result.path = "browser"
+    result.text = text
+    result.queue_wait_seconds += waited
+    return result
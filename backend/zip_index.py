@@ -0,0 +1,211 @@
+"""
+Offline ZIP Code Index
+File: backend/zip_index.py
+
+In-process ZIP -> state / city / centroid lookups built from the GeoNames
+postal code data that pgeocode downloads once into its storage dir
+(pgeocode.STORAGE_DIR/US.txt); the index reads that file directly. Used to:
+
+- flag addresses whose ZIP belongs to a different state (or city)
+- supply approximate coordinates when a remote geocode is unavailable
+  (skipped, rate-limited or failed)
+- sanity-check how far a geocode landed from its ZIP's centroid
+
+The index is loaded once per process (warmed at startup) and every query
+is a dict lookup. A failed load is retried after ZIP_INDEX_RETRY_SECONDS
+(doubling up to an hour), so checks come back once the data is reachable.
+"""
+
+import csv
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from config import ZIP_CENTROID_MAX_DISTANCE_KM, ZIP_INDEX_RETRY_SECONDS
+
+
+_MAX_RETRY_SECONDS = 3600
+
+
+# GeoNames stores the primary city name; rosters often abbreviate it
+_CITY_ABBREVIATIONS = {"SAINT": "ST", "SAINTE": "STE", "FORT": "FT", "MOUNT": "MT", "NORTH": "N",
+                       "SOUTH": "S", "EAST": "E", "WEST": "W"}
+
+
+def normalize_city(city: str) -> str:
+    words = re.sub(r"[^\w\s]", " ", str(city or "")).upper().split()
+    return " ".join(_CITY_ABBREVIATIONS.get(w, w) for w in words)
+
+
+def normalize_zip(zip_code) -> str:
+    digits = re.sub(r"\D", "", str(zip_code or ""))
+    # Excel drops leading zeros from New England ZIPs
+    if 3 <= len(digits) < 5:
+        digits = digits.zfill(5)
+    return digits[:5]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def _float(value: str) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class ZipIndex:
+    def __init__(self, country: str = "us"):
+        self.country = country
+        self._lock = threading.Lock()
+        self._zips: Optional[Dict[str, dict]] = None
+        self.load_error: Optional[str] = None
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def data_path(self) -> str:
+        """GeoNames file for the country, downloaded by pgeocode if missing."""
+        import pgeocode
+
+        path = os.path.join(pgeocode.STORAGE_DIR, f"{self.country.upper()}.txt")
+        if not os.path.exists(path):
+            # The public constructor downloads the GeoNames dump and saves it here
+            pgeocode.Nominatim(self.country)
+        return path
+
+    def load(self) -> bool:
+        """Build the index (once). Returns False if the data is unavailable."""
+        if self._zips is not None:
+            return True
+
+        with self._lock:
+            if self._zips is not None:
+                return True
+            if self.load_error is not None and time.monotonic() < self._retry_at:
+                return False
+
+            try:
+                zips = self._read(self.data_path())
+            except Exception as e:
+                self._failures += 1
+                delay = min(ZIP_INDEX_RETRY_SECONDS * 2 ** (self._failures - 1), _MAX_RETRY_SECONDS)
+                self._retry_at = time.monotonic() + delay
+                self.load_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ ZIP index unavailable (retrying in {delay:.0f}s): {self.load_error}")
+                return False
+
+            self._zips = zips
+            self.load_error = None
+            print(f"📮 ZIP index loaded: {len(zips):,} ZIP codes")
+            return True
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, dict]:
+        """One entry per ZIP from the GeoNames rows (one row per ZIP and place)."""
+        zips: Dict[str, dict] = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                zip5 = normalize_zip(row.get("postal_code"))
+                if not zip5:
+                    continue
+                entry = zips.get(zip5)
+                if entry is None:
+                    entry = zips[zip5] = {
+                        "zip_code": zip5,
+                        "state": row.get("state_code") or None,
+                        "county": row.get("county_name") or None,
+                        "cities": [],
+                        "lat": None,
+                        "lon": None,
+                    }
+                place = row.get("place_name")
+                if place and place not in entry["cities"]:
+                    entry["cities"].append(place)
+                lat, lon = _float(row.get("latitude")), _float(row.get("longitude"))
+                if entry["lat"] is None and lat is not None and lon is not None:
+                    entry["lat"], entry["lon"] = lat, lon
+
+        if not zips:
+            raise ValueError(f"no postal codes in {path}")
+        return zips
+
+    def lookup(self, zip_code) -> Optional[dict]:
+        if not self.load():
+            return None
+        return self._zips.get(normalize_zip(zip_code))
+
+    def centroid(self, zip_code) -> Optional[dict]:
+        """Approximate {"lat", "lng"} for a ZIP, or None."""
+        entry = self.lookup(zip_code)
+        if not entry or entry["lat"] is None:
+            return None
+        return {"lat": entry["lat"], "lng": entry["lon"]}
+
+    def check(self, city: str, state: str, zip_code, coordinates: Optional[dict] = None) -> dict:
+        """
+        Consistency of a city / state / ZIP triple (and optionally a geocode).
+
+        state_match / city_match are None when they cannot be judged.
+        """
+        if not self.load():
+            return {"available": False, "issues": []}
+
+        entry = self.lookup(zip_code)
+        if entry is None:
+            return {
+                "available": True,
+                "zip_found": False,
+                "state_match": None,
+                "city_match": None,
+                "issues": [f"ZIP {zip_code} not found"] if zip_code else [],
+            }
+
+        issues = []
+        state = str(state or "").strip().upper()
+        state_match = None
+        if state and entry["state"]:
+            state_match = state == entry["state"]
+            if not state_match:
+                issues.append(f"ZIP {entry['zip_code']} is in {entry['state']}, not {state}")
+
+        city_match = None
+        if city and entry["cities"]:
+            wanted = normalize_city(city)
+            city_match = any(normalize_city(c) == wanted for c in entry["cities"])
+            if not city_match:
+                issues.append(f"ZIP {entry['zip_code']} is {', '.join(entry['cities'])}, not {city}")
+
+        result = {
+            "available": True,
+            "zip_found": True,
+            "state_match": state_match,
+            "city_match": city_match,
+            "expected_state": entry["state"],
+            "expected_cities": entry["cities"],
+            "centroid": self.centroid(entry["zip_code"]),
+            "issues": issues,
+        }
+
+        if coordinates and result["centroid"]:
+            try:
+                distance = haversine_km(float(coordinates["lat"]), float(coordinates["lng"]),
+                                        entry["lat"], entry["lon"])
+                result["geocode_distance_km"] = round(distance, 1)
+                if distance > ZIP_CENTROID_MAX_DISTANCE_KM:
+                    issues.append(f"Geocode is {distance:.0f} km from ZIP {entry['zip_code']}")
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        return result
+
+
+zip_index = ZipIndex()
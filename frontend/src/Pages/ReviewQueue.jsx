@@ -48,24 +48,33 @@ const ReviewQueue = () => {
       setLoading(true);
       setError(null);
 
-      const url =
-        filter === "ALL"
-          ? "http://localhost:8000/api/review-queue?status=ALL"
-          : `http://localhost:8000/api/review-queue?status=${filter}`;
+      // The API is paginated; follow next_cursor until every item is loaded
+      const baseUrl = `http://localhost:8000/api/review-queue?status=${filter}&limit=500`;
+      const items = [];
+      let cursor = null;
 
-      const response = await fetch(url);
+      do {
+        const url = cursor
+          ? `${baseUrl}&include_count=false&cursor=${encodeURIComponent(cursor)}`
+          : baseUrl;
 
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
+        const response = await fetch(url);
 
-      const data = await response.json();
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+
+        if (!data.success) {
+          throw new Error("Invalid response format");
+        }
+
+        items.push(...(data.items || []));
+        cursor = data.next_cursor;
+      } while (cursor);
 
-      if (data.success) {
-        setReviewItems(data.items || []);
-      } else {
-        throw new Error("Invalid response format");
-      }
+      setReviewItems(items);
     } catch (err) {
       console.error("Error fetching review queue:", err);
       setError(err.message);